@@ -0,0 +1,161 @@
+"""Gráficos de análisis de las jugadas de la IA, dibujados fuera del bucle del juego.
+
+Un hilo dibuja con el backend Agg de matplotlib (sin ventana ni pyplot) en un
+buffer RGBA que la interfaz puede mostrar directamente. Los gráficos se crean
+una vez y cada actualización solo añade los puntos de las jugadas nuevas.
+"""
+import math
+import threading
+from collections import deque
+
+from .difficulty import DIFFICULTY_LEVELS
+
+# Series que se reciben, con las mismas claves que analysis_data
+SERIES = ('moves', 'nodes_evaluated', 'depth_used', 'time_taken', 'difficulty', 'empty_cells')
+
+
+def full_tree_nodes(branching, depth):
+    """Nodos de un árbol minimax completo sin poda: 1 + b + b(b-1) + ... hasta depth niveles."""
+    total = level = 1
+    for i in range(min(depth, branching)):
+        level *= branching - i
+        total += level
+    return total
+
+
+def pruning_savings(nodes, branching, depth):
+    """Fracción de nodos que no hizo falta evaluar respecto al árbol completo."""
+    if depth <= 1:
+        return math.nan
+    return max(0.0, 1.0 - nodes / full_tree_nodes(branching, depth))
+
+
+class AnalysisRenderer:
+    """Dibuja los gráficos en un hilo propio y publica la imagen RGBA resultante.
+
+    append() encola las jugadas nuevas y vuelve enseguida; cuando la imagen
+    está lista se llama a on_ready (desde el hilo de dibujo) y latest() la
+    devuelve junto con su versión. Con max_points solo se dibujan las últimas
+    jugadas; las medias de profundidad siguen contando todas.
+    """
+
+    def __init__(self, width=600, height=600, dpi=100, on_ready=None, max_points=None):
+        self.size = (width, height)
+        self.dpi = dpi
+        self.on_ready = on_ready
+        self.version = 0
+        self._image = None
+        self._pending = {name: [] for name in SERIES}
+        self._closed = False
+        self._condition = threading.Condition()
+        self._series = {name: deque(maxlen=max_points) for name in SERIES}
+        self._savings = deque(maxlen=max_points)
+        self._depth_totals = {}
+        self._depth_counts = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def append(self, columns):
+        """Añade jugadas; columns tiene una lista por cada serie de SERIES."""
+        with self._condition:
+            for name in SERIES:
+                self._pending[name].extend(columns[name])
+            self._condition.notify()
+
+    def latest(self):
+        """Devuelve (versión, bytes RGBA) de la última imagen, o (0, None) si aún no hay."""
+        with self._condition:
+            return self.version, self._image
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        self._build()
+        # La primera imagen se publica aunque todavía no haya jugadas
+        self._publish()
+        while True:
+            with self._condition:
+                while not self._closed and not self._pending['moves']:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                pending = self._pending
+                self._pending = {name: [] for name in SERIES}
+            self._update(pending)
+            self._publish()
+
+    def _build(self):
+        # matplotlib se importa en el hilo de dibujo para no detener la interfaz
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        width, height = self.size
+        self.figure = Figure(figsize=(width / self.dpi, height / self.dpi), dpi=self.dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        (nodes_ax, time_ax), (depth_ax, savings_ax) = self.figure.subplots(2, 2)
+
+        nodes_ax.set_title("Nodos por jugada", fontsize=10)
+        self.nodes_line, = nodes_ax.plot([], [], marker='o', markersize=3, color='tab:blue')
+
+        time_ax.set_title("Tiempo por jugada (ms)", fontsize=10)
+        self.time_line, = time_ax.plot([], [], marker='o', markersize=3, color='tab:red')
+
+        depth_ax.set_title("Profundidad media por dificultad", fontsize=10)
+        self.difficulties = list(DIFFICULTY_LEVELS)
+        self.depth_bars = depth_ax.bar(range(len(self.difficulties)), [0] * len(self.difficulties),
+                                       color=['tab:green', 'gold', 'tab:orange', 'tab:red'])
+        depth_ax.set_xticks(range(len(self.difficulties)))
+        depth_ax.set_xticklabels(self.difficulties, fontsize=8)
+
+        savings_ax.set_title("Ahorro de la poda (% del árbol)", fontsize=10)
+        self.savings_line, = savings_ax.plot([], [], marker='o', markersize=3, color='tab:purple')
+        savings_ax.set_ylim(0, 105)
+
+        self.axes = (nodes_ax, time_ax, depth_ax, savings_ax)
+        for ax in self.axes:
+            ax.tick_params(labelsize=8)
+        self.figure.tight_layout()
+
+    def _update(self, pending):
+        series = self._series
+        for name in SERIES:
+            series[name].extend(pending[name])
+        moves = list(series['moves'])
+
+        self.nodes_line.set_data(moves, list(series['nodes_evaluated']))
+        self.time_line.set_data(moves, [t * 1000 for t in series['time_taken']])
+
+        # Las medias se actualizan con sumas acumuladas por dificultad
+        for depth, name in zip(pending['depth_used'], pending['difficulty']):
+            self._depth_totals[name] = self._depth_totals.get(name, 0) + depth
+            self._depth_counts[name] = self._depth_counts.get(name, 0) + 1
+        for bar, name in zip(self.depth_bars, self.difficulties):
+            count = self._depth_counts.get(name, 0)
+            bar.set_height(self._depth_totals[name] / count if count else 0)
+
+        self._savings.extend(
+            pruning_savings(nodes, branching, depth) * 100
+            for nodes, branching, depth in zip(pending['nodes_evaluated'], pending['empty_cells'],
+                                               pending['depth_used'])
+        )
+        self.savings_line.set_data(moves, list(self._savings))
+
+        # El ahorro es un porcentaje: su eje vertical queda fijo
+        savings_ax = self.axes[3]
+        for ax in self.axes:
+            ax.relim()
+            ax.autoscale_view(scaley=ax is not savings_ax)
+
+    def _publish(self):
+        self.canvas.draw()
+        # Copia en este hilo: el canvas se reutiliza en el siguiente dibujo
+        image = bytes(self.canvas.buffer_rgba())
+        with self._condition:
+            self._image = image
+            self.version += 1
+        if self.on_ready is not None:
+            self.on_ready()
@@ -0,0 +1,102 @@
+"""Clasificación vectorizada de muchos tableros a la vez con NumPy.
+
+Los tableros se representan como arrays int8 con 0 = vacía, 1 = X y 2 = O,
+con forma (N, filas, columnas) o empaquetados como (N, filas * columnas).
+Los resultados coinciden con Bitboard.winner() y BitboardGame.evaluate_state().
+"""
+import numpy as np
+
+from .bitboard import geometry
+
+EMPTY, X, O = 0, 1, 2
+
+# Códigos de ganador devueltos por winners()
+WINNER_NONE, WINNER_X, WINNER_O, WINNER_TIE = 0, 1, 2, 3
+
+_SYMBOLS = {WINNER_NONE: None, WINNER_X: 'X', WINNER_O: 'O', WINNER_TIE: 'T'}
+
+
+def encode(states):
+    """Convierte una lista de Bitboard del mismo tamaño en un array (N, filas, columnas)."""
+    if not states:
+        return np.zeros((0, 3, 3), dtype=np.int8)
+    g = states[0].geometry
+    if g.size > 64:
+        cells = [[X if state.x >> cell & 1 else O if state.o >> cell & 1 else EMPTY
+                  for cell in range(g.size)] for state in states]
+        return np.array(cells, dtype=np.int8).reshape(len(states), g.rows, g.cols)
+    bits = np.arange(g.size, dtype=np.uint64)
+    x = np.array([state.x for state in states], dtype=np.uint64)[:, None]
+    o = np.array([state.o for state in states], dtype=np.uint64)[:, None]
+    cells = ((x >> bits) & 1) + 2 * ((o >> bits) & 1)
+    return cells.astype(np.int8).reshape(len(states), g.rows, g.cols)
+
+
+def _as_cells(boards, rows, cols):
+    boards = np.asarray(boards)
+    if boards.dtype.kind == 'U':
+        # Tableros como listas de 'X', 'O' y ' '
+        boards = (boards == 'X') * X + (boards == 'O') * O
+    if boards.ndim == 3:
+        n, rows, cols = boards.shape
+    elif boards.ndim == 2:
+        n = boards.shape[0]
+        rows = rows or 3
+        cols = cols or boards.shape[1] // rows
+        if rows * cols != boards.shape[1]:
+            raise ValueError(f"Un tablero empaquetado de {boards.shape[1]} casillas no es de {rows}x{cols}")
+    else:
+        raise ValueError("Se esperaba un array (N, filas, columnas) o (N, filas * columnas)")
+    return boards.reshape(n, rows * cols).astype(np.int8, copy=False), rows, cols
+
+
+def _line_cells(g):
+    return np.array(
+        [[cell for cell in range(g.size) if mask >> cell & 1] for mask in g.line_masks],
+        dtype=np.intp
+    )
+
+
+def classify(boards, k=3, rows=None, cols=None):
+    """Devuelve (ganadores, terminales, evaluaciones) para todos los tableros.
+
+    - ganadores: int8 con WINNER_NONE, WINNER_X, WINNER_O o WINNER_TIE
+    - terminales: bool, la partida ha terminado
+    - evaluaciones: float64, 1.0 si gana O (la IA), -1.0 si gana X y 0.0 en otro caso
+    """
+    cells, rows, cols = _as_cells(boards, rows, cols)
+    g = geometry(rows, cols, k)
+    n = cells.shape[0]
+    x_wins = np.zeros(n, dtype=bool)
+    o_wins = np.zeros(n, dtype=bool)
+    # Un recorrido por línea mantiene la memoria en O(N * k) en tableros grandes
+    for line in _line_cells(g):
+        values = cells[:, line]
+        x_wins |= (values == X).all(axis=1)
+        o_wins |= (values == O).all(axis=1)
+
+    full = (cells != EMPTY).all(axis=1)
+    result = np.full(n, WINNER_NONE, dtype=np.int8)
+    result[full] = WINNER_TIE
+    result[o_wins] = WINNER_O
+    result[x_wins] = WINNER_X
+    terminal = result != WINNER_NONE
+    evaluation = np.where(o_wins & ~x_wins, 1.0, np.where(x_wins, -1.0, 0.0))
+    return result, terminal, evaluation
+
+
+def winners(boards, k=3, rows=None, cols=None):
+    return classify(boards, k, rows, cols)[0]
+
+
+def terminal(boards, k=3, rows=None, cols=None):
+    return classify(boards, k, rows, cols)[1]
+
+
+def evaluate(boards, k=3, rows=None, cols=None):
+    return classify(boards, k, rows, cols)[2]
+
+
+def winner_symbols(codes):
+    """Convierte los códigos de winners() en 'X', 'O', 'T' o None, como Bitboard.winner()."""
+    return [_SYMBOLS[int(code)] for code in codes]
@@ -0,0 +1,337 @@
+"""Pruebas de rendimiento del motor Minimax.
+
+Uso: python -m tic_tac_toe_minimax_game.benchmark
+     python -m tic_tac_toe_minimax_game.benchmark --suite [--actualizar-base]
+     python -m tic_tac_toe_minimax_game.benchmark --arranque
+
+La suite busca con get_best_move sobre un conjunto fijo de posiciones, a la
+profundidad de cada nivel de dificultad y con la poda alfa-beta activada y
+desactivada. Además compara Minimax y Negamax (PVS) en un tablero 4x4 con
+tres en raya, con y sin tabla de transposición y ordenación de jugadas. El
+resultado se compara con la línea base guardada en
+data/benchmark_baseline.json. Solo el número de nodos, que es determinista,
+cuenta como regresión; el tiempo y la memoria dependen de la máquina y de su
+carga, así que sus diferencias se muestran como aviso.
+
+La prueba de arranque importa cada punto de entrada en un intérprete nuevo con
+-X importtime y comprueba que no supera su presupuesto ni carga módulos pesados
+que no necesita. Los paquetes cargados son deterministas; el tiempo depende de la
+máquina, así que pytest solo lo comprueba si se pide (BENCHMARK_STARTUP_TIME=1).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .bitboard import Bitboard, BitboardGame
+from .difficulty import DIFFICULTY_LEVELS
+from .ordering import MoveOrdering
+from .transposition import TranspositionTable
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'benchmark_baseline.json')
+
+# Posiciones de la suite, con X moviendo en las que tienen un número par de fichas
+POSITIONS = {
+    "apertura": ["   ", "   ", "   "],
+    "medio_juego": ["X  ", " O ", "  X"],
+    "final": ["XOX", "XO ", "O  "],
+}
+
+# Comparación de variantes: 4x4 con tres en raya tras abrir en una esquina
+VARIANT_BOARD = {"rows": 4, "cols": 4, "k": 3}
+VARIANT_OPENING = [(0, 0)]
+VARIANT_DEPTH = 7
+
+# Tolerancia por defecto de los avisos de tiempo y memoria
+DEFAULT_THRESHOLD = 0.5
+# Diferencias absolutas por debajo de estas se consideran ruido de medición
+MIN_DELTA = {"time_ms": 1.0, "peak_memory_kb": 4.0}
+
+PACKAGE = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+# Tiempo máximo de importación de cada módulo y paquetes que no debe importar
+STARTUP_BUDGETS = {
+    "minimax": {"budget_ms": 50, "forbidden": ("numpy", "matplotlib", "pygame", "multiprocessing")},
+    "bitboard": {"budget_ms": 60, "forbidden": ("numpy", "matplotlib", "pygame", "multiprocessing")},
+    "tres_en_raya": {"budget_ms": 100, "forbidden": ("numpy", "matplotlib", "pygame", "multiprocessing")},
+    "simulate": {"budget_ms": 200, "forbidden": ("numpy", "matplotlib", "pygame")},
+    # pygame importa numpy por su cuenta (pygame.surfarray)
+    "tres_en_raya_pygame": {"budget_ms": 600, "forbidden": ("matplotlib", "multiprocessing")},
+}
+
+
+class _CountingGame(BitboardGame):
+    """BitboardGame que cuenta los estados nuevos creados con make_move."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.states_created = 0
+
+    def make_move(self, state, move):
+        self.states_created += 1
+        return state.play(move)
+
+
+def _run(game, depth, repeat):
+    best_time = None
+    for _ in range(repeat):
+        state = game.new_board()
+        game.states_created = 0
+        start = time.perf_counter()
+        game.get_best_move(state, depth=depth, maximizing_player=False)
+        elapsed = time.perf_counter() - start
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    states_created = game.states_created
+
+    state = game.new_board()
+    tracemalloc.start()
+    game.get_best_move(state, depth=depth, maximizing_player=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "nodes": game.nodes_evaluated,
+        "states_created": states_created,
+        "time_ms": best_time * 1000,
+        "peak_memory_kb": peak / 1024
+    }
+
+
+def compare_in_place(depth=9, use_alpha_beta=False, repeat=3, rows=3, cols=3, k=3):
+    """Compara make_move (un estado nuevo por nodo) con apply_move/undo_move."""
+    results = {}
+    for label, in_place in (("copy", False), ("in_place", True)):
+        game = _CountingGame(use_alpha_beta=use_alpha_beta, use_in_place=in_place,
+                             rows=rows, cols=cols, k=k)
+        results[label] = _run(game, depth, repeat)
+    return results
+
+
+def _forget(game):
+    # Cada repetición empieza sin tabla ni historia, para que los nodos no dependan de la anterior
+    if game.transposition_table is not None:
+        game.transposition_table.clear()
+    game.new_game()
+
+
+def _measure(game, state, depth, maximizing_player, repeat):
+    best_time = None
+    for _ in range(repeat):
+        _forget(game)
+        start = time.perf_counter()
+        game.get_best_move(state.copy(), depth=depth, maximizing_player=maximizing_player)
+        elapsed = time.perf_counter() - start
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    nodes = game.nodes_evaluated
+
+    _forget(game)
+    tracemalloc.start()
+    game.get_best_move(state.copy(), depth=depth, maximizing_player=maximizing_player)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "nodes": nodes,
+        "nodes_per_second": nodes / best_time if best_time > 0 else 0.0,
+        "time_ms": best_time * 1000,
+        "peak_memory_kb": peak / 1024
+    }
+
+
+def run_suite(repeat=3):
+    """Mide cada combinación de posición, nivel de dificultad y poda alfa-beta."""
+    results = {}
+    for position, rows in POSITIONS.items():
+        state = Bitboard.from_rows([list(row) for row in rows])
+        maximizing_player = state.player == 'O'
+        for difficulty, config in DIFFICULTY_LEVELS.items():
+            for use_alpha_beta in (True, False):
+                # Sin tabla de transposición ni tabla precalculada: se mide la búsqueda
+                game = BitboardGame(use_alpha_beta=use_alpha_beta)
+                name = f"{position}/{difficulty}/{'alfa-beta' if use_alpha_beta else 'minimax'}"
+                results[name] = _measure(game, state, config['depth'], maximizing_player, repeat)
+
+    state = Bitboard.empty(**VARIANT_BOARD)
+    for move in VARIANT_OPENING:
+        state = state.play(move)
+    for ordered in (False, True):
+        for variant in BitboardGame.VARIANTS:
+            options = {"transposition_table": TranspositionTable(), "move_ordering": MoveOrdering()} if ordered else {}
+            game = BitboardGame(variant=variant, **VARIANT_BOARD, **options)
+            name = f"variantes/{'tt+orden' if ordered else 'sin tt'}/{variant}"
+            results[name] = _measure(game, state, VARIANT_DEPTH, state.player == 'O', repeat)
+    return results
+
+
+def find_regressions(results, baseline):
+    """Devuelve una lista de mensajes con los casos que evalúan más nodos que la línea base."""
+    regressions = []
+    for name, base in baseline.items():
+        result = results.get(name)
+        if result is None:
+            regressions.append(f"{name}: falta en los resultados")
+            continue
+        # El número de nodos es determinista: cualquier aumento es una regresión
+        if result["nodes"] > base["nodes"]:
+            regressions.append(f"{name}: nodos {base['nodes']} -> {result['nodes']}")
+    return regressions
+
+
+def find_slowdowns(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Devuelve los casos más lentos o con más memoria que la línea base; solo es orientativo."""
+    slowdowns = []
+    for name, base in baseline.items():
+        result = results.get(name)
+        if result is None:
+            continue
+        for metric, min_delta in MIN_DELTA.items():
+            if (result[metric] > base[metric] * (1 + threshold)
+                    and result[metric] - base[metric] > min_delta):
+                slowdowns.append(f"{name}: {metric} {base[metric]:.1f} -> {result[metric]:.1f}")
+    return slowdowns
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+
+
+def assert_no_regressions(repeat=1, path=BASELINE_PATH):
+    """Ejecuta la suite y lanza AssertionError si algún caso evalúa más nodos (p. ej. desde pytest)."""
+    regressions = find_regressions(run_suite(repeat), load_baseline(path))
+    assert not regressions, "\n".join(regressions)
+
+
+def measure_startup(module, repeat=3):
+    """Importa el módulo en un proceso nuevo y devuelve el mejor tiempo y los paquetes cargados."""
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])))
+    name = f"{PACKAGE}.{module}"
+    best = None
+    packages = set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"],
+                                env=env, capture_output=True, text=True, check=True)
+        # Líneas "import time: propio | acumulado | módulo", en microsegundos
+        for line in result.stderr.splitlines():
+            fields = line.split(":", 1)[-1].split("|")
+            if len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            imported = fields[2].strip()
+            packages.add(imported.partition('.')[0])
+            if imported == name:
+                elapsed = int(fields[1]) / 1000
+                best = elapsed if best is None else min(best, elapsed)
+    return {"import_ms": best, "packages": sorted(packages)}
+
+
+def check_startup(repeat=3, budgets=STARTUP_BUDGETS, check_time=True):
+    """Devuelve (resultados, problemas) de la prueba de arranque.
+
+    Con check_time=False solo se comprueban los paquetes cargados, que no dependen
+    de la máquina ni de su carga.
+    """
+    results = {}
+    problems = []
+    for module, budget in budgets.items():
+        result = results[module] = measure_startup(module, repeat)
+        if check_time and result["import_ms"] > budget["budget_ms"]:
+            problems.append(f"{module}: importación {result['import_ms']:.1f} ms "
+                            f"> presupuesto {budget['budget_ms']} ms")
+        loaded = sorted(set(budget["forbidden"]) & set(result["packages"]))
+        if loaded:
+            problems.append(f"{module}: importa {', '.join(loaded)} al arrancar")
+    return results, problems
+
+
+def assert_startup_budget(repeat=3, budgets=STARTUP_BUDGETS, check_time=True):
+    """Lanza AssertionError si algún punto de entrada arranca más lento de lo permitido
+    o carga paquetes que no necesita."""
+    _, problems = check_startup(repeat, budgets, check_time)
+    assert not problems, "\n".join(problems)
+
+
+def _main_startup(args):
+    results, problems = check_startup(args.repeticiones)
+    print(f"{'módulo':<24}{'importación (ms)':>18}{'presupuesto (ms)':>18}")
+    for module, result in results.items():
+        print(f"{module:<24}{result['import_ms']:>18.1f}{STARTUP_BUDGETS[module]['budget_ms']:>18}")
+    if problems:
+        print("Arranque fuera de presupuesto:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("Arranque dentro de presupuesto")
+    return 0
+
+
+def _main_suite(args):
+    results = run_suite(args.repeticiones)
+    print(f"{'caso':<34}{'nodos':>10}{'nodos/s':>12}{'tiempo (ms)':>14}{'pico (KB)':>12}")
+    for name, result in results.items():
+        print(f"{name:<34}{result['nodes']:>10}{result['nodes_per_second']:>12.0f}"
+              f"{result['time_ms']:>14.1f}{result['peak_memory_kb']:>12.1f}")
+    if args.salida:
+        write_results(results, args.salida)
+    if args.actualizar_base:
+        write_results(results, args.base)
+        print(f"Línea base escrita en {args.base}")
+        return 0
+
+    baseline = load_baseline(args.base)
+    slowdowns = find_slowdowns(results, baseline, args.umbral)
+    if slowdowns:
+        print("Aviso: más lento que la línea base (depende de la máquina, no cuenta como regresión):")
+        for slowdown in slowdowns:
+            print(f"  {slowdown}")
+    regressions = find_regressions(results, baseline)
+    if regressions:
+        print("Regresiones respecto a la línea base:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("Sin regresiones respecto a la línea base")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del motor Minimax")
+    parser.add_argument("--profundidad", type=int, default=9)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--alfa-beta", action="store_true", help="Activar la poda alfa-beta")
+    parser.add_argument("--suite", action="store_true",
+                        help="Ejecutar la suite completa y compararla con la línea base")
+    parser.add_argument("--arranque", action="store_true",
+                        help="Medir el tiempo de importación de cada punto de entrada")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados de la suite")
+    parser.add_argument("--base", default=BASELINE_PATH, help="Archivo JSON con la línea base")
+    parser.add_argument("--umbral", type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento de tiempo y memoria a partir del cual se avisa (0.5 = 50%%)")
+    parser.add_argument("--actualizar-base", action="store_true",
+                        help="Guardar los resultados como nueva línea base")
+    args = parser.parse_args()
+
+    if args.suite:
+        sys.exit(_main_suite(args))
+    if args.arranque:
+        sys.exit(_main_startup(args))
+
+    results = compare_in_place(args.profundidad, args.alfa_beta, args.repeticiones)
+    print(f"Tablero vacío 3x3, profundidad {args.profundidad}, "
+          f"alfa-beta {'sí' if args.alfa_beta else 'no'}")
+    print(f"{'modo':<10}{'nodos':>10}{'estados nuevos':>16}{'tiempo (ms)':>14}{'pico (KB)':>12}")
+    for label, result in results.items():
+        print(f"{label:<10}{result['nodes']:>10}{result['states_created']:>16}"
+              f"{result['time_ms']:>14.1f}{result['peak_memory_kb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
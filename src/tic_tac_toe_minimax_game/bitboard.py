@@ -0,0 +1,374 @@
+from functools import lru_cache
+
+from .minimax import MinimaxAlgorithm
+from .symmetry import BoardSymmetry
+
+PLAYERS = ('X', 'O')
+
+# Direcciones en las que se puede formar una línea: horizontal, vertical y diagonales
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Tiempo por jugada de la IA en tableros mayores que el 3x3 si no se indica otro:
+# en ellos la búsqueda hasta el final de la partida no termina en un tiempo razonable
+DEFAULT_TIME_BUDGET_MS = 1000
+
+
+class Geometry:
+    """Tablero de rows x cols donde gana quien alinea k fichas.
+
+    La casilla (fila, col) ocupa el bit fila * cols + col. Se precalculan las
+    máscaras de todas las líneas de k casillas y, para cada casilla, los
+    índices de las líneas que pasan por ella.
+    """
+
+    def __init__(self, rows, cols, k):
+        if rows < 1 or cols < 1:
+            raise ValueError("El tablero debe tener al menos una fila y una columna")
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(f"k debe estar entre 1 y {max(rows, cols)}")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.size = rows * cols
+        self.full_mask = (1 << self.size) - 1
+        self.moves = [(row, col) for row in range(rows) for col in range(cols)]
+
+        # dict conserva el orden de inserción y descarta las líneas repetidas en O(1)
+        lines = {}
+        for row, col in self.moves:
+            for d_row, d_col in _DIRECTIONS:
+                end_row = row + d_row * (k - 1)
+                end_col = col + d_col * (k - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    mask = 0
+                    for step in range(k):
+                        mask |= 1 << ((row + d_row * step) * cols + col + d_col * step)
+                    lines[mask] = None
+        self.line_masks = tuple(lines)
+        self.cell_lines = tuple(
+            tuple(line for line, mask in enumerate(self.line_masks) if mask >> cell & 1)
+            for cell in range(self.size)
+        )
+        # Para cada jugador y jugada: (bit de la casilla, posiciones de sus contadores en Bitboard.counts)
+        self.move_slots = tuple(
+            {
+                move: (1 << cell, tuple(2 * line + player for line in self.cell_lines[cell]))
+                for cell, move in enumerate(self.moves)
+            }
+            for player in (0, 1)
+        )
+
+        # Las listas de jugadas se memorizan por máscara libre en tableros pequeños
+        self._moves_by_free = {} if self.size <= 16 else None
+        self._symmetry = None
+
+    def __repr__(self):
+        return f"Geometry({self.rows}, {self.cols}, {self.k})"
+
+    def __reduce__(self):
+        return geometry, (self.rows, self.cols, self.k)
+
+    @property
+    def symmetry(self):
+        if self._symmetry is None:
+            self._symmetry = BoardSymmetry(self.rows, self.cols)
+        return self._symmetry
+
+    def cell(self, move):
+        return move[0] * self.cols + move[1]
+
+    def moves_for(self, free):
+        cache = self._moves_by_free
+        if cache is None:
+            return self._list_moves(free)
+        moves = cache.get(free)
+        if moves is None:
+            moves = cache[free] = self._list_moves(free)
+        return moves
+
+    def _list_moves(self, free):
+        moves = self.moves
+        return [moves[cell] for cell in range(self.size) if free >> cell & 1]
+
+
+@lru_cache(maxsize=None)
+def geometry(rows=3, cols=3, k=3):
+    return Geometry(rows, cols, k)
+
+
+def add_board_arguments(parser):
+    """Añade las opciones de tamaño del tablero a un argparse.ArgumentParser."""
+    parser.add_argument("--filas", type=int, default=3, help="Número de filas (por defecto 3)")
+    parser.add_argument("--columnas", type=int, default=3, help="Número de columnas (por defecto 3)")
+    parser.add_argument("--en-raya", type=int, default=3,
+                        help="Fichas en línea necesarias para ganar (por defecto 3)")
+
+
+class Bitboard:
+    """Estado del tablero: una máscara por jugador y el índice del jugador en turno.
+
+    Además lleva, de forma incremental, el número de casillas ocupadas, las
+    fichas de cada jugador en cada línea y el ganador, de modo que al jugar
+    solo se revisan las líneas que pasan por la casilla.
+    """
+
+    __slots__ = ('geometry', 'x', 'o', 'turn', 'filled', 'counts', 'winner_symbol')
+
+    def __init__(self, geometry, x, o, turn, filled, counts, winner_symbol):
+        self.geometry = geometry
+        self.x = x
+        self.o = o
+        self.turn = turn
+        self.filled = filled
+        self.counts = counts
+        self.winner_symbol = winner_symbol
+
+    @classmethod
+    def empty(cls, rows=3, cols=3, k=3):
+        g = geometry(rows, cols, k)
+        return cls(g, 0, 0, 0, 0, [0] * (2 * len(g.line_masks)), None)
+
+    @classmethod
+    def from_masks(cls, x, o, rows=3, cols=3, k=3):
+        g = geometry(rows, cols, k)
+        counts = []
+        winner = None
+        for line in g.line_masks:
+            x_count = bin(x & line).count('1')
+            o_count = bin(o & line).count('1')
+            counts += (x_count, o_count)
+            if x_count == k:
+                winner = 'X'
+            elif o_count == k:
+                winner = 'O'
+        filled = bin(x | o).count('1')
+        return cls(g, x, o, filled % 2, filled, counts, winner)
+
+    @classmethod
+    def from_rows(cls, rows, k=3):
+        """Construye el estado a partir de una lista de listas con 'X', 'O' y ' '."""
+        x = o = 0
+        for row, cells in enumerate(rows):
+            for col, value in enumerate(cells):
+                bit = 1 << (row * len(cells) + col)
+                if value == 'X':
+                    x |= bit
+                elif value == 'O':
+                    o |= bit
+        return cls.from_masks(x, o, len(rows), len(rows[0]), k)
+
+    def __eq__(self, other):
+        return (isinstance(other, Bitboard) and self.geometry is other.geometry
+                and self.x == other.x and self.o == other.o)
+
+    def __hash__(self):
+        return hash((self.x, self.o))
+
+    def __repr__(self):
+        g = self.geometry
+        return f"Bitboard({g.rows}x{g.cols}, k={g.k}, x={self.x:#x}, o={self.o:#x})"
+
+    @property
+    def key(self):
+        return self.x | self.o << self.geometry.size
+
+    @property
+    def player(self):
+        return PLAYERS[self.turn]
+
+    def cell(self, row, col):
+        bit = 1 << (row * self.geometry.cols + col)
+        if self.x & bit:
+            return 'X'
+        if self.o & bit:
+            return 'O'
+        return ' '
+
+    def is_free(self, row, col):
+        g = self.geometry
+        return (0 <= row < g.rows and 0 <= col < g.cols
+                and not (self.x | self.o) >> (row * g.cols + col) & 1)
+
+    def play(self, move):
+        g = self.geometry
+        player = self.turn
+        bit, slots = g.move_slots[player][move]
+        counts = self.counts[:]
+        winner = self.winner_symbol
+        k = g.k
+        for slot in slots:
+            counts[slot] += 1
+            if counts[slot] == k:
+                winner = PLAYERS[player]
+        if player == 0:
+            return Bitboard(g, self.x | bit, self.o, 1, self.filled + 1, counts, winner)
+        return Bitboard(g, self.x, self.o | bit, 0, self.filled + 1, counts, winner)
+
+    def copy(self):
+        return Bitboard(self.geometry, self.x, self.o, self.turn, self.filled,
+                        self.counts[:], self.winner_symbol)
+
+    def apply(self, move):
+        """Juega en el propio estado, sin crear uno nuevo."""
+        g = self.geometry
+        player = self.turn
+        bit, slots = g.move_slots[player][move]
+        counts = self.counts
+        k = g.k
+        for slot in slots:
+            counts[slot] += 1
+            if counts[slot] == k:
+                self.winner_symbol = PLAYERS[player]
+        if player == 0:
+            self.x |= bit
+        else:
+            self.o |= bit
+        self.turn = 1 - player
+        self.filled += 1
+
+    def undo(self, move):
+        """Deshace la última jugada hecha con apply."""
+        g = self.geometry
+        player = 1 - self.turn
+        bit, slots = g.move_slots[player][move]
+        counts = self.counts
+        k = g.k
+        for slot in slots:
+            if counts[slot] == k:
+                self.winner_symbol = None
+            counts[slot] -= 1
+        if player == 0:
+            self.x ^= bit
+        else:
+            self.o ^= bit
+        self.turn = player
+        self.filled -= 1
+
+    def moves(self):
+        g = self.geometry
+        return g.moves_for(g.full_mask & ~(self.x | self.o))
+
+    def is_over(self):
+        return self.winner_symbol is not None or self.filled == self.geometry.size
+
+    def winner(self):
+        """Devuelve 'X', 'O', 'T' (empate) o None si la partida sigue."""
+        if self.winner_symbol is not None:
+            return self.winner_symbol
+        if self.filled == self.geometry.size:
+            return 'T'
+        return None
+
+
+class BitboardGame(MinimaxAlgorithm):
+    """Implementa los métodos de búsqueda de MinimaxAlgorithm sobre Bitboard."""
+
+    def __init__(self, use_alpha_beta=True, use_perfect_play=False, rows=3, cols=3, k=3,
+                 **engine_options):
+        super().__init__(use_alpha_beta, **engine_options)
+        self.geometry = geometry(rows, cols, k)
+        self.human_player = 'X'
+        self.ai_player = 'O'
+        self.use_perfect_play = use_perfect_play
+        self.perfect_play_hit = False
+
+    def default_time_budget(self, time_budget_ms):
+        """Devuelve time_budget_ms o, si es None y el tablero es mayor que 3x3, DEFAULT_TIME_BUDGET_MS."""
+        if time_budget_ms is None and self.geometry.size > 9:
+            return DEFAULT_TIME_BUDGET_MS
+        return time_budget_ms
+
+    def new_board(self):
+        g = self.geometry
+        return Bitboard.empty(g.rows, g.cols, g.k)
+
+    def is_terminal_state(self, state):
+        return state.is_over()
+
+    def evaluate_state(self, state):
+        winner = state.winner_symbol
+        if winner == self.ai_player:
+            return 1.0
+        elif winner == self.human_player:
+            return -1.0
+        else:
+            return 0.0
+
+    def get_possible_moves(self, state):
+        return state.moves()
+
+    def make_move(self, state, move):
+        return state.play(move)
+
+    # Se delega directamente en Bitboard para no añadir una llamada por nodo
+    apply_move = staticmethod(Bitboard.apply)
+    undo_move = staticmethod(Bitboard.undo)
+
+    def state_key(self, state):
+        return state.x | state.o << self.geometry.size
+
+    def canonical_state_key(self, state):
+        return self.geometry.symmetry.canonical(state.x, state.o)
+
+    def map_move(self, move, transform):
+        g = self.geometry
+        return divmod(g.symmetry.map_cell(g.cell(move), transform), g.cols)
+
+    def unmap_move(self, move, transform):
+        g = self.geometry
+        return divmod(g.symmetry.unmap_cell(g.cell(move), transform), g.cols)
+
+    def perfect_move(self, state, depth, maximizing_player):
+        """Consulta la tabla precalculada si la búsqueda llegaría al final de la partida."""
+        g = self.geometry
+        if (g.rows, g.cols, g.k) != (3, 3, 3):
+            return None
+        if depth < g.size - state.filled or maximizing_player != (state.player == self.ai_player):
+            return None
+        from .tablebase import get_table
+        entry = get_table().lookup(state.x, state.o)
+        if entry is None or not entry[1]:
+            return None
+        return entry[1][0]
+
+    def warm_up(self):
+        super().warm_up()
+        g = self.geometry
+        if self.use_symmetry:
+            g.symmetry
+        if self.use_perfect_play and (g.rows, g.cols, g.k) == (3, 3, 3):
+            # La primera consulta mapea el archivo en memoria
+            from .tablebase import get_table
+            get_table().lookup(0, 0)
+
+    def get_best_move(self, state, depth=6, maximizing_player=True, time_budget_ms=None):
+        self.perfect_play_hit = False
+        if self.use_perfect_play:
+            move = self.perfect_move(state, depth, maximizing_player)
+            if move is not None:
+                self.nodes_evaluated = 0
+                self.depth_reached = depth
+                self.search_time = 0.0
+                self.search_time_ns = 0
+                self.iterations = []
+                self.perfect_play_hit = True
+                return move
+        return super().get_best_move(state, depth, maximizing_player, time_budget_ms)
+
+    def get_stats(self):
+        stats = super().get_stats()
+        stats["perfect_play_hit"] = self.perfect_play_hit
+        return stats
+
+    def static_move_priority(self, move):
+        # Las casillas por las que pasan más líneas (centro, esquinas) van primero
+        g = self.geometry
+        return len(g.cell_lines[g.cell(move)])
+
+    def prune_symmetric_moves(self, state, moves):
+        g = self.geometry
+        cells = [row * g.cols + col for row, col in moves]
+        unique = g.symmetry.unique_cells(state.x, state.o, cells)
+        if len(unique) == len(cells):
+            return moves
+        return [divmod(cell, g.cols) for cell in unique]
@@ -0,0 +1,12 @@
+"""Niveles de dificultad de la IA, compartidos por la interfaz y el simulador.
+
+Cada nivel busca hasta 'depth' jugadas y, con probabilidad 'random_chance',
+juega una casilla libre al azar en lugar de la jugada de Minimax.
+"""
+
+DIFFICULTY_LEVELS = {
+    'Fácil': {'depth': 1, 'random_chance': 0.4},
+    'Normal': {'depth': 3, 'random_chance': 0.2},
+    'Difícil': {'depth': 6, 'random_chance': 0.1},
+    'Imposible': {'depth': 9, 'random_chance': 0.0}
+}
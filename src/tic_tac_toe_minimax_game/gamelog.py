@@ -0,0 +1,316 @@
+"""Registro binario de partidas, solo de escritura al final, y su lector.
+
+El archivo empieza con una cabecera (MAGIC, versión) seguida de registros de
+longitud variable, uno por partida:
+
+- cabecera del registro (RECORD): longitud total, filas, columnas, k, código
+  de dificultad, profundidad efectiva (la mayor que completó la IA), ganador,
+  flags, número de jugadas, presupuesto de tiempo por jugada en ms (0 si no
+  había), semilla del generador aleatorio de la partida y marca de tiempo
+- jugadas como índice de casilla: dos por byte (nibbles) en tableros de hasta
+  16 casillas, un byte por jugada hasta 256 casillas y dos bytes (uint16) en
+  los mayores; el formato usado se indica en los flags
+- nodos evaluados (uint32) y tiempo en segundos (float32) de cada jugada
+
+La escritura se hace en un hilo con un archivo con buffer, así quien juega
+solo encola la partida; una partida que no se puede codificar se informa por
+stderr y se descarta sin parar el hilo. El lector mapea el archivo en memoria y recorre los
+registros como un generador; un registro incompleto al final (por ejemplo,
+si el proceso terminó a mitad de escritura) se ignora.
+
+Uso: python -m tic_tac_toe_minimax_game.gamelog resumen partidas.log
+     python -m tic_tac_toe_minimax_game.gamelog reproducir partidas.log --dificultad Difícil
+"""
+import argparse
+import mmap
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+import traceback
+
+from .bitboard import Bitboard
+from .difficulty import DIFFICULTY_LEVELS
+
+MAGIC = b'TTRL'
+VERSION = 2
+HEADER = struct.Struct('<4sHxx')
+RECORD = struct.Struct('<IBBBBBBBHIQd')
+
+DIFFICULTIES = tuple(DIFFICULTY_LEVELS)
+NO_DIFFICULTY = 255
+# Mismos códigos de ganador que batch.winners()
+WINNER_CODES = {None: 0, 'X': 1, 'O': 2, 'T': 3}
+WINNERS = {code: winner for winner, code in WINNER_CODES.items()}
+FLAG_NIBBLES = 1
+FLAG_WIDE = 2
+MAX_NODES = 2 ** 32 - 1
+
+
+def encode(game):
+    """Convierte una partida (dict, como las que genera read_games) en un registro."""
+    rows, cols, k = game['rows'], game['cols'], game['k']
+    cells = [row * cols + col for row, col in game['moves']]
+    count = len(cells)
+    if rows * cols <= 16:
+        flags = FLAG_NIBBLES
+        padded = cells + [0] * (count % 2)
+        moves = bytes(padded[i] | padded[i + 1] << 4 for i in range(0, count, 2))
+    elif rows * cols <= 256:
+        flags = 0
+        moves = bytes(cells)
+    else:
+        flags = FLAG_WIDE
+        moves = struct.pack(f'<{count}H', *cells)
+    nodes = struct.pack(f'<{count}I', *(min(n, MAX_NODES) for n in game['nodes']))
+    times = struct.pack(f'<{count}f', *game['times'])
+    difficulty = game.get('difficulty')
+    length = RECORD.size + len(moves) + len(nodes) + len(times)
+    header = RECORD.pack(
+        length, rows, cols, k,
+        DIFFICULTIES.index(difficulty) if difficulty is not None else NO_DIFFICULTY,
+        game.get('depth', 0), WINNER_CODES[game.get('winner')], flags, count,
+        game.get('time_budget_ms') or 0, game.get('seed') or 0, game.get('timestamp') or time.time()
+    )
+    return header + moves + nodes + times
+
+
+def _decode(buffer, offset, fields):
+    length, rows, cols, k, difficulty, depth, winner, flags, count, time_budget_ms, seed, timestamp = fields
+    offset += RECORD.size
+    if flags & FLAG_NIBBLES:
+        packed = buffer[offset:offset + (count + 1) // 2]
+        cells = [cell for byte in packed for cell in (byte & 0xF, byte >> 4)][:count]
+        offset += len(packed)
+    elif flags & FLAG_WIDE:
+        cells = list(struct.unpack_from(f'<{count}H', buffer, offset))
+        offset += 2 * count
+    else:
+        cells = list(buffer[offset:offset + count])
+        offset += count
+    nodes = list(struct.unpack_from(f'<{count}I', buffer, offset))
+    times = list(struct.unpack_from(f'<{count}f', buffer, offset + 4 * count))
+    return {
+        'rows': rows,
+        'cols': cols,
+        'k': k,
+        'difficulty': DIFFICULTIES[difficulty] if difficulty != NO_DIFFICULTY else None,
+        'depth': depth,
+        'time_budget_ms': time_budget_ms or None,
+        'winner': WINNERS[winner],
+        'seed': seed,
+        'timestamp': timestamp,
+        'moves': [divmod(cell, cols) for cell in cells],
+        'nodes': nodes,
+        'times': times
+    }
+
+
+class GameLogWriter:
+    """Añade partidas al registro desde un hilo propio.
+
+    append() solo encola; el hilo codifica y escribe, y vacía el buffer del
+    archivo cuando no quedan partidas pendientes. close() espera a que se
+    escriba todo lo encolado.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def append(self, game):
+        self._queue.put(game)
+
+    def _run(self):
+        while True:
+            game = self._queue.get()
+            if game is None:
+                break
+            try:
+                record = encode(game)
+            except Exception:
+                # Una partida mal formada no debe parar el registro de las siguientes
+                print("No se pudo registrar la partida:", file=sys.stderr)
+                traceback.print_exc()
+            else:
+                self._file.write(record)
+            if self._queue.empty():
+                self._file.flush()
+        self._file.close()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameLogReader:
+    """Lector perezoso del registro: el archivo se mapea en memoria al recorrerlo."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        return self.games()
+
+    def games(self, difficulty=None, winner=None, rows=None, cols=None, k=None):
+        """Genera las partidas que cumplen los filtros; los filtros solo leen la cabecera del registro."""
+        if os.path.getsize(self.path) <= HEADER.size:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, version = HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Registro de partidas inválido: {self.path}")
+            difficulty_code = None
+            if difficulty is not None:
+                difficulty_code = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else NO_DIFFICULTY
+            winner_code = WINNER_CODES[winner] if winner is not None else None
+            size = len(buffer)
+            offset = HEADER.size
+            while offset + RECORD.size <= size:
+                fields = RECORD.unpack_from(buffer, offset)
+                length = fields[0]
+                if length < RECORD.size or offset + length > size:
+                    break
+                if ((difficulty_code is None or fields[4] == difficulty_code)
+                        and (winner_code is None or fields[6] == winner_code)
+                        and (rows is None or fields[1] == rows)
+                        and (cols is None or fields[2] == cols)
+                        and (k is None or fields[3] == k)):
+                    yield _decode(buffer, offset, fields)
+                offset += length
+
+
+def read_games(path, **filters):
+    return GameLogReader(path).games(**filters)
+
+
+def replay(games, engines=None):
+    """Vuelve a buscar cada jugada de la IA de las partidas y genera la comparación por posición.
+
+    Con la semilla guardada se repiten también las jugadas aleatorias de las
+    dificultades bajas, en el mismo orden que las eligió la partida. Cada búsqueda
+    usa la profundidad y el presupuesto de tiempo guardados.
+    """
+    from .simulate import new_engine
+
+    engines = {} if engines is None else engines
+    for index, game in enumerate(games):
+        size = (game['rows'], game['cols'], game['k'])
+        engine = engines.get(size)
+        if engine is None:
+            engine = engines[size] = new_engine(*size)
+        engine.new_game()
+        config = DIFFICULTY_LEVELS.get(game['difficulty'], {})
+        rng = random.Random(game['seed'])
+        depth = game['depth'] or engine.geometry.size
+        state = Bitboard.empty(*size)
+        for move, nodes, stored_time in zip(game['moves'], game['nodes'], game['times']):
+            if state.player == engine.ai_player:
+                start = time.perf_counter()
+                if rng.random() < config.get('random_chance', 0):
+                    replayed = rng.choice(state.moves())
+                    replayed_nodes = 1
+                else:
+                    replayed = engine.get_best_move(state, depth=depth, maximizing_player=True,
+                                                    time_budget_ms=game['time_budget_ms'])
+                    replayed_nodes = engine.nodes_evaluated
+                yield {
+                    'game': index,
+                    'ply': state.filled,
+                    'move': move,
+                    'replayed_move': replayed,
+                    'nodes': nodes,
+                    'replayed_nodes': replayed_nodes,
+                    'time': stored_time,
+                    'replayed_time': time.perf_counter() - start
+                }
+            state = state.play(move)
+
+
+def _main_summary(args):
+    games = 0
+    moves = 0
+    by_difficulty = {}
+    for game in read_games(args.archivo, **_filters(args)):
+        games += 1
+        moves += len(game['moves'])
+        counts = by_difficulty.setdefault(game['difficulty'] or '-', {'X': 0, 'O': 0, 'T': 0, None: 0})
+        counts[game['winner']] += 1
+    print(f"{games} partidas, {moves} jugadas")
+    print(f"{'dificultad':<12}{'gana X':>8}{'gana O':>8}{'empates':>9}")
+    for difficulty, counts in by_difficulty.items():
+        print(f"{difficulty:<12}{counts['X']:>8}{counts['O']:>8}{counts['T']:>9}")
+    return 0
+
+
+def _main_replay(args):
+    games = read_games(args.archivo, **_filters(args))
+    if args.limite is not None:
+        games = (game for game, _ in zip(games, range(args.limite)))
+    positions = same = nodes = replayed_nodes = 0
+    stored_time = replayed_time = 0.0
+    for result in replay(games):
+        positions += 1
+        same += tuple(result['move']) == tuple(result['replayed_move'])
+        nodes += result['nodes']
+        replayed_nodes += result['replayed_nodes']
+        stored_time += result['time']
+        replayed_time += result['replayed_time']
+    if not positions:
+        print("No hay jugadas de la IA que reproducir")
+        return 0
+    print(f"Posiciones: {positions}")
+    print(f"Misma jugada: {same} ({same / positions:.1%})")
+    print(f"Nodos: {nodes} guardados, {replayed_nodes} ahora")
+    print(f"Tiempo: {stored_time * 1000:.1f} ms guardados, {replayed_time * 1000:.1f} ms ahora")
+    return 0
+
+
+def _filters(args):
+    return {
+        'difficulty': args.dificultad,
+        'winner': args.ganador,
+        'rows': args.filas,
+        'cols': args.columnas,
+        'k': args.en_raya
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Registro binario de partidas")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    for name, help_text in (("resumen", "Partidas por dificultad y ganador"),
+                            ("reproducir", "Repetir la búsqueda de la IA en las posiciones guardadas")):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("archivo")
+        subparser.add_argument("--dificultad", choices=DIFFICULTIES, default=None)
+        subparser.add_argument("--ganador", choices=('X', 'O', 'T'), default=None)
+        subparser.add_argument("--filas", type=int, default=None)
+        subparser.add_argument("--columnas", type=int, default=None)
+        subparser.add_argument("--en-raya", type=int, default=None)
+        if name == "reproducir":
+            subparser.add_argument("--limite", type=int, default=None, help="Número máximo de partidas")
+    args = parser.parse_args()
+
+    if args.comando == "resumen":
+        sys.exit(_main_summary(args))
+    sys.exit(_main_replay(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Almacén compacto de las métricas de cada jugada de la IA.
+
+Las jugadas se guardan por columnas en arrays de tamaño fijo que funcionan
+como un buffer circular: añadir es O(1) y, al llenarse, se sobrescriben las
+más antiguas. La dificultad se guarda como un código de un byte y cada
+partida es un segmento que empieza en una posición absoluta de la secuencia.
+Los agregados por dificultad (media y p95 de nodos y tiempo) se actualizan
+con cada jugada y cubren toda la sesión, incluidas las jugadas ya descartadas.
+"""
+import csv
+import math
+import zipfile
+from array import array
+from collections import deque
+
+DEFAULT_CAPACITY = 10000
+
+# Columnas numéricas y su typecode de array (el mismo carácter que usa NumPy)
+COLUMNS = (
+    ('nodes_evaluated', 'q'),
+    ('depth_used', 'h'),
+    ('time_taken', 'd'),
+    ('difficulty', 'B'),
+    ('empty_cells', 'h'),
+)
+
+
+class _LogHistogram:
+    """Histograma con cubos logarítmicos para percentiles aproximados en O(1) por dato.
+
+    Con SUBBINS cubos por potencia de 2 el error relativo es menor del 5%.
+    """
+
+    SUBBINS = 16
+
+    def __init__(self):
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+        self.max = 0
+
+    def add(self, value):
+        self.count += 1
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        bucket = math.floor(math.log2(value) * self.SUBBINS)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        if not self.count:
+            return None
+        rank = math.ceil(fraction * self.count)
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # Límite superior del cubo, sin pasar del mayor valor visto
+                return min(2 ** ((bucket + 1) / self.SUBBINS), self.max)
+        return None
+
+
+class _DifficultyStats:
+    def __init__(self):
+        self.moves = 0
+        self.nodes = 0
+        self.time = 0.0
+        self.nodes_histogram = _LogHistogram()
+        self.time_histogram = _LogHistogram()
+
+    def add(self, nodes, time_taken):
+        self.moves += 1
+        self.nodes += nodes
+        self.time += time_taken
+        self.nodes_histogram.add(nodes)
+        self.time_histogram.add(time_taken)
+
+    def to_dict(self):
+        p95_time = self.time_histogram.percentile(0.95)
+        return {
+            "moves": self.moves,
+            "mean_nodes": self.nodes / self.moves,
+            "p95_nodes": self.nodes_histogram.percentile(0.95),
+            "mean_time_ms": self.time / self.moves * 1000,
+            "p95_time_ms": p95_time * 1000 if p95_time is not None else None
+        }
+
+
+class MoveMetrics:
+    """Métricas por jugada en columnas con un buffer circular de capacity jugadas."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity debe ser positivo")
+        self.capacity = capacity
+        self.columns = {name: array(code, bytes(array(code).itemsize * capacity)) for name, code in COLUMNS}
+        # Jugadas añadidas desde el principio; la jugada i (desde 0) ocupa la posición i % capacity
+        self.total = 0
+        self.difficulty_names = []
+        self._difficulty_codes = {}
+        # Partidas como (número de partida, posición absoluta de su primera jugada)
+        self.games = deque()
+        self.game_count = 0
+        self._stats = {}
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def first(self):
+        """Posición absoluta de la jugada más antigua que se conserva."""
+        return self.total - len(self)
+
+    def difficulty_code(self, name):
+        code = self._difficulty_codes.get(name)
+        if code is None:
+            if len(self.difficulty_names) > 255:
+                raise ValueError("Demasiadas dificultades distintas")
+            code = self._difficulty_codes[name] = len(self.difficulty_names)
+            self.difficulty_names.append(name)
+        return code
+
+    def new_game(self):
+        """Marca el comienzo de una partida; las jugadas siguientes pertenecen a ella."""
+        if self.games and self.games[-1][1] == self.total:
+            # La partida anterior no llegó a tener jugadas
+            self.games.pop()
+        self.game_count += 1
+        self.games.append((self.game_count, self.total))
+
+    def append(self, nodes_evaluated, depth_used, time_taken, difficulty, empty_cells):
+        """Añade una jugada y devuelve su número (desde 1)."""
+        if not self.games:
+            self.new_game()
+        slot = self.total % self.capacity
+        columns = self.columns
+        columns['nodes_evaluated'][slot] = nodes_evaluated
+        columns['depth_used'][slot] = depth_used
+        columns['time_taken'][slot] = time_taken
+        columns['difficulty'][slot] = self.difficulty_code(difficulty)
+        columns['empty_cells'][slot] = empty_cells
+        # total se incrementa al final: quien lea desde otro hilo solo ve jugadas completas
+        self.total += 1
+
+        stats = self._stats.get(difficulty)
+        if stats is None:
+            stats = self._stats[difficulty] = _DifficultyStats()
+        stats.add(nodes_evaluated, time_taken)
+
+        # Se olvidan las partidas cuyas jugadas ya se sobrescribieron todas
+        while len(self.games) > 1 and self.games[1][1] <= self.first:
+            self.games.popleft()
+        return self.total
+
+    def _slices(self, start, end):
+        """Rangos de posiciones del array, en orden, para las jugadas absolutas [start, end)."""
+        start = max(start, self.first)
+        if start >= end:
+            return []
+        a, b = start % self.capacity, end % self.capacity or self.capacity
+        if a < b:
+            return [(a, b)]
+        return [(a, self.capacity), (0, b)]
+
+    def rows(self, start=0, end=None):
+        """Genera (número de jugada, partida, nodos, profundidad, tiempo, dificultad, casillas libres)."""
+        end = self.total if end is None else min(end, self.total)
+        games = list(self.games)
+        game_index = 0
+        move = max(start, self.first)
+        columns = [self.columns[name] for name, _ in COLUMNS]
+        nodes, depth, time_taken, difficulty, empty = columns
+        for a, b in self._slices(start, end):
+            for slot in range(a, b):
+                while game_index + 1 < len(games) and games[game_index + 1][1] <= move:
+                    game_index += 1
+                move += 1
+                yield (move, games[game_index][0], nodes[slot], depth[slot], time_taken[slot],
+                       self.difficulty_names[difficulty[slot]], empty[slot])
+
+    def series(self, start=0):
+        """Listas por serie de las jugadas desde la posición absoluta start (con los nombres de analysis_data)."""
+        series = {'moves': [], 'nodes_evaluated': [], 'depth_used': [], 'time_taken': [],
+                  'difficulty': [], 'empty_cells': []}
+        for move, _, nodes, depth, time_taken, difficulty, empty in self.rows(start):
+            series['moves'].append(move)
+            series['nodes_evaluated'].append(nodes)
+            series['depth_used'].append(depth)
+            series['time_taken'].append(time_taken)
+            series['difficulty'].append(difficulty)
+            series['empty_cells'].append(empty)
+        return series
+
+    def last(self):
+        """Última jugada como en rows(), o None si no hay ninguna."""
+        if not self.total:
+            return None
+        return next(self.rows(self.total - 1))
+
+    def summary(self):
+        """Agregados por dificultad de toda la sesión."""
+        return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def export_csv(self, path):
+        """Escribe las jugadas conservadas fila a fila, sin construir la historia completa."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['move', 'game', 'nodes_evaluated', 'depth_used', 'time_taken',
+                             'difficulty', 'empty_cells'])
+            writer.writerows(self.rows())
+
+    def export_npz(self, path):
+        """Escribe cada columna como un .npy dentro del .npz, volcando directamente los arrays."""
+        import numpy as np
+        from numpy.lib import format as npy
+
+        count = len(self)
+        first = self.first
+        slices = self._slices(first, self.total)
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, code in COLUMNS:
+                column = memoryview(self.columns[name])
+                with archive.open(name + '.npy', 'w', force_zip64=True) as f:
+                    npy.write_array_header_1_0(f, {
+                        'descr': npy.dtype_to_descr(np.dtype(code)),
+                        'fortran_order': False,
+                        'shape': (count,)
+                    })
+                    for a, b in slices:
+                        f.write(column[a:b])
+            # Columnas pequeñas: números de jugada y tablas auxiliares
+            extras = {
+                'move': np.arange(first + 1, self.total + 1, dtype=np.int64),
+                'difficulty_names': np.array(self.difficulty_names, dtype=str),
+                'game_numbers': np.array([game for game, _ in self.games], dtype=np.int64),
+                'game_starts': np.array([start + 1 for _, start in self.games], dtype=np.int64),
+            }
+            for name, values in extras.items():
+                with archive.open(name + '.npy', 'w', force_zip64=True) as f:
+                    npy.write_array(f, values)
+
+    def export(self, path):
+        """Exporta a CSV o NPZ según la extensión del archivo."""
+        if path.endswith('.npz'):
+            self.export_npz(path)
+        else:
+            self.export_csv(path)
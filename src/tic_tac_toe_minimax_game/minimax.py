@@ -1,63 +1,711 @@
 import math
+import time
+from .transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+
+class SearchAborted(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el tiempo disponible o se cancela."""
+
 
 class MinimaxAlgorithm:
-    def __init__(self, use_alpha_beta=True):
+    # Valor de una victoria en la raíz; cada jugada de más hasta llegar a ella resta 1,
+    # así se prefiere ganar antes y, si no se puede evitar, perder lo más tarde posible
+    MATE_SCORE = 1000.0
+    # Por encima de este valor absoluto una puntuación es de victoria o derrota
+    MATE_THRESHOLD = MATE_SCORE / 2
+    
+    # Cada cuántos nodos se consulta el reloj y la cancelación durante la búsqueda
+    TIME_CHECK_INTERVAL = 1024
+    # Ancho de la ventana nula de PVS: menor que la diferencia entre dos puntuaciones distintas
+    NULL_WINDOW = 1e-6
+    
+    VARIANTS = ('minimax', 'negamax')
+    
+    def __init__(self, use_alpha_beta=True, transposition_table=None, use_symmetry=False,
+                 move_ordering=None, use_in_place=None, workers=1, variant='minimax',
+                 aspiration_window=0.5, instrument=False, stats_callback=None,
+                 stats_interval_ms=None):
+        if variant not in self.VARIANTS:
+            raise ValueError(f"variant debe ser uno de {self.VARIANTS}")
+        # 'negamax' usa búsqueda de variante principal (PVS) y, en la búsqueda
+        # iterativa, ventanas de aspiración de ±aspiration_window. Sin move_ordering
+        # la primera jugada no suele ser la mejor y PVS puede evaluar más nodos
+        self.variant = variant
+        self.aspiration_window = aspiration_window
         self.use_alpha_beta = use_alpha_beta
+        self.transposition_table = transposition_table
+        self.use_symmetry = use_symmetry
+        self.move_ordering = move_ordering
+        # Por defecto se juega sobre el mismo estado si la subclase implementa apply/undo
+        if use_in_place is None:
+            use_in_place = type(self).apply_move is not MinimaxAlgorithm.apply_move
+        self.use_in_place = use_in_place
+        # Con workers > 1 las jugadas de la raíz se reparten entre procesos
+        self.workers = workers
+        self.worker_nodes = {}
+        self._parallel = None
         self.nodes_evaluated = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.research_count = 0
+        self.aspiration_failures = 0
+        self.mate_distance_cutoffs = 0
+        # Peticiones y posiciones distintas de la última llamada a get_best_moves
+        self.batch_requests = 0
+        self.batch_unique_positions = 0
+        
+        # Estado de la búsqueda iterativa
+        self._deadline = None
+        self._cancelled = False
+        self._root_depth = 0
+        self._pv = []
+        self._pv_table = None
+        self._follow_pv = False
+        self._horizon_reached = False
+        self.depth_reached = 0
+        self.search_time = 0.0
+        self.search_time_ns = 0
+        self._search_start_ns = 0
+        
+        # Instrumentación: con instrument=False no se añade ningún trabajo por nodo
+        self.instrument = instrument
+        self.nodes_by_ply = {}
+        self.leaf_nodes = 0
+        self.terminal_nodes = 0
+        self.iterations = []
+        # stats_callback(stats) se llama tras cada iteración completa y, con
+        # stats_interval_ms, también periódicamente durante la búsqueda
+        self.stats_callback = stats_callback
+        self.stats_interval_ms = stats_interval_ms
+        self._next_report = None
+        if instrument:
+            self._install_instrumentation()
+    
+    def _install_instrumentation(self):
+        # Se sustituyen los métodos en la instancia: las llamadas recursivas pasan
+        # por los contadores y la clase queda intacta para los motores sin instrumentar
+        def counted(search):
+            def wrapper(state, depth, *args):
+                ply = self._root_depth - depth
+                self.nodes_by_ply[ply] = self.nodes_by_ply.get(ply, 0) + 1
+                return search(state, depth, *args)
+            return wrapper
+        
+        evaluate_state = self.evaluate_state
+        
+        def evaluate(state):
+            # evaluate_state solo se llama en nodos terminales o en el horizonte
+            if self.is_terminal_state(state):
+                self.terminal_nodes += 1
+            else:
+                self.leaf_nodes += 1
+            return evaluate_state(state)
+        
+        self.minimax = counted(self.minimax)
+        self.negamax = counted(self.negamax)
+        self.evaluate_state = evaluate
+    
+    def state_key(self, state):
+        # Las subclases devuelven una clave hashable para usar la tabla de transposición
+        raise NotImplementedError
+    
+    # Con use_symmetry las subclases mapean cada estado a un representante canónico
+    def canonical_state_key(self, state):
+        return self.state_key(state), None
+    
+    def map_move(self, move, transform):
+        return move
+    
+    def unmap_move(self, move, transform):
+        return move
+    
+    def prune_symmetric_moves(self, state, moves):
+        return moves
+    
+    # Protocolo opcional para buscar modificando el estado y deshaciendo la jugada
+    # en lugar de crear un estado nuevo en cada nodo con make_move
+    def apply_move(self, state, move):
+        raise NotImplementedError
+    
+    def undo_move(self, state, move):
+        raise NotImplementedError
+    
+    def static_move_priority(self, move):
+        # Las subclases pueden favorecer jugadas a priori (p. ej. el centro)
+        return 0
+    
+    def new_game(self):
+        """Olvida la historia de ordenación acumulada durante una partida."""
+        if self.move_ordering is not None:
+            self.move_ordering.reset()
     
     def minimax(self, state, depth, maximizing_player, 
                 alpha=-math.inf, beta=math.inf):
         self.nodes_evaluated += 1
         
-        if depth == 0 or self.is_terminal_state(state):
+        if self.nodes_evaluated % self.TIME_CHECK_INTERVAL == 0:
+            self._periodic_check()
+        
+        ply = self._root_depth - depth
+        if self.is_terminal_state(state):
+            return self._terminal_score(state, ply), None
+        if depth == 0:
+            self._horizon_reached = True
             return self.evaluate_state(state), None
         
+        if self.use_alpha_beta:
+            # Poda por distancia: desde aquí no se puede ganar ni perder antes del siguiente ply
+            bound = self.MATE_SCORE - ply - 1
+            alpha = max(alpha, -bound)
+            beta = min(beta, bound)
+            if alpha >= beta:
+                self.mate_distance_cutoffs += 1
+                return (alpha if maximizing_player else beta), None
+        
+        tt_move = None
+        table = self.transposition_table
+        if table is not None:
+            key, transform = self._tt_key(state, maximizing_player)
+            entry = table.lookup(key)
+            if entry is not None:
+                tt_move = entry[3]
+                if transform is not None and tt_move is not None:
+                    tt_move = self.unmap_move(tt_move, transform)
+            # La raíz siempre se busca: una cota estrecharía la ventana y una jugada peor
+            # podría empatar con ella, y la jugada de una entrada exacta pudo elegirse con
+            # otro orden entre las que empatan
+            if entry is not None and entry[1] >= depth and depth != self._root_depth:
+                # La entrada pudo venir de una búsqueda cortada por profundidad
+                self._horizon_reached = True
+                score = self._score_from_table(entry[0], ply)
+                flag = entry[2]
+                move = tt_move
+                if flag == EXACT:
+                    return score, move
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score, move
+            alpha_orig, beta_orig = alpha, beta
+        
+        score, best_move = self._search_moves(state, depth, maximizing_player, alpha, beta, tt_move)
+        
+        if table is not None:
+            if score <= alpha_orig:
+                flag = UPPER_BOUND
+            elif score >= beta_orig:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            stored_move = best_move
+            if transform is not None and best_move is not None:
+                stored_move = self.map_move(best_move, transform)
+            table.store(key, self._score_to_table(score, ply), depth, flag, stored_move)
+        
+        return score, best_move
+    
+    def negamax(self, state, depth, color, alpha=-math.inf, beta=math.inf):
+        """Negamax con PVS. Las puntuaciones son relativas al jugador en turno (color = ±1)."""
+        self.nodes_evaluated += 1
+        
+        if self.nodes_evaluated % self.TIME_CHECK_INTERVAL == 0:
+            self._periodic_check()
+        
+        ply = self._root_depth - depth
+        if self.is_terminal_state(state):
+            return color * self._terminal_score(state, ply), None
+        if depth == 0:
+            self._horizon_reached = True
+            return color * self.evaluate_state(state), None
+        
+        if self.use_alpha_beta:
+            bound = self.MATE_SCORE - ply - 1
+            alpha = max(alpha, -bound)
+            beta = min(beta, bound)
+            if alpha >= beta:
+                self.mate_distance_cutoffs += 1
+                return alpha, None
+        
+        # La tabla guarda valores desde el punto de vista del jugador maximizador,
+        # como en minimax, así ambas variantes pueden compartirla
+        tt_move = None
+        table = self.transposition_table
+        if table is not None:
+            key, transform = self._tt_key(state, color == 1)
+            entry = table.lookup(key)
+            if entry is not None:
+                tt_move = entry[3]
+                if transform is not None and tt_move is not None:
+                    tt_move = self.unmap_move(tt_move, transform)
+            if entry is not None and entry[1] >= depth and depth != self._root_depth:
+                self._horizon_reached = True
+                score = color * self._score_from_table(entry[0], ply)
+                flag = entry[2]
+                if color == -1 and flag != EXACT:
+                    flag = LOWER_BOUND if flag == UPPER_BOUND else UPPER_BOUND
+                if flag == EXACT:
+                    return score, tt_move
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score, tt_move
+            alpha_orig, beta_orig = alpha, beta
+        
+        best_score = -math.inf
+        best_move = None
+        moves = self._order_moves(state, self.get_possible_moves(state), ply, tt_move)
+        pv_table = self._pv_table
+        in_place = self.use_in_place
+        use_alpha_beta = self.use_alpha_beta
+        
+        for index, move in enumerate(moves):
+            if pv_table is not None:
+                pv_table[ply + 1] = []
+            child = state
+            if in_place:
+                self.apply_move(state, move)
+            else:
+                child = self.make_move(state, move)
+            try:
+                if index == 0 or not use_alpha_beta:
+                    score = -self.negamax(child, depth - 1, -color, -beta, -alpha)[0]
+                else:
+                    # Ventana nula: solo se comprueba si la jugada mejora alpha
+                    score = -self.negamax(child, depth - 1, -color, -alpha - self.NULL_WINDOW, -alpha)[0]
+                    if alpha < score < beta:
+                        self.research_count += 1
+                        score = -self.negamax(child, depth - 1, -color, -beta, -alpha)[0]
+            finally:
+                if in_place:
+                    self.undo_move(state, move)
+            self._follow_pv = False
+            
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if pv_table is not None:
+                    pv_table[ply] = [move] + pv_table[ply + 1]
+            
+            if use_alpha_beta:
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    self._record_cutoff(move, ply, depth, index)
+                    break
+        
+        if table is not None:
+            if best_score <= alpha_orig:
+                flag = UPPER_BOUND
+            elif best_score >= beta_orig:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            if color == -1 and flag != EXACT:
+                flag = LOWER_BOUND if flag == UPPER_BOUND else UPPER_BOUND
+            stored_move = best_move
+            if transform is not None and best_move is not None:
+                stored_move = self.map_move(best_move, transform)
+            table.store(key, self._score_to_table(color * best_score, ply), depth, flag, stored_move)
+        
+        return best_score, best_move
+    
+    def _search(self, state, depth, maximizing_player, alpha=-math.inf, beta=math.inf):
+        """Búsqueda con la variante configurada; la puntuación es la del jugador maximizador."""
+        if self.variant == 'negamax':
+            if maximizing_player:
+                return self.negamax(state, depth, 1, alpha, beta)
+            score, move = self.negamax(state, depth, -1, -beta, -alpha)
+            return -score, move
+        return self.minimax(state, depth, maximizing_player, alpha, beta)
+    
+    def _terminal_score(self, state, ply):
+        """Puntuación de un estado terminal, corregida por la distancia a la raíz."""
+        score = self.evaluate_state(state)
+        if score > 0:
+            return self.MATE_SCORE - ply
+        if score < 0:
+            return ply - self.MATE_SCORE
+        return score
+    
+    # La tabla guarda las victorias como distancia desde el propio nodo, no desde la
+    # raíz, para que la entrada sirva aunque la posición aparezca a otro ply
+    def _score_to_table(self, score, ply):
+        if score > self.MATE_THRESHOLD:
+            return score + ply
+        if score < -self.MATE_THRESHOLD:
+            return score - ply
+        return score
+    
+    def _score_from_table(self, score, ply):
+        if score > self.MATE_THRESHOLD:
+            return score - ply
+        if score < -self.MATE_THRESHOLD:
+            return score + ply
+        return score
+    
+    def _tt_key(self, state, maximizing_player):
+        if self.use_symmetry:
+            key, transform = self.canonical_state_key(state)
+        else:
+            key, transform = self.state_key(state), None
+        return (key, maximizing_player), transform
+    
+    def _order_moves(self, state, moves, ply, tt_move):
+        if self.use_symmetry:
+            moves = self.prune_symmetric_moves(state, moves)
+        
+        # En la búsqueda iterativa se prueba primero la variante principal anterior
+        first_move = None
+        if self._follow_pv:
+            self._follow_pv = False
+            if ply < len(self._pv) and self._pv[ply] in moves:
+                first_move = self._pv[ply]
+                self._follow_pv = True
+        
+        ordering = self.move_ordering
+        if ply == 0:
+            # La raíz no usa la tabla ni la historia: así, entre jugadas que empatan, la
+            # elegida no depende de lo que guardaron las búsquedas anteriores (ni de las
+            # cotas que guardan los workers de la búsqueda paralela)
+            if ordering is not None and ordering.use_static:
+                moves = sorted(moves, key=self.static_move_priority, reverse=True)
+        elif ordering is not None:
+            return ordering.order(moves, ply, first_move or tt_move, self.static_move_priority)
+        if first_move is not None:
+            return [first_move] + [move for move in moves if move != first_move]
+        return moves
+    
+    def _search_moves(self, state, depth, maximizing_player, alpha, beta, tt_move=None):
         best_move = None
+        ply = self._root_depth - depth
+        moves = self._order_moves(state, self.get_possible_moves(state), ply, tt_move)
+        pv_table = self._pv_table
+        in_place = self.use_in_place
+        if in_place:
+            apply_move = self.apply_move
+            undo_move = self.undo_move
         
         if maximizing_player:
             max_eval = -math.inf
-            for move in self.get_possible_moves(state):
-                new_state = self.make_move(state, move)
-                eval_score, _ = self.minimax(new_state, depth - 1, False, alpha, beta)
+            for index, move in enumerate(moves):
+                if pv_table is not None:
+                    pv_table[ply + 1] = []
+                if in_place:
+                    apply_move(state, move)
+                    try:
+                        eval_score, _ = self.minimax(state, depth - 1, False, alpha, beta)
+                    finally:
+                        undo_move(state, move)
+                else:
+                    new_state = self.make_move(state, move)
+                    eval_score, _ = self.minimax(new_state, depth - 1, False, alpha, beta)
+                self._follow_pv = False
                 
                 if eval_score > max_eval:
                     max_eval = eval_score
                     best_move = move
+                    if pv_table is not None:
+                        pv_table[ply] = [move] + pv_table[ply + 1]
                 
                 if self.use_alpha_beta:
                     alpha = max(alpha, eval_score)
                     if beta <= alpha:
+                        self._record_cutoff(move, ply, depth, index)
                         break
             
             return max_eval, best_move
         
         else:
             min_eval = math.inf
-            for move in self.get_possible_moves(state):
-                new_state = self.make_move(state, move)
-                eval_score, _ = self.minimax(new_state, depth - 1, True, alpha, beta)
+            for index, move in enumerate(moves):
+                if pv_table is not None:
+                    pv_table[ply + 1] = []
+                if in_place:
+                    apply_move(state, move)
+                    try:
+                        eval_score, _ = self.minimax(state, depth - 1, True, alpha, beta)
+                    finally:
+                        undo_move(state, move)
+                else:
+                    new_state = self.make_move(state, move)
+                    eval_score, _ = self.minimax(new_state, depth - 1, True, alpha, beta)
+                self._follow_pv = False
                 
                 if eval_score < min_eval:
                     min_eval = eval_score
                     best_move = move
+                    if pv_table is not None:
+                        pv_table[ply] = [move] + pv_table[ply + 1]
                 
                 if self.use_alpha_beta:
                     beta = min(beta, eval_score)
                     if beta <= alpha:
+                        self._record_cutoff(move, ply, depth, index)
                         break
             
             return min_eval, best_move
     
-    def get_best_move(self, state, depth=6, maximizing_player=True):
+    def _periodic_check(self):
+        if self._cancelled or (self._deadline is not None and time.perf_counter() > self._deadline):
+            raise SearchAborted()
+        if self._next_report is not None:
+            now = time.perf_counter()
+            if now >= self._next_report:
+                self._next_report = now + self.stats_interval_ms / 1000
+                self.stats_callback(self.get_stats())
+    
+    def _record_iteration(self, depth):
+        self.iterations.append({
+            "depth": depth,
+            "nodes": self.nodes_evaluated,
+            "time_ns": time.perf_counter_ns() - self._search_start_ns
+        })
+        if self.stats_callback is not None:
+            self.stats_callback(self.get_stats())
+    
+    def cancel(self):
+        """Pide desde otro hilo que la búsqueda en curso termine con SearchAborted.
+        
+        La marca se mantiene, y aborta también las búsquedas siguientes, hasta
+        llamar a clear_cancel().
+        """
+        self._cancelled = True
+    
+    def clear_cancel(self):
+        self._cancelled = False
+    
+    def _record_cutoff(self, move, ply, depth, index):
+        self.beta_cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if self.move_ordering is not None:
+            self.move_ordering.record_cutoff(move, ply, depth)
+    
+    def get_best_move(self, state, depth=6, maximizing_player=True, time_budget_ms=None):
         self.nodes_evaluated = 0
-        _, best_move = self.minimax(state, depth, maximizing_player)
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.research_count = 0
+        self.aspiration_failures = 0
+        self.mate_distance_cutoffs = 0
+        # Nodos por proceso de toda la búsqueda, sumando las iteraciones
+        self.worker_nodes = {}
+        if self.move_ordering is not None:
+            self.move_ordering.new_search()
+        self.iterations = []
+        if self.instrument:
+            self.nodes_by_ply.clear()
+            self.leaf_nodes = 0
+            self.terminal_nodes = 0
+        start_ns = self._search_start_ns = time.perf_counter_ns()
+        if self.stats_callback is not None and self.stats_interval_ms is not None:
+            self._next_report = start_ns / 1e9 + self.stats_interval_ms / 1000
+        
+        try:
+            if time_budget_ms is None and self.workers > 1:
+                self._root_depth = depth
+                _, best_move = self._parallel_search(state, depth, maximizing_player)
+                self.depth_reached = depth
+                self._record_iteration(depth)
+            elif time_budget_ms is None:
+                self._root_depth = depth
+                _, best_move = self._search(state, depth, maximizing_player)
+                self.depth_reached = depth
+                self._record_iteration(depth)
+            else:
+                best_move = self._iterative_deepening(state, depth, maximizing_player,
+                                                      start_ns / 1e9 + time_budget_ms / 1000)
+        finally:
+            self._next_report = None
+        
+        self.search_time_ns = time.perf_counter_ns() - start_ns
+        self.search_time = self.search_time_ns / 1e9
+        return best_move
+    
+    def get_best_moves(self, states, depth=6, maximizing_player=True, time_budget_ms=None):
+        """Mejor jugada para cada estado, en el mismo orden, buscando una vez por posición.
+        
+        Los estados iguales o simétricos se agrupan por su clave canónica y solo se
+        busca el primero de cada grupo; su jugada se transforma para los demás. Todas
+        las búsquedas del lote comparten la tabla de transposición (si el motor no
+        tiene una, se usa una temporal).
+        """
+        requests = []
+        groups = {}
+        for state in states:
+            key, transform = self.canonical_state_key(state)
+            requests.append((key, transform))
+            if key not in groups:
+                groups[key] = (state, transform)
+        
+        own_table = self.transposition_table is None
+        if own_table:
+            self.transposition_table = TranspositionTable()
+        solved = {}
+        total_nodes = 0
+        start_ns = time.perf_counter_ns()
+        try:
+            for key, (state, transform) in groups.items():
+                move = self.get_best_move(state, depth, maximizing_player, time_budget_ms)
+                total_nodes += self.nodes_evaluated
+                solved[key] = (move, transform)
+        finally:
+            if own_table:
+                self.transposition_table = None
+        
+        moves = []
+        for key, transform in requests:
+            move, solved_transform = solved[key]
+            if move is not None and transform != solved_transform:
+                move = self.unmap_move(self.map_move(move, solved_transform), transform)
+            moves.append(move)
+        
+        self.nodes_evaluated = total_nodes
+        self.search_time_ns = time.perf_counter_ns() - start_ns
+        self.search_time = self.search_time_ns / 1e9
+        self.batch_requests = len(requests)
+        self.batch_unique_positions = len(groups)
+        return moves
+    
+    def _iterative_deepening(self, state, max_depth, maximizing_player, deadline):
+        """Busca a profundidad 1, 2, 3... hasta max_depth o hasta agotar el tiempo."""
+        best_move = None
+        score = None
+        self.depth_reached = 0
+        self._pv = []
+        try:
+            for depth in range(1, max_depth + 1):
+                # La primera iteración siempre termina para tener una jugada válida
+                self._deadline = deadline if depth > 1 else None
+                self._root_depth = depth
+                self._pv_table = {}
+                self._follow_pv = True
+                self._horizon_reached = False
+                try:
+                    if self.workers > 1:
+                        # Con varios procesos cada iteración reparte las jugadas de la raíz
+                        score, move = self._parallel_search(state, depth, maximizing_player)
+                    elif self.variant == 'negamax' and score is not None and self.use_alpha_beta:
+                        score, move = self._aspiration_search(state, depth, maximizing_player, score)
+                    else:
+                        score, move = self._search(state, depth, maximizing_player)
+                except SearchAborted:
+                    # Una cancelación no devuelve la jugada de la última iteración completa
+                    if self._cancelled:
+                        raise
+                    break
+                if move is None:
+                    break
+                best_move = move
+                self.depth_reached = depth
+                self._pv = self._pv_table.get(0) or [move]
+                self._record_iteration(depth)
+                # Si ninguna hoja quedó cortada por la profundidad, seguir no cambia nada
+                if not self._horizon_reached or time.perf_counter() > deadline:
+                    break
+        finally:
+            self._deadline = None
+            self._pv_table = None
+            self._follow_pv = False
         return best_move
     
+    def _aspiration_search(self, state, depth, maximizing_player, previous_score):
+        """Busca con una ventana centrada en la puntuación de la iteración anterior."""
+        alpha = previous_score - self.aspiration_window
+        beta = previous_score + self.aspiration_window
+        score, move = self._search(state, depth, maximizing_player, alpha, beta)
+        if alpha < score < beta:
+            return score, move
+        # Fuera de la ventana el valor es solo una cota: se repite con la ventana completa
+        self.aspiration_failures += 1
+        self._pv_table = {}
+        self._follow_pv = True
+        return self._search(state, depth, maximizing_player)
+    
+    def _parallel_search(self, state, depth, maximizing_player):
+        self._start_parallel()
+        return self._parallel.search(state, depth, maximizing_player)
+    
+    def _start_parallel(self):
+        if self._parallel is None:
+            from .parallel import ParallelRootSearch
+            self._parallel = ParallelRootSearch(self, self.workers)
+    
+    def warm_up(self):
+        """Prepara por adelantado lo que la primera búsqueda crearía bajo demanda.
+        
+        Pensado para ejecutarse en otro hilo mientras el usuario aún no ha pedido
+        ninguna jugada; no debe coincidir con una búsqueda del mismo motor.
+        """
+        if self.workers > 1:
+            self._start_parallel()
+    
+    def close(self):
+        """Libera los procesos de la búsqueda paralela, si se crearon."""
+        if self._parallel is not None:
+            self._parallel.shutdown()
+            self._parallel = None
+    
+    def __getstate__(self):
+        # El pool de procesos, el callback y los métodos instrumentados no se envían
+        # a los workers ni pasan a las copias; las subclases quitan sus propios hilos
+        state = self.__dict__.copy()
+        state['_parallel'] = None
+        state['stats_callback'] = None
+        state['instrument'] = False
+        for name in ('minimax', 'negamax', 'evaluate_state'):
+            state.pop(name, None)
+        return state
+    
+    def effective_branching_factor(self):
+        """Factor de ramificación efectivo: b tal que b ** profundidad = nodos evaluados."""
+        if self.depth_reached <= 0 or self.nodes_evaluated <= 1:
+            return 0.0
+        return self.nodes_evaluated ** (1 / self.depth_reached)
+    
+    def get_principal_variation(self):
+        return list(self._pv)
+    
     def get_stats(self):
-        return {
+        stats = {
             "nodes_evaluated": self.nodes_evaluated,
-            "alpha_beta_enabled": self.use_alpha_beta
+            "variant": self.variant,
+            "alpha_beta_enabled": self.use_alpha_beta,
+            "in_place_enabled": self.use_in_place,
+            "symmetry_enabled": self.use_symmetry,
+            "depth_reached": self.depth_reached,
+            "search_time_ms": self.search_time * 1000,
+            "search_time_ns": self.search_time_ns,
+            "nodes_per_second": self.nodes_evaluated / self.search_time if self.search_time > 0 else 0.0,
+            "move_ordering_enabled": self.move_ordering is not None,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": (self.first_move_cutoffs / self.beta_cutoffs
+                                       if self.beta_cutoffs else 0.0),
+            "mate_distance_cutoffs": self.mate_distance_cutoffs,
+            "effective_branching_factor": self.effective_branching_factor(),
+            "iterations": [dict(iteration) for iteration in self.iterations]
         }
+        if self.instrument:
+            stats["nodes_by_ply"] = dict(sorted(self.nodes_by_ply.items()))
+            stats["leaf_nodes"] = self.leaf_nodes
+            stats["terminal_nodes"] = self.terminal_nodes
+            stats["max_ply_reached"] = max(self.nodes_by_ply, default=0)
+        if self.batch_requests:
+            stats["batch_requests"] = self.batch_requests
+            stats["batch_unique_positions"] = self.batch_unique_positions
+        if self.variant == 'negamax':
+            stats["pvs_researches"] = self.research_count
+            stats["aspiration_failures"] = self.aspiration_failures
+        if self.workers > 1:
+            stats["workers"] = self.workers
+            stats["worker_nodes"] = dict(self.worker_nodes)
+        if self.transposition_table is not None:
+            stats.update(self.transposition_table.get_stats())
+        return stats
 '''
 class TicTacToe:
     def __init__(self):
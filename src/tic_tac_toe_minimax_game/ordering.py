@@ -0,0 +1,56 @@
+class MoveOrdering:
+    """Ordena las jugadas de cada nodo para que la poda alfa-beta corte antes.
+
+    Prioridad, de mayor a menor:
+    - la jugada de la variante principal o de la tabla de transposición
+    - las jugadas killer del mismo ply (las que produjeron un corte beta)
+    - la tabla de historia, que acumula depth² por cada corte y persiste
+      entre jugadas de una misma partida
+    - la prioridad estática del juego (p. ej. centro y esquinas)
+    """
+
+    KILLER_SLOTS = 2
+
+    def __init__(self, use_hash_move=True, use_killers=True, use_history=True, use_static=True):
+        self.use_hash_move = use_hash_move
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.use_static = use_static
+        self.killers = {}
+        self.history = {}
+
+    def order(self, moves, ply, hash_move=None, static_priority=None):
+        if not self.use_hash_move:
+            hash_move = None
+        killers = self.killers.get(ply, ()) if self.use_killers else ()
+        history = self.history if self.use_history else {}
+        if not self.use_static:
+            static_priority = None
+
+        def priority(move):
+            return (
+                move == hash_move,
+                move in killers,
+                history.get(move, 0),
+                static_priority(move) if static_priority is not None else 0
+            )
+
+        # sorted es estable: a igual prioridad se conserva el orden original
+        return sorted(moves, key=priority, reverse=True)
+
+    def record_cutoff(self, move, ply, depth):
+        if self.use_killers:
+            killers = self.killers.setdefault(ply, [])
+            if move not in killers:
+                killers.insert(0, move)
+                del killers[self.KILLER_SLOTS:]
+        if self.use_history:
+            self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def new_search(self):
+        # Las killer dependen del ply y de la posición raíz, la historia se conserva
+        self.killers.clear()
+
+    def reset(self):
+        self.killers.clear()
+        self.history.clear()
@@ -0,0 +1,167 @@
+"""Búsqueda paralela repartiendo las jugadas de la raíz entre procesos.
+
+La primera jugada se busca en el proceso principal con la ventana completa
+(young brothers wait) y el resto se reparte en un ProcessPoolExecutor. El mejor
+valor encontrado se comparte entre procesos para que cada worker pueda podar.
+Cada jugada se busca con una ventana un poco más amplia que ese valor, así las
+jugadas que empatan con la mejor obtienen su valor exacto y la elección es la
+de la búsqueda secuencial: la primera jugada con el mejor valor en el orden de
+la raíz.
+
+En la búsqueda iterativa cada profundidad se reparte igual y los workers
+reciben el mismo plazo que el proceso principal; si alguno se queda sin tiempo,
+la iteración se descarta como en la búsqueda secuencial.
+
+Como en minimax(), la raíz se guarda en la tabla de transposición y los cortes
+que encuentra cada worker se suman a la historia de ordenación del motor. Las
+cotas que guardan los workers salen de ventanas distintas de las de la búsqueda
+secuencial, pero el orden de la raíz solo usa la prioridad estática (y la
+variante principal en la búsqueda iterativa) y la raíz nunca se toma de la
+tabla, así que con un motor reutilizado entre jugadas la elección también es
+la misma que la de la búsqueda secuencial.
+"""
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .minimax import SearchAborted
+from .transposition import EXACT, LOWER_BOUND, UPPER_BOUND
+
+# Margen para que una jugada que empata con la mejor no quede podada
+WINDOW_MARGIN = 1e-9
+
+_engine = None
+_shared_bound = None
+
+
+def _init_worker(engine, shared_bound):
+    global _engine, _shared_bound
+    engine.workers = 1
+    _engine = engine
+    _shared_bound = shared_bound
+
+
+def _publish(shared_bound, score, maximizing_player):
+    with shared_bound.get_lock():
+        if (score > shared_bound.value) if maximizing_player else (score < shared_bound.value):
+            shared_bound.value = score
+
+
+def _search_root_move(state, move, depth, maximizing_player, history, deadline):
+    engine = _engine
+    engine.nodes_evaluated = 0
+    engine._root_depth = depth
+    engine._horizon_reached = False
+    ordering = engine.move_ordering
+    if ordering is not None:
+        # Cada jugada empieza con la historia del motor principal en ese momento
+        ordering.new_search()
+        ordering.history = dict(history)
+    child = engine.make_move(state, move)
+    bound = _shared_bound.value
+    # perf_counter usa un reloj del sistema, así que el plazo vale en cualquier proceso
+    engine._deadline = deadline
+    try:
+        if maximizing_player:
+            score, _ = engine._search(child, depth - 1, False, bound - WINDOW_MARGIN, math.inf)
+        else:
+            score, _ = engine._search(child, depth - 1, True, -math.inf, bound + WINDOW_MARGIN)
+    except SearchAborted:
+        score = None
+    finally:
+        engine._deadline = None
+    if score is not None:
+        _publish(_shared_bound, score, maximizing_player)
+    gained = {}
+    if ordering is not None:
+        gained = {other: value - history.get(other, 0) for other, value in ordering.history.items()
+                  if value != history.get(other, 0)}
+    return score, engine.nodes_evaluated, os.getpid(), gained, engine._horizon_reached
+
+
+class ParallelRootSearch:
+    """Pool de procesos asociado a un MinimaxAlgorithm."""
+
+    def __init__(self, engine, workers):
+        self.engine = engine
+        self.shared_bound = multiprocessing.Value('d', 0.0)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(engine, self.shared_bound)
+        )
+
+    def search(self, state, depth, maximizing_player):
+        """Devuelve (puntuación, jugada) como MinimaxAlgorithm._search desde la raíz.
+
+        Lanza SearchAborted si se agota el plazo de la búsqueda (engine._deadline).
+        """
+        engine = self.engine
+        engine.nodes_evaluated += 1
+        if depth == 0 or engine.is_terminal_state(state):
+            return None, None
+
+        moves = list(engine._order_moves(state, engine.get_possible_moves(state), 0, None))
+
+        # La primera jugada establece la cota inicial en el proceso principal
+        child = engine.make_move(state, moves[0])
+        nodes_before = engine.nodes_evaluated
+        first_score, _ = engine._search(child, depth - 1, not maximizing_player)
+        engine.worker_nodes['main'] = engine.worker_nodes.get('main', 0) + engine.nodes_evaluated - nodes_before
+        self.shared_bound.value = first_score
+
+        ordering = engine.move_ordering
+        history = dict(ordering.history) if ordering is not None else {}
+        futures = [
+            self.executor.submit(_search_root_move, state, move, depth, maximizing_player, history,
+                                 engine._deadline)
+            for move in moves[1:]
+        ]
+        scores = [first_score]
+        for future in futures:
+            score, nodes, pid, gained, horizon_reached = future.result()
+            scores.append(score)
+            engine._horizon_reached |= horizon_reached
+            engine.nodes_evaluated += nodes
+            engine.worker_nodes[pid] = engine.worker_nodes.get(pid, 0) + nodes
+            if ordering is not None:
+                for move, value in gained.items():
+                    ordering.history[move] = ordering.history.get(move, 0) + value
+
+        if None in scores:
+            raise SearchAborted()
+        best = max(scores) if maximizing_player else min(scores)
+        index = scores.index(best)
+        best_move = moves[index]
+        self._record_root(state, depth, maximizing_player, best, best_move, index)
+        return best, best_move
+
+    def _record_root(self, state, depth, maximizing_player, score, move, index):
+        """Guarda la raíz en la tabla y en la ordenación como lo hace minimax() en la búsqueda secuencial."""
+        engine = self.engine
+        if not engine.use_alpha_beta:
+            bound = math.inf
+        else:
+            # Ventana de la raíz tras la poda por distancia
+            bound = engine.MATE_SCORE - 1
+            # La búsqueda secuencial corta en cuanto una jugada alcanza la cota
+            if (score >= bound) if maximizing_player else (score <= -bound):
+                engine._record_cutoff(move, 0, depth, index)
+        table = engine.transposition_table
+        if table is None:
+            return
+        if score <= -bound:
+            flag = UPPER_BOUND
+        elif score >= bound:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        key, transform = engine._tt_key(state, maximizing_player)
+        stored_move = move
+        if transform is not None:
+            stored_move = engine.map_move(move, transform)
+        table.store(key, engine._score_to_table(score, 0), depth, flag, stored_move)
+
+    def shutdown(self):
+        self.executor.shutdown()
@@ -0,0 +1,119 @@
+"""Búsqueda durante el turno del rival (pondering).
+
+Mientras el rival piensa, un hilo busca la respuesta del motor a cada una de
+sus jugadas posibles, empezando por la que la última búsqueda predijo. Cuando
+el rival juega, la respuesta se toma ya calculada si estaba entre las resueltas
+y, si no, se cancela la búsqueda en curso y el motor busca como siempre.
+"""
+import copy
+import threading
+import time
+
+from .minimax import SearchAborted
+
+
+class Ponderer:
+    """Calcula respuestas por adelantado con una copia del motor.
+
+    La copia comparte la tabla de transposición y la ordenación de jugadas con
+    el motor, pero no sus contadores, así que lo que muestre el motor no cambia
+    mientras se pondera. El motor no debe buscar mientras el hilo está activo:
+    take() y stop() lo detienen antes de devolver.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._searcher = None
+        self._thread = None
+        self._params = None
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+        self.searches = 0
+        self.time_saved = 0.0
+
+    def start(self, state, depth, maximizing_player=True, time_budget_ms=None):
+        """Empieza a buscar la respuesta a cada jugada del rival en state."""
+        self.stop()
+        self._results = {}
+        self._params = (depth, maximizing_player, time_budget_ms)
+        if self.engine.is_terminal_state(state):
+            return
+        # La copia se hace en cada turno para seguir la configuración actual del motor
+        searcher = self._searcher = copy.copy(self.engine)
+        searcher.workers = 1
+        moves = self.opponent_moves(state, not maximizing_player)
+        self._thread = threading.Thread(
+            target=self._run, args=(searcher, state.copy(), moves), daemon=True)
+        self._thread.start()
+
+    def opponent_moves(self, state, opponent_maximizing):
+        """Jugadas del rival en orden de prioridad: la predicha por la tabla y luego las estáticas."""
+        engine = self.engine
+        moves = sorted(engine.get_possible_moves(state), key=engine.static_move_priority, reverse=True)
+        table = engine.transposition_table
+        if table is None:
+            return moves
+        key, transform = engine._tt_key(state, opponent_maximizing)
+        entry = table.lookup(key)
+        predicted = entry[3] if entry is not None else None
+        if predicted is not None and transform is not None:
+            predicted = engine.unmap_move(predicted, transform)
+        if predicted in moves:
+            moves.remove(predicted)
+            moves.insert(0, predicted)
+        return moves
+
+    def _run(self, searcher, state, moves):
+        depth, maximizing_player, time_budget_ms = self._params
+        for move in moves:
+            child = searcher.make_move(state, move)
+            if searcher.is_terminal_state(child):
+                continue
+            start = time.perf_counter()
+            try:
+                reply = searcher.get_best_move(child, depth, maximizing_player, time_budget_ms)
+            except SearchAborted:
+                return
+            self._results[searcher.state_key(child)] = {
+                "move": reply,
+                "stats": searcher.get_stats(),
+                "time": time.perf_counter() - start
+            }
+            self.searches += 1
+
+    def stop(self):
+        """Cancela la búsqueda en curso y espera a que el hilo termine."""
+        if self._thread is not None:
+            self._searcher.cancel()
+            self._thread.join()
+            self._searcher.clear_cancel()
+            self._thread = None
+
+    def take(self, state, depth, maximizing_player=True, time_budget_ms=None):
+        """Devuelve la respuesta calculada para state ({'move', 'stats', 'time'}) o None.
+
+        Solo cuenta si se ponderó con los mismos parámetros de búsqueda.
+        """
+        self.stop()
+        result = None
+        if self._params == (depth, maximizing_player, time_budget_ms):
+            result = self._results.get(self.engine.state_key(state))
+        self._results = {}
+        self._params = None
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.time_saved += result["time"]
+        return result
+
+    def get_stats(self):
+        taken = self.hits + self.misses
+        return {
+            "ponder_hits": self.hits,
+            "ponder_misses": self.misses,
+            "ponder_hit_rate": self.hits / taken if taken else 0.0,
+            "ponder_searches": self.searches,
+            "ponder_time_saved_ms": self.time_saved * 1000
+        }
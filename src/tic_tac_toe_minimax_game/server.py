@@ -0,0 +1,277 @@
+"""Servidor asyncio de partidas con un protocolo de líneas JSON sobre TCP.
+
+Cada petición es un objeto JSON en una línea y cada respuesta también:
+
+    {"cmd": "new", "difficulty": "Normal"}            -> {"ok": true, "session": 1, ...}
+    {"cmd": "new", "rows": 4, "cols": 4, "k": 3, "seed": 7}
+    {"cmd": "move", "session": 1, "row": 0, "col": 0} -> jugada del humano y respuesta de la IA
+    {"cmd": "state", "session": 1}
+    {"cmd": "close", "session": 1}
+    {"cmd": "metrics"}                                 -> sesiones, jugadas/s y latencias
+
+El humano juega con X y empieza; la IA juega con O. Las búsquedas se hacen en
+un pool de procesos para que una búsqueda lenta no bloquee al resto de sesiones,
+y cada una tiene un presupuesto de tiempo para no ocupar un proceso sin límite.
+Los tableros tienen como mucho MAX_BOARD_SIDE filas y columnas.
+
+Uso: python -m tic_tac_toe_minimax_game.server --puerto 8765
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import Bitboard, geometry
+from .difficulty import DIFFICULTY_LEVELS
+from .simulate import agent_name, choose_move, new_engine
+
+# Ventana para calcular jugadas por segundo y número de latencias conservadas
+RATE_WINDOW_S = 10.0
+LATENCY_SAMPLES = 10000
+# Lado máximo del tablero y presupuesto de cada búsqueda de la IA
+MAX_BOARD_SIDE = 10
+MOVE_TIME_BUDGET_MS = 1000
+
+_engines = {}
+
+
+def _ai_move(state, agent, seed, time_budget_ms):
+    """Se ejecuta en el pool: un motor por tamaño de tablero y proceso."""
+    g = state.geometry
+    engine = _engines.get((g.rows, g.cols, g.k))
+    if engine is None:
+        engine = _engines[(g.rows, g.cols, g.k)] = new_engine(g.rows, g.cols, g.k)
+    move, nodes = choose_move(engine, state, agent, random.Random(seed), time_budget_ms)
+    return move, nodes
+
+
+class ServerError(Exception):
+    """Petición inválida; el mensaje se devuelve al cliente."""
+
+
+def _int_field(request, name, default=None, low=None, high=None):
+    """Lee un entero de la petición; los booleanos y los números con decimales no valen."""
+    value = request.get(name, default)
+    if type(value) is not int:
+        raise ServerError(f"'{name}' debe ser un entero")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ServerError(f"'{name}' debe estar entre {low} y {high}")
+    return value
+
+
+class Session:
+    def __init__(self, session_id, agent, rows, cols, k, seed):
+        self.id = session_id
+        self.agent = agent
+        self.state = Bitboard.empty(rows, cols, k)
+        self.rng = random.Random(seed)
+        # Las peticiones de una misma sesión se atienden de una en una
+        self.lock = asyncio.Lock()
+
+    def to_dict(self):
+        g = self.state.geometry
+        return {
+            "session": self.id,
+            "difficulty": self.agent,
+            "board": ["".join(self.state.cell(row, col) for col in range(g.cols)) for row in range(g.rows)],
+            "turn": self.state.player,
+            "winner": self.state.winner()
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.moves = 0
+        self._recent = deque()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record_move(self, latency):
+        now = time.perf_counter()
+        self.moves += 1
+        self._recent.append(now)
+        self._latencies.append(latency)
+
+    def moves_per_second(self):
+        now = time.perf_counter()
+        while self._recent and now - self._recent[0] > RATE_WINDOW_S:
+            self._recent.popleft()
+        window = min(RATE_WINDOW_S, now - self.started)
+        return len(self._recent) / window if window > 0 else 0.0
+
+    def percentile(self, fraction):
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class GameServer:
+    """Sesiones de juego en memoria; executor puede ser cualquier concurrent.futures.Executor."""
+
+    def __init__(self, executor=None, workers=None):
+        if executor is None:
+            # Con fork los workers heredarían los sockets abiertos y las conexiones
+            # cerradas no llegarían a cerrarse para el cliente
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.executor = executor
+        self.sessions = {}
+        self.metrics = Metrics()
+        self._ids = itertools.count(1)
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server
+
+    async def serve_forever(self, host="127.0.0.1", port=8765):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        self.executor.shutdown()
+
+    async def _handle_client(self, reader, writer):
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ServerError("La petición debe ser un objeto JSON")
+                    response = await self.handle(request, owned)
+                except (ServerError, ValueError) as e:
+                    response = {"ok": False, "error": str(e)}
+                except Exception as e:
+                    # Un fallo inesperado en una petición no debe cerrar la conexión
+                    traceback.print_exc()
+                    response = {"ok": False, "error": f"Error interno: {type(e).__name__}"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Las sesiones mueren con la conexión que las creó
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    async def handle(self, request, owned=None):
+        command = request.get("cmd")
+        if command == "new":
+            return await self._new_session(request, owned)
+        if command == "move":
+            return await self._move(self._session(request, owned), request)
+        if command == "state":
+            return {"ok": True, **self._session(request, owned).to_dict()}
+        if command == "close":
+            session = self._session(request, owned)
+            del self.sessions[session.id]
+            if owned is not None:
+                owned.discard(session.id)
+            return {"ok": True, "session": session.id}
+        if command == "metrics":
+            return {"ok": True, **self.get_metrics()}
+        raise ServerError(f"Comando desconocido: {command}")
+
+    async def _new_session(self, request, owned):
+        difficulty = request.get("difficulty", "Normal")
+        if not isinstance(difficulty, str):
+            raise ServerError("'difficulty' debe ser un texto")
+        agent = agent_name(difficulty)
+        rows = _int_field(request, "rows", 3, 1, MAX_BOARD_SIDE)
+        cols = _int_field(request, "cols", 3, 1, MAX_BOARD_SIDE)
+        k = _int_field(request, "k", 3, 1, max(rows, cols))
+        seed = request.get("seed")
+        if seed is not None:
+            seed = _int_field(request, "seed")
+        # La geometría de un tablero nuevo se calcula en un hilo para no parar el bucle
+        await asyncio.get_running_loop().run_in_executor(None, geometry, rows, cols, k)
+        session = Session(next(self._ids), agent, rows, cols, k, seed)
+        self.sessions[session.id] = session
+        if owned is not None:
+            owned.add(session.id)
+        return {"ok": True, **session.to_dict()}
+
+    def _session(self, request, owned=None):
+        session_id = request.get("session")
+        # Solo los enteros pueden ser claves de sesión (una lista no es hashable)
+        session = self.sessions.get(session_id) if type(session_id) is int else None
+        # Desde una conexión solo se accede a las sesiones que ella creó
+        if session is None or (owned is not None and session_id not in owned):
+            raise ServerError(f"Sesión desconocida: {request.get('session')}")
+        return session
+
+    async def _move(self, session, request):
+        async with session.lock:
+            state = session.state
+            if type(request.get("row")) is not int or type(request.get("col")) is not int:
+                raise ServerError("Se esperaban los enteros 'row' y 'col'")
+            row, col = request["row"], request["col"]
+            if state.is_over():
+                raise ServerError("La partida ha terminado")
+            if state.player != 'X' or not state.is_free(row, col):
+                raise ServerError("Movimiento inválido")
+            start = time.perf_counter()
+            state = state.play((row, col))
+            response = {"ok": True}
+            if not state.is_over():
+                loop = asyncio.get_running_loop()
+                move, nodes = await loop.run_in_executor(
+                    self.executor, _ai_move, state, session.agent, session.rng.getrandbits(32),
+                    MOVE_TIME_BUDGET_MS)
+                state = state.play(move)
+                response["ai_move"] = list(move)
+                response["nodes"] = nodes
+            session.state = state
+            latency = time.perf_counter() - start
+            self.metrics.record_move(latency)
+            response["time_ms"] = latency * 1000
+            response.update(session.to_dict())
+            return response
+
+    def get_metrics(self):
+        p50 = self.metrics.percentile(0.5)
+        p99 = self.metrics.percentile(0.99)
+        return {
+            "sessions": len(self.sessions),
+            "moves": self.metrics.moves,
+            "moves_per_second": self.metrics.moves_per_second(),
+            "p50_move_ms": p50 * 1000 if p50 is not None else None,
+            "p99_move_ms": p99 * 1000 if p99 is not None else None
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Tres en Raya (JSON lines)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos para las búsquedas (por defecto, uno por CPU)")
+    args = parser.parse_args()
+
+    server = GameServer(workers=args.procesos)
+    print(f"Escuchando en {args.host}:{args.puerto} "
+          f"(dificultades: {', '.join(DIFFICULTY_LEVELS)})")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Tabla de transposición en memoria compartida entre procesos.
+
+Las entradas se guardan en un array de tamaño fijo dentro de un bloque de
+multiprocessing.shared_memory, así que los procesos que se conectan por nombre
+leen y escriben las mismas posiciones sin copiarlas. No hay cerrojos: cada
+entrada lleva un CRC32 de su contenido y una lectura cuyo CRC no coincide (una
+escritura a medias de otro proceso) se trata como un fallo.
+
+Las claves son enteros o pares (entero, bool), como las que genera
+MinimaxAlgorithm, y las jugadas pares (fila, columna) o None.
+"""
+import hashlib
+import struct
+import zlib
+from multiprocessing import shared_memory
+
+MAGIC = b'TTSH'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQQ')
+# fingerprint (128 bits), score, depth, flag + 1 (0 = vacía), fila y columna (-1 = sin jugada)
+PAYLOAD = struct.Struct('<QQdhBbb')
+CHECKSUM = struct.Struct('<I')
+ENTRY_SIZE = PAYLOAD.size + CHECKSUM.size
+
+_EMPTY_PAYLOAD = bytes(PAYLOAD.size)
+_MASK64 = (1 << 64) - 1
+_USED_OFFSET = HEADER.size - 8
+
+
+def _fingerprint(key):
+    if isinstance(key, tuple):
+        key, maximizing = key
+        key = key << 1 | bool(maximizing)
+    if key.bit_length() > 128:
+        # Tableros de 64 casillas o más: se resume la clave en 128 bits
+        data = key.to_bytes((key.bit_length() + 7) // 8, 'little')
+        key = int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), 'little')
+    return key
+
+
+def _slot(fingerprint, capacity):
+    # Mezcla de las dos mitades para repartir bien las claves consecutivas
+    mixed = ((fingerprint & _MASK64) ^ (fingerprint >> 64)) * 0x9E3779B97F4A7C15 & _MASK64
+    return (mixed >> 16) % capacity
+
+
+class SharedTranspositionTable:
+    """Tabla de transposición con la misma interfaz que TranspositionTable.
+
+    El proceso que la crea es el responsable de llamar a unlink() al terminar.
+    Al serializarse (por ejemplo, al enviar el motor a un worker) solo viaja el
+    nombre del bloque y el otro proceso se conecta a él.
+    """
+
+    def __init__(self, capacity=1 << 18, name=None, create=True):
+        if create:
+            if capacity <= 0:
+                raise ValueError("capacity debe ser positivo")
+            size = HEADER.size + capacity * ENTRY_SIZE
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            HEADER.pack_into(self._shm.buf, 0, MAGIC, VERSION, capacity, 0)
+        else:
+            self._shm = _attach(name)
+            magic, version, capacity, _ = HEADER.unpack_from(self._shm.buf, 0)
+            if magic != MAGIC or version != VERSION:
+                self._shm.close()
+                raise ValueError(f"El bloque {name} no es una tabla de transposición compartida")
+        self.capacity = capacity
+        self.owner = create
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.torn_reads = 0
+
+    @classmethod
+    def attach(cls, name):
+        return cls(name=name, create=False)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __reduce__(self):
+        return SharedTranspositionTable.attach, (self.name,)
+
+    def __len__(self):
+        # Contador sin cerrojo: es aproximado si varios procesos escriben a la vez
+        return struct.unpack_from('<Q', self._shm.buf, _USED_OFFSET)[0]
+
+    def _read(self, offset):
+        buf = self._shm.buf
+        payload = bytes(buf[offset:offset + PAYLOAD.size])
+        checksum, = CHECKSUM.unpack_from(buf, offset + PAYLOAD.size)
+        if not checksum and payload == _EMPTY_PAYLOAD:
+            return None
+        if zlib.crc32(payload) != checksum:
+            self.torn_reads += 1
+            return None
+        return PAYLOAD.unpack(payload)
+
+    def lookup(self, key):
+        fingerprint = _fingerprint(key)
+        offset = HEADER.size + _slot(fingerprint, self.capacity) * ENTRY_SIZE
+        fields = self._read(offset)
+        if fields is None or not fields[4] or (fields[1] << 64 | fields[0]) != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        _, _, score, depth, flag, row, col = fields
+        return score, depth, flag - 1, (row, col) if row >= 0 else None
+
+    def store(self, key, score, depth, flag, best_move):
+        fingerprint = _fingerprint(key)
+        offset = HEADER.size + _slot(fingerprint, self.capacity) * ENTRY_SIZE
+        old = self._read(offset)
+        if old is not None and old[4]:
+            if (old[1] << 64 | old[0]) == fingerprint:
+                if depth < old[3]:
+                    return
+            else:
+                self.evictions += 1
+        else:
+            used = len(self) + 1
+            struct.pack_into('<Q', self._shm.buf, _USED_OFFSET, min(used, self.capacity))
+        row, col = best_move if best_move is not None else (-1, -1)
+        payload = PAYLOAD.pack(fingerprint & _MASK64, fingerprint >> 64, score, depth, flag + 1, row, col)
+        buf = self._shm.buf
+        buf[offset:offset + PAYLOAD.size] = payload
+        CHECKSUM.pack_into(buf, offset + PAYLOAD.size, zlib.crc32(payload))
+        self.stores += 1
+
+    def clear(self):
+        buf = self._shm.buf
+        buf[HEADER.size:] = bytes(len(buf) - HEADER.size)
+        struct.pack_into('<Q', buf, _USED_OFFSET, 0)
+
+    def get_stats(self):
+        return {
+            "tt_entries": len(self),
+            "tt_hits": self.hits,
+            "tt_misses": self.misses,
+            "tt_stores": self.stores,
+            "tt_evictions": self.evictions,
+            "tt_torn_reads": self.torn_reads,
+            "tt_shared_name": self.name
+        }
+
+    def close(self):
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def _attach(name):
+    try:
+        # Python 3.13+: el proceso que solo se conecta no debe borrar el bloque al salir
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,211 @@
+"""Simulador de partidas sin interfaz entre agentes configurables.
+
+Cada partida se juega en un proceso del pool y su resultado se escribe como
+una línea JSON en cuanto está disponible. No importa pygame.
+
+Uso: python -m tic_tac_toe_minimax_game.simulate --x Normal --o minimax --partidas 10000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import DEFAULT_TIME_BUDGET_MS, BitboardGame, add_board_arguments
+from .difficulty import DIFFICULTY_LEVELS
+from .ordering import MoveOrdering
+from .transposition import TranspositionTable
+
+RANDOM_AGENT = 'aleatorio'
+MINIMAX_AGENT = 'minimax'
+AGENTS = tuple(DIFFICULTY_LEVELS) + (RANDOM_AGENT, MINIMAX_AGENT)
+
+_engine = None
+_config = None
+
+
+def _normalize(name):
+    name = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in name if not unicodedata.combining(c)).lower()
+
+
+def agent_name(name):
+    """Devuelve el nombre canónico del agente; ignora mayúsculas y tildes."""
+    for agent in AGENTS:
+        if _normalize(agent) == _normalize(name):
+            return agent
+    raise ValueError(f"Agente desconocido: {name}. Disponibles: {', '.join(AGENTS)}")
+
+
+def new_engine(rows=3, cols=3, k=3, transposition_table=None):
+    return BitboardGame(
+        use_alpha_beta=True,
+        rows=rows,
+        cols=cols,
+        k=k,
+        transposition_table=transposition_table if transposition_table is not None else TranspositionTable(),
+        use_symmetry=True,
+        use_perfect_play=True,
+        move_ordering=MoveOrdering()
+    )
+
+
+def choose_move(engine, state, agent, rng, time_budget_ms=None):
+    """Devuelve (jugada, nodos evaluados) para el agente en turno.
+
+    Con time_budget_ms la búsqueda es iterativa y termina al agotar el presupuesto.
+    """
+    if agent == RANDOM_AGENT:
+        return rng.choice(state.moves()), 0
+    if agent == MINIMAX_AGENT:
+        depth = engine.geometry.size
+    else:
+        config = DIFFICULTY_LEVELS[agent]
+        if rng.random() < config['random_chance']:
+            return rng.choice(state.moves()), 0
+        depth = config['depth']
+    # El motor puntúa desde el punto de vista de 'O'
+    move = engine.get_best_move(state, depth=depth, maximizing_player=state.player == engine.ai_player,
+                                time_budget_ms=time_budget_ms)
+    return move, engine.nodes_evaluated
+
+
+def play_game(engine, agents, seed, time_budget_ms=None, clear_table=True):
+    """Juega una partida completa; agents es un dict {'X': agente, 'O': agente}.
+
+    Con clear_table la partida empieza con la tabla de transposición vacía, de modo
+    que su resultado solo depende de la semilla y no de las partidas anteriores.
+    """
+    rng = random.Random(seed)
+    if clear_table and engine.transposition_table is not None:
+        engine.transposition_table.clear()
+    engine.new_game()
+    state = engine.new_board()
+    moves = []
+    while not state.is_over():
+        player = state.player
+        start = time.perf_counter()
+        move, nodes = choose_move(engine, state, agents[player], rng, time_budget_ms)
+        elapsed = time.perf_counter() - start
+        moves.append({
+            "player": player,
+            "move": list(move),
+            "nodes": nodes,
+            "time_ms": round(elapsed * 1000, 3)
+        })
+        state = state.play(move)
+    return {
+        "seed": seed,
+        "x": agents['X'],
+        "o": agents['O'],
+        "winner": state.winner(),
+        "moves": moves
+    }
+
+
+def _init_worker(config):
+    global _engine, _config
+    _config = dict(config)
+    table = None
+    if config.get('shared_table'):
+        from .shared_transposition import SharedTranspositionTable
+        table = SharedTranspositionTable.attach(config['shared_table'])
+    _engine = new_engine(config['rows'], config['cols'], config['k'], table)
+    _config['time_budget_ms'] = _engine.default_time_budget(config.get('time_budget_ms'))
+
+
+def _play(game_index):
+    # La tabla compartida se conserva entre partidas: es lo que comparten los procesos
+    record = play_game(_engine, _config['agents'], _config['seed'] + game_index,
+                       _config['time_budget_ms'], clear_table=not _config.get('shared_table'))
+    record["game"] = game_index
+    return record
+
+
+def simulate(games, agents, seed=0, workers=None, rows=3, cols=3, k=3, shared_table=None,
+             time_budget_ms=None):
+    """Genera los resultados de las partidas en orden, repartidas entre procesos.
+
+    shared_table es el nombre de una SharedTranspositionTable a la que se conecta
+    cada worker; sin ella cada proceso usa su propia tabla y la vacía en cada partida.
+    time_budget_ms limita cada búsqueda como en las otras interfaces (por defecto
+    DEFAULT_TIME_BUDGET_MS en tableros mayores que 3x3).
+    """
+    config = {'agents': agents, 'seed': seed, 'rows': rows, 'cols': cols, 'k': k,
+              'shared_table': shared_table, 'time_budget_ms': time_budget_ms}
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(config)
+        for index in range(games):
+            yield _play(index)
+        return
+    # Lotes grandes para que el coste de comunicación no domine en partidas cortas
+    chunksize = max(1, min(256, games // (workers * 8)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(config,)) as executor:
+        yield from executor.map(_play, range(games), chunksize=chunksize)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de partidas sin interfaz (JSON lines)")
+    add_board_arguments(parser)
+    parser.add_argument("--x", default=MINIMAX_AGENT, help=f"Agente de X: {', '.join(AGENTS)}")
+    parser.add_argument("--o", default=MINIMAX_AGENT, help=f"Agente de O: {', '.join(AGENTS)}")
+    parser.add_argument("--partidas", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--tiempo-ms", type=int, default=None,
+                        help="Tiempo máximo por jugada de cada agente en milisegundos (búsqueda iterativa; "
+                             f"por defecto {DEFAULT_TIME_BUDGET_MS} en tableros mayores que 3x3)")
+    parser.add_argument("--tabla-compartida", type=int, default=None, metavar="ENTRADAS",
+                        help="Compartir entre procesos una tabla de transposición de ese tamaño")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo JSON lines de resultados (por defecto, la salida estándar)")
+    args = parser.parse_args()
+
+    try:
+        agents = {'X': agent_name(args.x), 'O': agent_name(args.o)}
+    except ValueError as e:
+        parser.error(str(e))
+
+    table = None
+    if args.tabla_compartida:
+        from .shared_transposition import SharedTranspositionTable
+        table = SharedTranspositionTable(args.tabla_compartida)
+    output = open(args.salida, 'w') if args.salida else sys.stdout
+    outcomes = {'X': 0, 'O': 0, 'T': 0}
+    start = time.perf_counter()
+    try:
+        for record in simulate(args.partidas, agents, args.semilla, args.procesos,
+                               args.filas, args.columnas, args.en_raya,
+                               table.name if table is not None else None, args.tiempo_ms):
+            outcomes[record["winner"]] += 1
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if table is not None:
+            table.close()
+            table.unlink()
+    elapsed = time.perf_counter() - start
+
+    # El resumen va a stderr para no mezclarse con las líneas JSON
+    summary = {
+        "games": args.partidas,
+        "x": agents['X'],
+        "o": agents['O'],
+        "x_wins": outcomes['X'],
+        "o_wins": outcomes['O'],
+        "ties": outcomes['T'],
+        "elapsed_s": round(elapsed, 3),
+        "games_per_second": round(args.partidas / elapsed, 1) if elapsed > 0 else None
+    }
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+class BoardSymmetry:
+    """Simetrías de un tablero rows x cols aplicadas sobre máscaras de bits.
+
+    Un tablero cuadrado tiene las 8 simetrías del grupo diedral D4 (rotaciones
+    y reflexiones); uno rectangular solo conserva las 4 que no cambian su forma.
+    La casilla (fila, col) corresponde al bit fila * cols + col.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+
+        r, c = rows - 1, cols - 1
+        candidates = [
+            lambda i, j: (i, j),
+            lambda i, j: (i, c - j),
+            lambda i, j: (r - i, j),
+            lambda i, j: (r - i, c - j),
+        ]
+        if rows == cols:
+            candidates += [
+                lambda i, j: (j, i),
+                lambda i, j: (j, r - i),
+                lambda i, j: (c - j, i),
+                lambda i, j: (c - j, r - i),
+            ]
+
+        # perm[celda] = celda destino al aplicar la simetría
+        self.perms = [
+            tuple(f(i, j)[0] * cols + f(i, j)[1] for i in range(rows) for j in range(cols))
+            for f in candidates
+        ]
+        identity = tuple(range(self.size))
+        self.inverse = [
+            next(u for u, other in enumerate(self.perms)
+                 if tuple(other[perm[i]] for i in range(self.size)) == identity)
+            for perm in self.perms
+        ]
+
+        # Tablas de consulta por bloques de bits para transformar máscaras completas
+        self._chunk = self.size if self.size <= 12 else 8
+        self._tables = [self._build_tables(perm) for perm in self.perms]
+
+    def __len__(self):
+        return len(self.perms)
+
+    def _build_tables(self, perm):
+        tables = []
+        for start in range(0, self.size, self._chunk):
+            width = min(self._chunk, self.size - start)
+            table = []
+            for value in range(1 << width):
+                mask = 0
+                for bit in range(width):
+                    if value >> bit & 1:
+                        mask |= 1 << perm[start + bit]
+                table.append(mask)
+            tables.append(table)
+        return tables
+
+    def transform(self, mask, t):
+        tables = self._tables[t]
+        if len(tables) == 1:
+            return tables[0][mask]
+        result = 0
+        shift = 0
+        chunk_mask = (1 << self._chunk) - 1
+        for table in tables:
+            result |= table[(mask >> shift) & chunk_mask]
+            shift += self._chunk
+        return result
+
+    def canonical(self, x, o):
+        """Devuelve (clave, t): la menor clave entre las imágenes y la simetría que la produce."""
+        best_key = None
+        best_t = 0
+        for t in range(len(self.perms)):
+            key = self.transform(x, t) | self.transform(o, t) << self.size
+            if best_key is None or key < best_key:
+                best_key = key
+                best_t = t
+        return best_key, best_t
+
+    def stabilizer(self, x, o):
+        """Simetrías que dejan la posición sin cambios."""
+        return [
+            t for t in range(len(self.perms))
+            if self.transform(x, t) == x and self.transform(o, t) == o
+        ]
+
+    def map_cell(self, cell, t):
+        return self.perms[t][cell]
+
+    def unmap_cell(self, cell, t):
+        return self.perms[self.inverse[t]][cell]
+
+    def unique_cells(self, x, o, cells):
+        """Filtra las casillas dejando un representante (el menor) por órbita."""
+        stabilizer = self.stabilizer(x, o)
+        if len(stabilizer) == 1:
+            return cells
+        perms = self.perms
+        return [
+            cell for cell in cells
+            if all(perms[t][cell] >= cell for t in stabilizer)
+        ]
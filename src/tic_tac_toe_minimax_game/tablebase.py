@@ -0,0 +1,136 @@
+"""Tabla de juego perfecto precalculada para el tablero 3x3.
+
+Cada posición se indexa en base 3 (0 = vacía, 1 = X, 2 = O por casilla), así
+que la consulta es un acceso directo a una entrada de 16 bits:
+
+- bits 0-8: máscara de las mejores jugadas para el jugador en turno
+- bits 9-15: puntuación + 64, o 0 si la posición no es alcanzable
+
+La puntuación es relativa al jugador en turno: 10 - n si gana en n jugadas,
+-(10 - n) si pierde y 0 si la partida termina en empate.
+
+Para regenerar el archivo: python -m tic_tac_toe_minimax_game.tablebase
+"""
+import mmap
+import os
+import struct
+import sys
+
+from .bitboard import Bitboard
+
+MAGIC = b'TTT3'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+ENTRY = struct.Struct('<H')
+POSITIONS = 3 ** 9
+SCORE_OFFSET = 64
+FULL_MASK = (1 << 9) - 1
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'perfect_play.bin')
+
+# Valor en base 3 de cada máscara de 9 bits
+_TERNARY = [
+    sum(3 ** bit for bit in range(9) if mask >> bit & 1)
+    for mask in range(FULL_MASK + 1)
+]
+
+
+def position_index(x, o):
+    return _TERNARY[x] + 2 * _TERNARY[o]
+
+
+def _solve(state, entries):
+    index = position_index(state.x, state.o)
+    if entries[index]:
+        return (entries[index] >> 9) - SCORE_OFFSET
+
+    winner = state.winner()
+    if winner is not None:
+        score = 0 if winner == 'T' else -10
+        entries[index] = (score + SCORE_OFFSET) << 9
+        return score
+
+    best_score = None
+    best_moves = 0
+    for move in state.moves():
+        child = _solve(state.play(move), entries)
+        score = -child + (child > 0) - (child < 0)
+        bit = 1 << (move[0] * 3 + move[1])
+        if best_score is None or score > best_score:
+            best_score = score
+            best_moves = bit
+        elif score == best_score:
+            best_moves |= bit
+
+    entries[index] = (best_score + SCORE_OFFSET) << 9 | best_moves
+    return best_score
+
+
+def generate():
+    """Resuelve todas las posiciones alcanzables y devuelve el contenido del archivo."""
+    entries = [0] * POSITIONS
+    _solve(Bitboard.empty(), entries)
+    body = b''.join(ENTRY.pack(entry) for entry in entries)
+    return HEADER.pack(MAGIC, VERSION, 0) + body
+
+
+def write(path=DEFAULT_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(generate())
+
+
+class PerfectPlayTable:
+    """Lector perezoso de la tabla: el archivo se mapea en memoria en la primera consulta."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._buffer = None
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _ = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            buffer.close()
+            raise ValueError(f"Tabla de juego perfecto inválida: {self.path}")
+        self._buffer = buffer
+
+    def lookup(self, x, o):
+        """Devuelve (puntuación, [jugadas]) para la posición o None si no está en la tabla."""
+        if x & o or (x | o) & ~FULL_MASK:
+            return None
+        if self._buffer is None:
+            self._load()
+        entry, = ENTRY.unpack_from(self._buffer, HEADER.size + ENTRY.size * position_index(x, o))
+        if not entry:
+            return None
+        moves = [divmod(cell, 3) for cell in range(9) if entry >> cell & 1]
+        return (entry >> 9) - SCORE_OFFSET, moves
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+
+_default_table = None
+
+
+def get_table():
+    global _default_table
+    if _default_table is None:
+        _default_table = PerfectPlayTable()
+    return _default_table
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    write(path)
+    print(f"Tabla de juego perfecto escrita en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    """Tabla de transposición acotada para MinimaxAlgorithm.
+
+    Cada entrada guarda (score, depth, flag, best_move). Una misma posición
+    solo se sobrescribe con una búsqueda igual o más profunda; cuando la
+    tabla está llena se descarta la entrada más antigua.
+    """
+
+    def __init__(self, max_entries=200000):
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser positivo")
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key, score, depth, flag, best_move):
+        entries = self.entries
+        old = entries.get(key)
+        if old is not None:
+            if depth < old[1]:
+                return
+        elif len(entries) >= self.max_entries:
+            del entries[next(iter(entries))]
+            self.evictions += 1
+        entries[key] = (score, depth, flag, best_move)
+        self.stores += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_stats(self):
+        return {
+            "tt_entries": len(self.entries),
+            "tt_hits": self.hits,
+            "tt_misses": self.misses,
+            "tt_stores": self.stores,
+            "tt_evictions": self.evictions
+        }
@@ -1,91 +1,84 @@
-import copy
+import argparse
+import time
+from .bitboard import DEFAULT_TIME_BUDGET_MS, BitboardGame, add_board_arguments
 from .minimax import MinimaxAlgorithm
+from .ordering import MoveOrdering
+from .ponder import Ponderer
+from .transposition import TranspositionTable
 
-class TresEnRaya(MinimaxAlgorithm):
-    def __init__(self, use_alpha_beta=True):
-        super().__init__(use_alpha_beta)
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
-        self.human_player = 'X'
-        self.ai_player = 'O'
+class TresEnRaya(BitboardGame):
+    def __init__(self, use_alpha_beta=True, time_budget_ms=None, ponder=False, game_log=None,
+                 **engine_options):
+        super().__init__(use_alpha_beta, **engine_options)
+        self.time_budget_ms = self.default_time_budget(time_budget_ms)
+        self.board = self.new_board()
         self.current_player = self.human_player
+        # Con ponder la IA busca sus respuestas mientras el jugador escribe su jugada
+        self.ponderer = Ponderer(self) if ponder else None
+        self.ai_stats = {}
+        self.ai_move_pondered = False
+        # Registro de partidas (GameLogWriter), si se pidió
+        self.game_log = game_log
+    
+    def __getstate__(self):
+        # El ponderador (con su hilo) y el registro de partidas no se envían a los
+        # workers ni pasan a las copias
+        state = super().__getstate__()
+        state['ponderer'] = None
+        state['game_log'] = None
+        return state
     
     def print_board(self):
-        print("\n   0   1   2")
-        for i in range(3):
-            print(f"{i}  {self.board[i][0]} | {self.board[i][1]} | {self.board[i][2]}")
-            if i < 2:
-                print("  -----------")
+        rows, cols = self.geometry.rows, self.geometry.cols
+        print("\n   " + "   ".join(str(col) for col in range(cols)))
+        for i in range(rows):
+            cells = " | ".join(self.board.cell(i, j) for j in range(cols))
+            print(f"{i:<2} {cells}")
+            if i < rows - 1:
+                print("  " + "-" * (4 * cols - 1))
     
     def is_valid_move(self, row, col):
-        return (0 <= row < 3 and 0 <= col < 3 and 
-                self.board[row][col] == ' ')
+        return self.board.is_free(row, col)
     
     def make_move_on_board(self, row, col, player):
-        if self.is_valid_move(row, col):
-            self.board[row][col] = player
+        if self.is_valid_move(row, col) and self.board.player == player:
+            self.board = self.board.play((row, col))
             return True
         return False
     
     def check_winner(self, board):
-        for row in board:
-            if row[0] == row[1] == row[2] != ' ':
-                return row[0]
-        
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col] != ' ':
-                return board[0][col]
-        
-        if board[0][0] == board[1][1] == board[2][2] != ' ':
-            return board[0][0]
-        if board[0][2] == board[1][1] == board[2][0] != ' ':
-            return board[0][2]
-        
-        if all(cell != ' ' for row in board for cell in row):
-            return 'T'
-        
-        return None
-    
-    def is_terminal_state(self, state):
-        return self.check_winner(state) is not None
+        return board.winner()
     
-    def evaluate_state(self, state):
-        winner = self.check_winner(state)
-        if winner == self.ai_player:
-            return 1.0
-        elif winner == self.human_player:
-            return -1.0
-        elif winner == 'T':
-            return 0.0
-        else:
-            return 0.0
-    
-    def get_possible_moves(self, state):
-        moves = []
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == ' ':
-                    moves.append((i, j))
-        return moves
-    
-    def make_move(self, state, move):
-        new_state = copy.deepcopy(state)
-        row, col = move
-        
-        moves_count = sum(1 for i in range(3) for j in range(3) if state[i][j] != ' ')
-        current_player = self.human_player if moves_count % 2 == 0 else self.ai_player
-        
-        new_state[row][col] = current_player
-        return new_state
+    def ai_search_params(self):
+        if self.time_budget_ms is not None:
+            # Búsqueda iterativa: tan profunda como permita el tiempo
+            return self.geometry.size, self.time_budget_ms
+        return 9, None
     
     def get_ai_move(self):
-        best_move = self.get_best_move(self.board, depth=9, maximizing_player=True)
+        depth, time_budget_ms = self.ai_search_params()
+        self.ai_move_pondered = False
+        if self.ponderer is not None:
+            result = self.ponderer.take(self.board, depth, True, time_budget_ms)
+            if result is not None:
+                self.ai_move_pondered = True
+                self.ai_stats = result["stats"]
+                return result["move"]
+        best_move = self.get_best_move(self.board, depth=depth, maximizing_player=True,
+                                       time_budget_ms=time_budget_ms)
+        self.ai_stats = self.get_stats()
         return best_move
     
+    def close(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        super().close()
+    
     def get_human_move(self):
         while True:
             try:
-                row = int(input("Ingresa la fila (0-2): "))
-                col = int(input("Ingresa la columna (0-2): "))
+                row = int(input(f"Ingresa la fila (0-{self.geometry.rows - 1}): "))
+                col = int(input(f"Ingresa la columna (0-{self.geometry.cols - 1}): "))
                 
                 if self.is_valid_move(row, col):
                     return (row, col)
@@ -95,13 +88,17 @@ class TresEnRaya(MinimaxAlgorithm):
                 print("Por favor, ingresa números válidos.")
     
     def reset_game(self):
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.board = self.new_board()
+        self.new_game()
         self.current_player = self.human_player
     
     def play_game(self):
+        g = self.geometry
         print("¡Bienvenido al juego de Tres en Raya!")
         print("Tú eres 'X' y la IA es 'O'")
-        print("Las coordenadas van de 0 a 2")
+        print(f"Tablero de {g.rows}x{g.cols}, gana quien alinee {g.k}")
+        print(f"Las filas van de 0 a {g.rows - 1} y las columnas de 0 a {g.cols - 1}")
+        record = {'moves': [], 'nodes': [], 'times': [], 'depth': 0}
         
         while True:
             self.print_board()
@@ -114,24 +111,47 @@ class TresEnRaya(MinimaxAlgorithm):
                     print("\n¡Felicitaciones! ¡Has ganado!")
                 else:
                     print("\n¡La IA ha ganado!")
+                if self.game_log is not None:
+                    self.game_log.append(dict(record, rows=g.rows, cols=g.cols, k=g.k,
+                                              time_budget_ms=self.time_budget_ms, winner=winner))
                 break
             
             if self.current_player == self.human_player:
                 print(f"\nTurno del jugador ({self.human_player})")
+                if self.ponderer is not None:
+                    depth, time_budget_ms = self.ai_search_params()
+                    self.ponderer.start(self.board, depth, True, time_budget_ms)
+                start = time.perf_counter()
                 row, col = self.get_human_move()
                 self.make_move_on_board(row, col, self.human_player)
+                record['moves'].append((row, col))
+                record['nodes'].append(0)
+                record['times'].append(time.perf_counter() - start)
                 self.current_player = self.ai_player
                 
             else:
                 print(f"\nTurno de la IA ({self.ai_player})")
                 print("La IA está pensando...")
+                start = time.perf_counter()
                 row, col = self.get_ai_move()
                 self.make_move_on_board(row, col, self.ai_player)
+                record['moves'].append((row, col))
+                record['nodes'].append(self.ai_stats['nodes_evaluated'])
+                record['times'].append(time.perf_counter() - start)
+                # Con límite de tiempo la profundidad efectiva es la que alcanzó la búsqueda
+                record['depth'] = max(record['depth'], self.ai_stats['depth_reached'])
                 print(f"La IA jugó en ({row}, {col})")
                 
                 # Mostrar estadísticas
-                stats = self.get_stats()
+                stats = self.ai_stats
                 print(f"Nodos evaluados: {stats['nodes_evaluated']}")
+                if self.time_budget_ms is not None:
+                    print(f"Profundidad alcanzada: {stats['depth_reached']}")
+                if self.ponderer is not None:
+                    ponder_stats = self.ponderer.get_stats()
+                    source = "calculada durante tu turno" if self.ai_move_pondered else "calculada ahora"
+                    print(f"Respuesta {source} (aciertos: {ponder_stats['ponder_hit_rate']:.0%}, "
+                          f"tiempo ahorrado: {ponder_stats['ponder_time_saved_ms']:.0f} ms)")
                 
                 self.current_player = self.human_player
         
@@ -142,8 +162,55 @@ class TresEnRaya(MinimaxAlgorithm):
 
 
 def main():
-    game = TresEnRaya(use_alpha_beta=True)
-    game.play_game()
+    parser = argparse.ArgumentParser(description="Tres en Raya en consola con IA Minimax")
+    add_board_arguments(parser)
+    parser.add_argument("--tiempo-ms", type=int, default=None,
+                        help="Tiempo máximo por jugada de la IA en milisegundos (búsqueda iterativa; "
+                             f"por defecto {DEFAULT_TIME_BUDGET_MS} en tableros mayores que 3x3)")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="Procesos entre los que se reparten las jugadas de la raíz")
+    parser.add_argument("--ponderar", action="store_true",
+                        help="Buscar las respuestas de la IA mientras el jugador piensa")
+    parser.add_argument("--registro", default=None,
+                        help="Añadir cada partida terminada a este registro binario")
+    parser.add_argument("--variante", choices=MinimaxAlgorithm.VARIANTS, default="minimax",
+                        help="Algoritmo de búsqueda (negamax usa PVS y ventanas de aspiración)")
+    args = parser.parse_args()
+    
+    # Con varios procesos la tabla está en memoria compartida para que todos la aprovechen
+    if args.procesos > 1:
+        from .shared_transposition import SharedTranspositionTable
+        table = SharedTranspositionTable()
+    else:
+        table = TranspositionTable()
+    game_log = None
+    if args.registro:
+        from .gamelog import GameLogWriter
+        game_log = GameLogWriter(args.registro)
+    game = TresEnRaya(
+        use_alpha_beta=True,
+        time_budget_ms=args.tiempo_ms,
+        rows=args.filas,
+        cols=args.columnas,
+        k=args.en_raya,
+        transposition_table=table,
+        use_symmetry=True,
+        use_perfect_play=True,
+        move_ordering=MoveOrdering(),
+        workers=args.procesos,
+        variant=args.variante,
+        ponder=args.ponderar,
+        game_log=game_log
+    )
+    try:
+        game.play_game()
+    finally:
+        game.close()
+        if game_log is not None:
+            game_log.close()
+        if args.procesos > 1:
+            table.close()
+            table.unlink()
 
 
 if __name__ == "__main__":
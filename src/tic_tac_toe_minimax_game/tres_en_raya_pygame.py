@@ -1,9 +1,19 @@
 import pygame
+import argparse
+import queue
+from collections import OrderedDict
 import sys
-import copy
 import random
+import threading
 import time
-from .minimax import MinimaxAlgorithm
+import traceback
+from .bitboard import DEFAULT_TIME_BUDGET_MS, BitboardGame, add_board_arguments
+from .difficulty import DIFFICULTY_LEVELS
+from .metrics import DEFAULT_CAPACITY, MoveMetrics
+from .minimax import SearchAborted
+from .ordering import MoveOrdering
+from .ponder import Ponderer
+from .transposition import TranspositionTable
 
 # Configuración de colores
 BLANCO = (255, 255, 255)
@@ -17,109 +27,189 @@ AMARILLO = (255, 255, 0)
 NARANJA = (255, 165, 0)
 VIOLETA = (128, 0, 128)
 
-class TresEnRayaPygame(MinimaxAlgorithm):
-    def __init__(self, use_alpha_beta=True):
-        super().__init__(use_alpha_beta)
+# Evento que publica el hilo de los gráficos cuando tiene una imagen nueva
+EVENTO_ANALISIS = pygame.event.custom_type()
+
+class TresEnRayaPygame(BitboardGame):
+    def __init__(self, use_alpha_beta=True, time_budget_ms=None, ponder=False,
+                 metrics_capacity=DEFAULT_CAPACITY, metrics_path=None, game_log=None, **engine_options):
+        super().__init__(use_alpha_beta, **engine_options)
+        self.time_budget_ms = self.default_time_budget(time_budget_ms)
         
         # Configuración del juego
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
-        self.human_player = 'X'
-        self.ai_player = 'O'
+        self.board = self.new_board()
         self.current_player = self.human_player
         self.game_over = False
         self.winner = None
         
-        # Configuración de pygame
-        pygame.init()
+        # Configuración de pygame; la ventana se abre en iniciar_pantalla()
         self.VENTANA_TAMAÑO = 600
-        self.CELDA_TAMAÑO = self.VENTANA_TAMAÑO // 3
+        self.CELDA_TAMAÑO = self.VENTANA_TAMAÑO // max(self.geometry.rows, self.geometry.cols)
+        self.TABLERO_ANCHO = self.CELDA_TAMAÑO * self.geometry.cols
+        self.TABLERO_ALTO = self.CELDA_TAMAÑO * self.geometry.rows
         self.LINEA_GROSOR = 3
+        self.pantalla = None
         
-        # Ventana y fuente
-        self.pantalla = pygame.display.set_mode((self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO + 100))
-        pygame.display.set_caption("Tres en Raya - IA con Minimax")
-        self.fuente = pygame.font.Font(None, 36)
-        self.fuente_grande = pygame.font.Font(None, 72)
+        # Caché de superficies: textos ya renderizados (los menos usados salen primero)
+        # y una ficha por jugador
+        self.MAX_TEXTOS_CACHE = 256
+        self._cache_textos = OrderedDict()
+        self.superficies_fichas = None
         
-        # Control de tiempo
-        self.reloj = pygame.time.Clock()
+        # Las cachés del motor se precargan en otro hilo mientras se muestra el menú
+        self._hilo_precarga = None
+        
+        # Último estado dibujado de cada zona; None obliga a redibujarla
+        self._estado_menu = None
+        self._estado_tablero = None
+        self._estado_info = None
         
         # Estados del juego
         self.ai_thinking = False
         self.nodes_evaluated = 0
         
-        # Sistema de análisis matemático
+        # Búsqueda de la IA en segundo plano; la jugada se aplica tras una pausa mínima.
+        # El hilo entrega su resultado por una cola y solo el bucle principal lo aplica
+        self.RETARDO_IA = 0.5
+        self._hilo_ia = None
+        self._resultados_ia = None
+        self._resultado_ia = None
+        self._inicio_ia = 0.0
+        # Mensaje del error si la búsqueda falló; la partida termina sin ganador
+        self.error_ia = None
+        
+        # Ponderación: respuestas calculadas durante el turno del jugador, sin pausa al aplicarlas
+        self.ponderador = Ponderer(self) if ponder else None
+        self._tablero_ponderado = None
+        
+        # Sistema de análisis matemático: solo se conservan las últimas jugadas
         self.game_history = []
-        self.analysis_data = {
-            'moves': [],
-            'nodes_evaluated': [],
-            'depth_used': [],
-            'time_taken': [],
-            'difficulty': []
-        }
+        self.analysis_data = MoveMetrics(metrics_capacity)
+        self.metrics_path = metrics_path
+        
+        # Registro de partidas (GameLogWriter); cada partida usa su propia semilla
+        self.game_log = game_log
+        self.nueva_semilla()
         self.showing_analysis = False
         self.analysis_button_rect = None
         
+        # Gráficos de análisis: se dibujan en otro hilo y se muestran en lugar del tablero
+        self.analizador = None
+        self.superficie_analisis = None
+        self._imagen_analisis = None
+        self._version_analisis = 0
+        self._jugadas_enviadas = 0
+        
         # Sistema de dificultades
+        colores = {'Fácil': VERDE, 'Normal': AMARILLO, 'Difícil': NARANJA, 'Imposible': ROJO}
         self.difficulty_levels = {
-            'Fácil': {'depth': 1, 'random_chance': 0.4, 'color': VERDE},
-            'Normal': {'depth': 3, 'random_chance': 0.2, 'color': AMARILLO},
-            'Difícil': {'depth': 6, 'random_chance': 0.1, 'color': NARANJA},
-            'Imposible': {'depth': 9, 'random_chance': 0.0, 'color': ROJO}
+            nombre: dict(config, color=colores[nombre])
+            for nombre, config in DIFFICULTY_LEVELS.items()
         }
         self.current_difficulty = 'Normal'
         self.showing_difficulty_menu = True
-        
+    
+    def __getstate__(self):
+        # Los hilos de la IA, de la precarga, del ponderador y del análisis y el registro
+        # de partidas se quedan en el proceso que juega
+        state = super().__getstate__()
+        state['ponderador'] = None
+        state['analizador'] = None
+        state['game_log'] = None
+        state['_hilo_ia'] = None
+        state['_resultados_ia'] = None
+        state['_hilo_precarga'] = None
+        return state
+        
+    def iniciar_pantalla(self):
+        """Abre la ventana y carga las fuentes; solo se inicializan los módulos que se usan."""
+        pygame.display.init()
+        pygame.font.init()
+        self.pantalla = pygame.display.set_mode((self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO + 100))
+        pygame.display.set_caption("Tres en Raya - IA con Minimax")
+        self.fuente = pygame.font.Font(None, 36)
+        self.fuente_grande = pygame.font.Font(None, 72)
+        self.fuente_pequeña = pygame.font.Font(None, 24)
+        self.reloj = pygame.time.Clock()
+        self.superficies_fichas = self.crear_superficies_fichas()
+    
+    def iniciar_precarga(self):
+        self._hilo_precarga = threading.Thread(target=self.warm_up, daemon=True)
+        self._hilo_precarga.start()
+    
+    def esperar_precarga(self):
+        # El motor no admite dos búsquedas a la vez: la primera espera a que termine la precarga
+        if self._hilo_precarga is not None:
+            self._hilo_precarga.join()
+            self._hilo_precarga = None
+    
+    def renderizar_texto(self, fuente, texto, antialias, color):
+        """Devuelve la superficie del texto, renderizándola solo la primera vez."""
+        clave = (fuente, texto, antialias, color)
+        superficie = self._cache_textos.get(clave)
+        if superficie is None:
+            # El costo de cada jugada crea textos nuevos: se descarta el menos usado
+            if len(self._cache_textos) >= self.MAX_TEXTOS_CACHE:
+                self._cache_textos.popitem(last=False)
+            superficie = self._cache_textos[clave] = fuente.render(texto, antialias, color)
+        else:
+            self._cache_textos.move_to_end(clave)
+        return superficie
+    
+    def crear_superficies_fichas(self):
+        margen = self.CELDA_TAMAÑO // 10
+        fin = self.CELDA_TAMAÑO - margen
+        
+        x = pygame.Surface((self.CELDA_TAMAÑO, self.CELDA_TAMAÑO), pygame.SRCALPHA)
+        pygame.draw.line(x, AZUL, (margen, margen), (fin, fin), 8)
+        pygame.draw.line(x, AZUL, (margen, fin), (fin, margen), 8)
+        
+        o = pygame.Surface((self.CELDA_TAMAÑO, self.CELDA_TAMAÑO), pygame.SRCALPHA)
+        centro = self.CELDA_TAMAÑO // 2
+        pygame.draw.circle(o, ROJO, (centro, centro), centro - margen, 8)
+        return {'X': x, 'O': o}
+    
     def dibujar_tablero(self):
         """Dibuja el tablero de juego."""
-        self.pantalla.fill(BLANCO)
+        self.pantalla.fill(BLANCO, pygame.Rect(0, 0, self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO))
         
         # Dibujar líneas del tablero
-        for i in range(1, 3):
+        for i in range(1, self.geometry.cols):
             # Líneas verticales
             pygame.draw.line(self.pantalla, NEGRO, 
                            (i * self.CELDA_TAMAÑO, 0), 
-                           (i * self.CELDA_TAMAÑO, self.VENTANA_TAMAÑO), 
+                           (i * self.CELDA_TAMAÑO, self.TABLERO_ALTO), 
                            self.LINEA_GROSOR)
+        for i in range(1, self.geometry.rows):
             # Líneas horizontales
             pygame.draw.line(self.pantalla, NEGRO, 
                            (0, i * self.CELDA_TAMAÑO), 
-                           (self.VENTANA_TAMAÑO, i * self.CELDA_TAMAÑO), 
+                           (self.TABLERO_ANCHO, i * self.CELDA_TAMAÑO), 
                            self.LINEA_GROSOR)
         
         # Dibujar X y O
-        for fila in range(3):
-            for col in range(3):
-                if self.board[fila][col] == 'X':
+        for fila in range(self.geometry.rows):
+            for col in range(self.geometry.cols):
+                celda = self.board.cell(fila, col)
+                if celda == 'X':
                     self.dibujar_x(fila, col)
-                elif self.board[fila][col] == 'O':
+                elif celda == 'O':
                     self.dibujar_o(fila, col)
     
     def dibujar_x(self, fila, col):
         """Dibuja una X en la posición especificada."""
-        margen = 20
-        x = col * self.CELDA_TAMAÑO + margen
-        y = fila * self.CELDA_TAMAÑO + margen
-        x_fin = (col + 1) * self.CELDA_TAMAÑO - margen
-        y_fin = (fila + 1) * self.CELDA_TAMAÑO - margen
-        
-        pygame.draw.line(self.pantalla, AZUL, (x, y), (x_fin, y_fin), 8)
-        pygame.draw.line(self.pantalla, AZUL, (x, y_fin), (x_fin, y), 8)
+        self.pantalla.blit(self.superficies_fichas['X'], (col * self.CELDA_TAMAÑO, fila * self.CELDA_TAMAÑO))
     
     def dibujar_o(self, fila, col):
         """Dibuja una O en la posición especificada."""
-        centro_x = col * self.CELDA_TAMAÑO + self.CELDA_TAMAÑO // 2
-        centro_y = fila * self.CELDA_TAMAÑO + self.CELDA_TAMAÑO // 2
-        radio = self.CELDA_TAMAÑO // 2 - 20
-        
-        pygame.draw.circle(self.pantalla, ROJO, (centro_x, centro_y), radio, 8)
+        self.pantalla.blit(self.superficies_fichas['O'], (col * self.CELDA_TAMAÑO, fila * self.CELDA_TAMAÑO))
     
     def dibujar_menu_dificultad(self):
         """Dibuja el menú de selección de dificultad."""
         self.pantalla.fill(BLANCO)
         
         # Título
-        titulo = self.fuente_grande.render("Selecciona la Dificultad", True, NEGRO)
+        titulo = self.renderizar_texto(self.fuente_grande, "Selecciona la Dificultad", True, NEGRO)
         titulo_rect = titulo.get_rect(center=(self.VENTANA_TAMAÑO//2, 100))
         self.pantalla.blit(titulo, titulo_rect)
         
@@ -149,7 +239,7 @@ class TresEnRayaPygame(MinimaxAlgorithm):
             
             # Texto del botón
             text_color = BLANCO if difficulty == self.current_difficulty else NEGRO
-            text = self.fuente.render(difficulty, True, text_color)
+            text = self.renderizar_texto(self.fuente, difficulty, True, text_color)
             text_rect = text.get_rect(center=button_rect.center)
             self.pantalla.blit(text, text_rect)
             
@@ -161,12 +251,12 @@ class TresEnRayaPygame(MinimaxAlgorithm):
                 'Imposible': 'La IA nunca pierde'
             }
             
-            desc_text = self.fuente.render(descriptions[difficulty], True, GRIS)
+            desc_text = self.renderizar_texto(self.fuente, descriptions[difficulty], True, GRIS)
             desc_rect = desc_text.get_rect(center=(self.VENTANA_TAMAÑO//2, y + button_height + 10))
             self.pantalla.blit(desc_text, desc_rect)
         
         # Instrucciones
-        instrucciones = self.fuente.render("Haz clic en una dificultad para jugar", True, NEGRO)
+        instrucciones = self.renderizar_texto(self.fuente, "Haz clic en una dificultad para jugar", True, NEGRO)
         instrucciones_rect = instrucciones.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 50))
         self.pantalla.blit(instrucciones, instrucciones_rect)
     
@@ -200,7 +290,10 @@ class TresEnRayaPygame(MinimaxAlgorithm):
         
         # Texto del estado del juego
         if self.game_over:
-            if self.winner == 'T':
+            if self.error_ia is not None:
+                texto = "Error de la IA"
+                color = ROJO
+            elif self.winner == 'T':
                 texto = "¡Empate!"
                 color = GRIS
             elif self.winner == self.human_player:
@@ -210,57 +303,108 @@ class TresEnRayaPygame(MinimaxAlgorithm):
                 texto = "¡La IA ha ganado!"
                 color = ROJO
             
-            texto_superficie = self.fuente_grande.render(texto, True, color)
+            texto_superficie = self.renderizar_texto(self.fuente_grande, texto, True, color)
             texto_rect = texto_superficie.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 30))
             self.pantalla.blit(texto_superficie, texto_rect)
             
             # Botón para reiniciar
-            reiniciar_texto = self.fuente.render("Presiona R para reiniciar o M para el menú", True, NEGRO)
+            reiniciar_texto = self.renderizar_texto(self.fuente, "Presiona R para reiniciar o M para el menú",
+                                                    True, NEGRO)
             reiniciar_rect = reiniciar_texto.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 70))
             self.pantalla.blit(reiniciar_texto, reiniciar_rect)
             
         elif self.ai_thinking:
-            pensando_texto = self.fuente.render("La IA está pensando...", True, NEGRO)
+            pensando_texto = self.renderizar_texto(self.fuente, "La IA está pensando...", True, NEGRO)
             pensando_rect = pensando_texto.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 30))
             self.pantalla.blit(pensando_texto, pensando_rect)
             
             # Mostrar estadísticas
             if self.nodes_evaluated > 0:
+                # El contador cambia en cada fotograma: no pasa por la caché
                 stats_texto = self.fuente.render(f"Nodos evaluados: {self.nodes_evaluated}", True, NEGRO)
                 stats_rect = stats_texto.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 60))
                 self.pantalla.blit(stats_texto, stats_rect)
         
         else:
             if self.current_player == self.human_player:
-                turno_texto = self.fuente.render("Tu turno - Haz clic en una celda", True, NEGRO)
+                turno_texto = self.renderizar_texto(self.fuente, "Tu turno - Haz clic en una celda", True, NEGRO)
             else:
-                turno_texto = self.fuente.render("Turno de la IA", True, NEGRO)
+                turno_texto = self.renderizar_texto(self.fuente, "Turno de la IA", True, NEGRO)
             
             turno_rect = turno_texto.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 30))
             self.pantalla.blit(turno_texto, turno_rect)
             
             # Mostrar quién es quién y dificultad
-            info_texto = self.fuente.render("Tú: X (Azul) - IA: O (Rojo)", True, NEGRO)
+            info_texto = self.renderizar_texto(self.fuente, "Tú: X (Azul) - IA: O (Rojo)", True, NEGRO)
             info_rect = info_texto.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 50))
             self.pantalla.blit(info_texto, info_rect)
             
             # Mostrar dificultad actual
             difficulty_color = self.difficulty_levels[self.current_difficulty]['color']
-            dificultad_texto = self.fuente.render(f"Dificultad: {self.current_difficulty}", True, difficulty_color)
+            dificultad_texto = self.renderizar_texto(self.fuente, f"Dificultad: {self.current_difficulty}",
+                                                     True, difficulty_color)
             dificultad_rect = dificultad_texto.get_rect(center=(self.VENTANA_TAMAÑO//2, self.VENTANA_TAMAÑO + 80))
             self.pantalla.blit(dificultad_texto, dificultad_rect)
         
         # Mostrar costo de la última jugada si existe
-        if len(self.analysis_data['moves']) > 0:
-            last_nodes = self.analysis_data['nodes_evaluated'][-1]
-            last_time = self.analysis_data['time_taken'][-1] * 1000  # convertir a ms
+        ultima = self.analysis_data.last()
+        if ultima is not None:
+            last_nodes = ultima[2]
+            last_time = ultima[4] * 1000  # convertir a ms
             self.mostrar_costo_jugada(last_nodes, last_time)
+        
+        self.dibujar_boton_analisis()
+    
+    def dibujar_boton_analisis(self):
+        texto = "Volver al juego" if self.showing_analysis else "Ver Análisis"
+        self.analysis_button_rect = pygame.Rect(self.VENTANA_TAMAÑO - 135, self.VENTANA_TAMAÑO + 5, 130, 26)
+        pygame.draw.rect(self.pantalla, BLANCO, self.analysis_button_rect)
+        pygame.draw.rect(self.pantalla, NEGRO, self.analysis_button_rect, 2)
+        boton_texto = self.renderizar_texto(self.fuente_pequeña, texto, True, NEGRO)
+        self.pantalla.blit(boton_texto, boton_texto.get_rect(center=self.analysis_button_rect.center))
+    
+    def alternar_analisis(self):
+        """Muestra u oculta los gráficos de análisis en lugar del tablero."""
+        self.showing_analysis = not self.showing_analysis
+        if self.showing_analysis:
+            self.actualizar_analisis()
+    
+    def actualizar_analisis(self):
+        """Envía al hilo de los gráficos las jugadas registradas desde el último envío."""
+        if self.analizador is None:
+            # matplotlib solo se importa la primera vez que se abre el análisis
+            from .analysis import AnalysisRenderer
+            self.analizador = AnalysisRenderer(
+                self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO,
+                on_ready=lambda: pygame.event.post(pygame.event.Event(EVENTO_ANALISIS)),
+                max_points=self.analysis_data.capacity
+            )
+        total = self.analysis_data.total
+        if total > self._jugadas_enviadas:
+            self.analizador.append(self.analysis_data.series(self._jugadas_enviadas))
+            self._jugadas_enviadas = total
+    
+    def recibir_analisis(self):
+        version, imagen = self.analizador.latest()
+        if version != self._version_analisis:
+            # frombuffer no copia los píxeles: se guarda la referencia para que el buffer siga vivo
+            self._imagen_analisis = imagen
+            self.superficie_analisis = pygame.image.frombuffer(imagen, self.analizador.size, 'RGBA')
+            self._version_analisis = version
+    
+    def dibujar_analisis(self):
+        if self.superficie_analisis is None:
+            self.pantalla.fill(BLANCO, pygame.Rect(0, 0, self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO))
+            texto = self.renderizar_texto(self.fuente, "Generando gráficos...", True, GRIS)
+            self.pantalla.blit(texto, texto.get_rect(center=(self.VENTANA_TAMAÑO // 2, self.VENTANA_TAMAÑO // 2)))
+        else:
+            self.pantalla.blit(self.superficie_analisis, (0, 0))
     
     def obtener_posicion_clic(self, pos_mouse):
         x, y = pos_mouse
         
         # Verificar si el clic está dentro del tablero
-        if x < 0 or x >= self.VENTANA_TAMAÑO or y < 0 or y >= self.VENTANA_TAMAÑO:
+        if x < 0 or x >= self.TABLERO_ANCHO or y < 0 or y >= self.TABLERO_ALTO:
             return None
         
         fila = y // self.CELDA_TAMAÑO
@@ -269,123 +413,186 @@ class TresEnRayaPygame(MinimaxAlgorithm):
         return (fila, col)
     
     def es_movimiento_valido(self, fila, col):
-        return (0 <= fila < 3 and 0 <= col < 3 and 
-                self.board[fila][col] == ' ')
+        return self.board.is_free(fila, col)
+    
+    def nueva_semilla(self):
+        """Prepara el generador aleatorio y la lista de jugadas de una partida nueva."""
+        self.semilla = random.getrandbits(63)
+        self.rng = random.Random(self.semilla)
+        self._partida = {'moves': [], 'nodes': [], 'times': [], 'depth': 0}
+        self._inicio_turno = time.perf_counter()
+    
+    def anotar_jugada(self, movimiento, nodos, tiempo, profundidad=0):
+        self._partida['moves'].append(movimiento)
+        self._partida['nodes'].append(nodos)
+        self._partida['times'].append(tiempo)
+        # Con límite de tiempo la profundidad efectiva es la que alcanzó la búsqueda
+        self._partida['depth'] = max(self._partida['depth'], profundidad)
+        self._inicio_turno = time.perf_counter()
+    
+    def registrar_partida(self):
+        """Encola la partida terminada en el registro; la escritura se hace en otro hilo."""
+        if self.game_log is None:
+            return
+        g = self.geometry
+        self.game_log.append(dict(
+            self._partida,
+            rows=g.rows, cols=g.cols, k=g.k,
+            difficulty=self.current_difficulty,
+            time_budget_ms=self.time_budget_ms,
+            winner=self.winner,
+            seed=self.semilla
+        ))
     
     def realizar_movimiento(self, fila, col, jugador):
-        if self.es_movimiento_valido(fila, col):
-            self.board[fila][col] = jugador
+        if self.es_movimiento_valido(fila, col) and self.board.player == jugador:
+            self.board = self.board.play((fila, col))
             return True
         return False
     
     def verificar_ganador(self, board):
-        # Verificar filas
-        for fila in board:
-            if fila[0] == fila[1] == fila[2] != ' ':
-                return fila[0]
-        
-        # Verificar columnas
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col] != ' ':
-                return board[0][col]
-        
-        # Verificar diagonales
-        if board[0][0] == board[1][1] == board[2][2] != ' ':
-            return board[0][0]
-        if board[0][2] == board[1][1] == board[2][0] != ' ':
-            return board[0][2]
-        
-        # Verificar empate
-        if all(cell != ' ' for row in board for cell in row):
-            return 'T'
-        
-        return None
-    
-    # Métodos heredados de MinimaxAlgorithm
-    def is_terminal_state(self, state):
-        return self.verificar_ganador(state) is not None
-    
-    def evaluate_state(self, state):
-        winner = self.verificar_ganador(state)
-        if winner == self.ai_player:
-            return 1.0
-        elif winner == self.human_player:
-            return -1.0
-        elif winner == 'T':
-            return 0.0
-        else:
-            return 0.0
+        return board.winner()
     
-    def get_possible_moves(self, state):
-        moves = []
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == ' ':
-                    moves.append((i, j))
-        return moves
+    def obtener_movimiento_ia(self, tablero=None):
+        """Busca la jugada de la IA y la registra en el análisis."""
+        resultado = self.buscar_movimiento_ia(self.board if tablero is None else tablero)
+        self.registrar_resultado_ia(resultado)
+        return resultado['move']
     
-    def make_move(self, state, move):
-        new_state = copy.deepcopy(state)
-        row, col = move
+    def buscar_movimiento_ia(self, tablero):
+        """Busca la jugada de la IA sin tocar el estado de la interfaz.
         
-        moves_count = sum(1 for i in range(3) for j in range(3) if state[i][j] != ' ')
-        current_player = self.human_player if moves_count % 2 == 0 else self.ai_player
-        
-        new_state[row][col] = current_player
-        return new_state
-    
-    def obtener_movimiento_ia(self):
+        Devuelve la jugada con su costo; puede ejecutarse en el hilo de la búsqueda.
+        """
+        self.esperar_precarga()
         difficulty_config = self.difficulty_levels[self.current_difficulty]
+        if self.ponderador is not None:
+            self.ponderador.stop()
         
         # Medir tiempo de ejecución
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Probabilidad de hacer un movimiento aleatorio (para reducir dificultad)
-        if random.random() < difficulty_config['random_chance']:
+        if self.rng.random() < difficulty_config['random_chance']:
             # Hacer un movimiento aleatorio
-            possible_moves = self.get_possible_moves(self.board)
+            possible_moves = self.get_possible_moves(tablero)
             if possible_moves:
-                move = random.choice(possible_moves)
-                end_time = time.time()
+                move = self.rng.choice(possible_moves)
+                end_time = time.perf_counter()
                 
-                # Registrar datos para análisis
-                move_number = len(self.analysis_data['moves']) + 1
-                self.analysis_data['moves'].append(move_number)
-                self.analysis_data['nodes_evaluated'].append(1)  # Movimiento aleatorio
-                self.analysis_data['depth_used'].append(1)
-                self.analysis_data['time_taken'].append(end_time - start_time)
-                self.analysis_data['difficulty'].append(self.current_difficulty)
-                
-                return move
+                # Movimiento aleatorio: un nodo a profundidad 1
+                return {'move': move, 'nodes': 1, 'depth': 1, 'time': end_time - start_time,
+                        'branching': len(possible_moves), 'pondered': False}
+        
+        # Usar la respuesta ponderada si el jugador hizo una de las jugadas ya resueltas
+        resultado = None
+        if self.ponderador is not None:
+            resultado = self.ponderador.take(tablero, difficulty_config['depth'], True, self.time_budget_ms)
         
         # Usar minimax con la profundidad según dificultad
-        self.nodes_evaluated = 0
-        best_move = self.get_best_move(
-            self.board, 
-            depth=difficulty_config['depth'], 
-            maximizing_player=True
-        )
-        stats = self.get_stats()
-        self.nodes_evaluated = stats['nodes_evaluated']
-        
-        end_time = time.time()
-        
-        # Registrar datos para análisis
-        move_number = len(self.analysis_data['moves']) + 1
-        self.analysis_data['moves'].append(move_number)
-        self.analysis_data['nodes_evaluated'].append(self.nodes_evaluated)
-        self.analysis_data['depth_used'].append(difficulty_config['depth'])
-        self.analysis_data['time_taken'].append(end_time - start_time)
-        self.analysis_data['difficulty'].append(self.current_difficulty)
-        
-        return best_move
+        if resultado is not None:
+            best_move = resultado['move']
+            stats = resultado['stats']
+        else:
+            best_move = self.get_best_move(
+                tablero, 
+                depth=difficulty_config['depth'], 
+                maximizing_player=True,
+                time_budget_ms=self.time_budget_ms
+            )
+            stats = self.get_stats()
+        
+        end_time = time.perf_counter()
+        
+        return {'move': best_move, 'nodes': stats['nodes_evaluated'], 'depth': stats['depth_reached'],
+                'time': end_time - start_time, 'branching': len(self.get_possible_moves(tablero)),
+                'pondered': resultado is not None}
+    
+    def registrar_resultado_ia(self, resultado):
+        """Registra el costo de la jugada para el análisis; se llama desde el bucle principal."""
+        self.nodes_evaluated = resultado['nodes']
+        self.analysis_data.append(resultado['nodes'], resultado['depth'], resultado['time'],
+                                  self.current_difficulty, resultado['branching'])
+    
+    def get_stats(self):
+        stats = super().get_stats()
+        if self.ponderador is not None:
+            stats.update(self.ponderador.get_stats())
+        return stats
+    
+    def debe_ponderar(self):
+        return (self.ponderador is not None and not self.showing_difficulty_menu and not self.game_over
+                and self.current_player == self.human_player and self._tablero_ponderado != self.board.key)
+    
+    def iniciar_ponderacion(self):
+        """Busca en segundo plano la respuesta a cada jugada posible del jugador."""
+        depth = self.difficulty_levels[self.current_difficulty]['depth']
+        self._tablero_ponderado = self.board.key
+        self.ponderador.start(self.board, depth, True, self.time_budget_ms)
+    
+    def iniciar_busqueda_ia(self):
+        """Lanza la búsqueda de la IA en un hilo para no bloquear el bucle de eventos."""
+        # La búsqueda juega y deshace sobre el estado, así que trabaja con una copia
+        tablero = self.board.copy()
+        self.error_ia = None
+        self._inicio_ia = time.perf_counter()
+        # Una cola por búsqueda: lo que entregue una búsqueda cancelada no llega a la siguiente
+        self._resultados_ia = queue.Queue()
+        self._resultado_ia = None
+        self._hilo_ia = threading.Thread(target=self._buscar_movimiento_ia,
+                                         args=(tablero, self._resultados_ia), daemon=True)
+        self._hilo_ia.start()
+    
+    def _buscar_movimiento_ia(self, tablero, resultados):
+        # Solo el contador de nodos del motor cambia durante la búsqueda; el resto del
+        # estado lo actualiza el bucle principal al recibir el resultado
+        try:
+            resultados.put(('jugada', self.buscar_movimiento_ia(tablero)))
+        except SearchAborted:
+            pass
+        except Exception as e:
+            # El hilo no puede propagar la excepción: se informa y el bucle principal termina la partida
+            traceback.print_exc()
+            resultados.put(('error', str(e) or type(e).__name__))
+    
+    def recibir_resultado_ia(self):
+        """Devuelve el resultado de la búsqueda si ya llegó, o None."""
+        if self._resultado_ia is None:
+            try:
+                self._resultado_ia = self._resultados_ia.get_nowait()
+            except queue.Empty:
+                return None
+        return self._resultado_ia
+    
+    def cerrar_busqueda_ia(self):
+        """Espera al hilo de la búsqueda, que ya entregó su resultado o se canceló."""
+        if self._hilo_ia is not None:
+            self._hilo_ia.join()
+        self._hilo_ia = None
+        self._resultados_ia = None
+        self._resultado_ia = None
+    
+    def cancelar_busqueda_ia(self):
+        """Detiene la búsqueda en curso y espera a que el hilo termine."""
+        if self._hilo_ia is not None:
+            self.cancel()
+            self.cerrar_busqueda_ia()
+            self.clear_cancel()
+        if self.ponderador is not None:
+            self.ponderador.stop()
+            self._tablero_ponderado = None
     
     def reiniciar_juego(self):
         """Reinicia el juego."""
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.cancelar_busqueda_ia()
+        self.board = self.new_board()
+        self.new_game()
+        self.analysis_data.new_game()
+        self.nueva_semilla()
         self.current_player = self.human_player
         self.game_over = False
         self.winner = None
+        self.error_ia = None
         self.ai_thinking = False
         self.nodes_evaluated = 0
     
@@ -393,6 +600,7 @@ class TresEnRayaPygame(MinimaxAlgorithm):
         """Vuelve al menú de dificultad."""
         self.reiniciar_juego()
         self.showing_difficulty_menu = True
+        self.showing_analysis = False
     
     def mostrar_costo_jugada(self, nodos_evaluados, tiempo_ms):
         """Muestra el costo de la jugada actual en la interfaz."""
@@ -403,27 +611,122 @@ class TresEnRayaPygame(MinimaxAlgorithm):
             pygame.draw.rect(self.pantalla, NEGRO, costo_rect, 2)
             
             # Título
-            titulo_costo = self.fuente.render("Costo de la Jugada IA:", True, NEGRO)
+            titulo_costo = self.renderizar_texto(self.fuente, "Costo de la Jugada IA:", True, NEGRO)
             self.pantalla.blit(titulo_costo, (15, self.VENTANA_TAMAÑO + 10))
             
             # Nodos evaluados
-            nodos_texto = self.fuente.render(f"Nodos: {nodos_evaluados}", True, AZUL)
+            nodos_texto = self.renderizar_texto(self.fuente, f"Nodos: {nodos_evaluados}", True, AZUL)
             self.pantalla.blit(nodos_texto, (15, self.VENTANA_TAMAÑO + 35))
             
             # Tiempo
-            tiempo_texto = self.fuente.render(f"Tiempo: {tiempo_ms:.1f}ms", True, ROJO)
+            tiempo_texto = self.renderizar_texto(self.fuente, f"Tiempo: {tiempo_ms:.1f}ms", True, ROJO)
             self.pantalla.blit(tiempo_texto, (15, self.VENTANA_TAMAÑO + 60))
 
+    def avanzar_turno_ia(self):
+        """Lanza la búsqueda de la IA o, si ya terminó, aplica su resultado."""
+        # La búsqueda corre en otro hilo; aquí solo se consulta si ya terminó
+        if self._hilo_ia is None:
+            self.iniciar_busqueda_ia()
+            return
+        resultado = self.recibir_resultado_ia()
+        if resultado is None:
+            return
+        tipo, valor = resultado
+        if tipo == 'error':
+            self.cerrar_busqueda_ia()
+            self.error_ia = valor
+            self.terminar_por_error_ia()
+        elif valor['pondered'] or time.perf_counter() - self._inicio_ia >= self.RETARDO_IA:
+            self.cerrar_busqueda_ia()
+            self.registrar_resultado_ia(valor)
+            self.aplicar_movimiento_ia(valor['move'])
+    
+    def terminar_por_error_ia(self):
+        """Termina la partida sin ganador cuando la búsqueda de la IA falló."""
+        print(f"La búsqueda de la IA falló: {self.error_ia}", file=sys.stderr)
+        self.game_over = True
+        self.winner = None
+        self.ai_thinking = False
+    
+    def aplicar_movimiento_ia(self, movimiento):
+        fila, col = movimiento
+        self.realizar_movimiento(fila, col, self.ai_player)
+        ultima = self.analysis_data.last()
+        self.anotar_jugada(movimiento, ultima[2], ultima[4], ultima[3])
+        
+        self.winner = self.verificar_ganador(self.board)
+        if self.winner:
+            self.game_over = True
+            self.registrar_partida()
+        else:
+            self.current_player = self.human_player
+        
+        self.ai_thinking = False
+
+    def invalidar_pantalla(self):
+        self._estado_menu = None
+        self._estado_tablero = None
+        self._estado_info = None
+    
+    def dibujar(self):
+        """Compone solo las zonas cuyo estado visible cambió y devuelve sus rectángulos."""
+        if self.showing_difficulty_menu:
+            estado = self.current_difficulty
+            if estado == self._estado_menu:
+                return []
+            self.invalidar_pantalla()
+            self._estado_menu = estado
+            self.dibujar_menu_dificultad()
+            return [self.pantalla.get_rect()]
+        
+        self._estado_menu = None
+        rects = []
+        if self.showing_analysis:
+            estado_tablero = ('analisis', self._version_analisis)
+        else:
+            estado_tablero = self.board.key
+        if estado_tablero != self._estado_tablero:
+            self._estado_tablero = estado_tablero
+            if self.showing_analysis:
+                self.dibujar_analisis()
+            else:
+                self.dibujar_tablero()
+            rects.append(pygame.Rect(0, 0, self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO))
+        
+        estado_info = (self.game_over, self.winner, self.ai_thinking, self.nodes_evaluated,
+                       self.current_player, self.current_difficulty, self.analysis_data.total,
+                       self.showing_analysis)
+        if estado_info != self._estado_info:
+            self._estado_info = estado_info
+            self.dibujar_interfaz()
+            rects.append(pygame.Rect(0, self.VENTANA_TAMAÑO, self.VENTANA_TAMAÑO, 100))
+        return rects
+
     def ejecutar_juego(self):
+        self.iniciar_pantalla()
+        self.iniciar_precarga()
         ejecutando = True
         
         while ejecutando:
-            for evento in pygame.event.get():
-                if evento.type == pygame.QUIT:
+            if self.ai_thinking:
+                eventos = pygame.event.get()
+            else:
+                # Sin búsqueda en curso no hay nada que animar: se duerme hasta el próximo evento
+                eventos = [pygame.event.wait()] + pygame.event.get()
+            
+            for evento in eventos:
+                if evento.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.invalidar_pantalla()
+                
+                elif evento.type == EVENTO_ANALISIS:
+                    self.recibir_analisis()
+                
+                elif evento.type == pygame.QUIT:
+                    self.cancelar_busqueda_ia()
                     ejecutando = False
                 
                 elif evento.type == pygame.KEYDOWN:
-                    if self.game_over:
+                    if self.game_over or self.ai_thinking:
                         if evento.key == pygame.K_r:
                             self.reiniciar_juego()
                         elif evento.key == pygame.K_m:
@@ -437,49 +740,92 @@ class TresEnRayaPygame(MinimaxAlgorithm):
                             self.showing_difficulty_menu = False
                             self.reiniciar_juego()
                     
+                    elif self.analysis_button_rect is not None and self.analysis_button_rect.collidepoint(evento.pos):
+                        self.alternar_analisis()
+                    
+                    elif self.showing_analysis:
+                        pass
+                    
                     elif not self.game_over and not self.ai_thinking and self.current_player == self.human_player:
                         pos_clic = self.obtener_posicion_clic(evento.pos)
                         if pos_clic:
                             fila, col = pos_clic
                             if self.realizar_movimiento(fila, col, self.human_player):
+                                self.anotar_jugada(pos_clic, 0, time.perf_counter() - self._inicio_turno)
                                 self.winner = self.verificar_ganador(self.board)
                                 if self.winner:
                                     self.game_over = True
+                                    self.registrar_partida()
                                 else:
                                     self.current_player = self.ai_player
                                     self.ai_thinking = True
             
-            if not self.showing_difficulty_menu and not self.game_over and self.current_player == self.ai_player and self.ai_thinking:
-                pygame.time.wait(500)
-                
-                fila, col = self.obtener_movimiento_ia()
-                self.realizar_movimiento(fila, col, self.ai_player)
-                
-                self.winner = self.verificar_ganador(self.board)
-                if self.winner:
-                    self.game_over = True
-                else:
-                    self.current_player = self.human_player
-                
-                self.ai_thinking = False
+            if (not self.showing_difficulty_menu and not self.game_over
+                    and self.current_player == self.ai_player and self.ai_thinking):
+                self.avanzar_turno_ia()
             
-            # Dibujar todo
-            if self.showing_difficulty_menu:
-                self.dibujar_menu_dificultad()
-            else:
-                self.dibujar_tablero()
-                self.dibujar_interfaz()
+            if self.showing_analysis:
+                self.actualizar_analisis()
+            
+            # Mientras el jugador piensa, la IA prepara sus respuestas
+            if self.debe_ponderar():
+                self.iniciar_ponderacion()
             
-            pygame.display.flip()
+            # Dibujar solo lo que cambió
+            rects = self.dibujar()
+            if rects:
+                pygame.display.update(rects)
             self.reloj.tick(60)
         
+        if self.analizador is not None:
+            self.analizador.close()
+        if self.metrics_path:
+            self.analysis_data.export(self.metrics_path)
         pygame.quit()
         sys.exit()
 
 
 def main():
-    juego = TresEnRayaPygame(use_alpha_beta=True)
-    juego.ejecutar_juego()
+    parser = argparse.ArgumentParser(description="Tres en Raya con IA Minimax (pygame)")
+    add_board_arguments(parser)
+    parser.add_argument("--tiempo-ms", type=int, default=None,
+                        help="Tiempo máximo por jugada de la IA en milisegundos (búsqueda iterativa; "
+                             f"por defecto {DEFAULT_TIME_BUDGET_MS} en tableros mayores que 3x3)")
+    parser.add_argument("--ponderar", action="store_true",
+                        help="Buscar las respuestas de la IA mientras el jugador piensa")
+    parser.add_argument("--metricas", default=None,
+                        help="Al salir, exportar las métricas de las jugadas a un archivo .csv o .npz")
+    parser.add_argument("--max-jugadas", type=int, default=DEFAULT_CAPACITY,
+                        help="Jugadas de la IA que se conservan para el análisis")
+    parser.add_argument("--registro", default=None,
+                        help="Añadir cada partida terminada a este registro binario")
+    args = parser.parse_args()
+    
+    registro = None
+    if args.registro:
+        from .gamelog import GameLogWriter
+        registro = GameLogWriter(args.registro)
+    
+    juego = TresEnRayaPygame(
+        use_alpha_beta=True,
+        time_budget_ms=args.tiempo_ms,
+        rows=args.filas,
+        cols=args.columnas,
+        k=args.en_raya,
+        transposition_table=TranspositionTable(),
+        use_symmetry=True,
+        use_perfect_play=True,
+        move_ordering=MoveOrdering(),
+        ponder=args.ponderar,
+        metrics_capacity=args.max_jugadas,
+        metrics_path=args.metricas,
+        game_log=registro
+    )
+    try:
+        juego.ejecutar_juego()
+    finally:
+        if registro is not None:
+            registro.close()
 
 
 if __name__ == "__main__":
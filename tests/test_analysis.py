@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from tic_tac_toe_minimax_game.analysis import AnalysisRenderer, full_tree_nodes, pruning_savings
+
+
+def test_full_tree_nodes():
+    # 1 + 3 + 3*2 + 3*2*1
+    assert full_tree_nodes(3, 3) == 16
+    # La profundidad no pasa del número de casillas libres
+    assert full_tree_nodes(3, 10) == 16
+    assert full_tree_nodes(9, 0) == 1
+
+
+def test_pruning_savings():
+    assert pruning_savings(16, 3, 3) == 0.0
+    assert pruning_savings(4, 3, 3) == 0.75
+    assert pruning_savings(100, 3, 3) == 0.0
+
+
+def _wait_for_version(renderer, ready, version):
+    while renderer.latest()[0] < version:
+        assert ready.wait(30)
+        ready.clear()
+
+
+def test_renderer_publishes_rgba_images():
+    pytest.importorskip("matplotlib")
+    ready = threading.Event()
+    renderer = AnalysisRenderer(width=200, height=150, on_ready=ready.set, max_points=2)
+    try:
+        _wait_for_version(renderer, ready, 1)
+        version, image = renderer.latest()
+        assert len(image) == 200 * 150 * 4
+        renderer.append({
+            'moves': [1, 2, 3],
+            'nodes_evaluated': [500, 40, 3],
+            'depth_used': [9, 7, 5],
+            'time_taken': [0.02, 0.002, 0.0001],
+            'difficulty': ['Imposible', 'Difícil', 'Difícil'],
+            'empty_cells': [9, 7, 5]
+        })
+        _wait_for_version(renderer, ready, version + 1)
+        # Con max_points solo se dibujan las últimas jugadas, pero las medias cuentan todas
+        assert list(renderer._series['moves']) == [2, 3]
+        assert renderer._depth_counts == {'Imposible': 1, 'Difícil': 2}
+    finally:
+        renderer.close()
@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+import pytest
+
+from tic_tac_toe_minimax_game import batch
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+
+
+def _random_states(rows, cols, k, count, seed=0):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        state = Bitboard.empty(rows, cols, k)
+        for _ in range(rng.randrange(rows * cols + 1)):
+            if state.is_over():
+                break
+            state = state.play(rng.choice(state.moves()))
+        states.append(state)
+    return states
+
+
+@pytest.mark.parametrize("rows, cols, k", [(3, 3, 3), (4, 4, 3), (3, 5, 4)])
+def test_matches_engine(rows, cols, k):
+    states = _random_states(rows, cols, k, 300)
+    engine = BitboardGame(rows=rows, cols=cols, k=k)
+    winners, terminal, evaluation = batch.classify(batch.encode(states), k=k)
+    assert batch.winner_symbols(winners) == [state.winner() for state in states]
+    assert terminal.tolist() == [state.is_over() for state in states]
+    assert evaluation.tolist() == [engine.evaluate_state(state) for state in states]
+
+
+def test_packed_and_string_boards():
+    board = [list("XXX"), list("OO "), list("   ")]
+    assert batch.winner_symbols(batch.winners(np.array([board]))) == ['X']
+    packed = batch.encode([Bitboard.from_rows(board)]).reshape(1, 9)
+    assert batch.winner_symbols(batch.winners(packed)) == ['X']
+    with pytest.raises(ValueError):
+        batch.winners(np.zeros((1, 10), dtype=np.int8), rows=3)
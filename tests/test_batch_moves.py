@@ -0,0 +1,39 @@
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def _value(state, move):
+    engine = BitboardGame()
+    engine._root_depth = 9
+    return engine.minimax(state.play(move), 8, False)[0]
+
+
+def _best_value(state):
+    return max(_value(state, move) for move in state.moves())
+
+
+def test_batch_deduplicates_symmetric_positions():
+    corner = Bitboard.from_rows([list("X  "), list("   "), list("   ")])
+    other_corner = Bitboard.from_rows([list("   "), list("   "), list("  X")])
+    edge = Bitboard.from_rows([list(" X "), list("   "), list("   ")])
+    states = [corner, edge, other_corner, corner]
+    engine = BitboardGame(use_symmetry=True)
+    moves = engine.get_best_moves(states, depth=9)
+    stats = engine.get_stats()
+    assert stats["batch_requests"] == 4
+    assert stats["batch_unique_positions"] == 2
+    # Cada jugada es válida y óptima en su propio tablero
+    for state, move in zip(states, moves):
+        assert state.is_free(*move)
+        assert _value(state, move) == _best_value(state)
+    # El tablero temporal de transposición no se queda en el motor
+    assert engine.transposition_table is None
+
+
+def test_batch_matches_single_searches():
+    states = [Bitboard.from_rows([list("X  "), list(" O "), list("  X")]),
+              Bitboard.from_rows([list("XX "), list(" O "), list("   ")])]
+    batch = BitboardGame(transposition_table=TranspositionTable())
+    moves = batch.get_best_moves(states, depth=9)
+    for state, move in zip(states, moves):
+        assert move == BitboardGame().get_best_move(state, depth=9)
@@ -0,0 +1,40 @@
+import importlib.util
+import os
+
+import pytest
+
+from tic_tac_toe_minimax_game import benchmark
+
+
+def test_no_node_regressions():
+    benchmark.assert_no_regressions()
+
+
+def test_time_is_only_advisory():
+    baseline = {"caso": {"nodes": 10, "time_ms": 1.0, "peak_memory_kb": 10.0}}
+    slower = {"caso": {"nodes": 10, "time_ms": 100.0, "peak_memory_kb": 10.0}}
+    assert benchmark.find_regressions(slower, baseline) == []
+    assert benchmark.find_slowdowns(slower, baseline)
+    # Un nodo más sí es una regresión, aunque sea más rápido
+    more_nodes = {"caso": {"nodes": 11, "time_ms": 0.5, "peak_memory_kb": 10.0}}
+    assert benchmark.find_regressions(more_nodes, baseline)
+    assert benchmark.find_regressions({}, baseline)
+
+
+def _startup_budgets():
+    budgets = dict(benchmark.STARTUP_BUDGETS)
+    # Sin pygame instalado el frontend gráfico no se puede importar
+    if importlib.util.find_spec("pygame") is None:
+        budgets.pop("tres_en_raya_pygame")
+    return budgets
+
+
+def test_startup_skips_heavy_imports():
+    benchmark.assert_startup_budget(repeat=1, budgets=_startup_budgets(), check_time=False)
+
+
+# El tiempo de importación depende de la máquina y de su carga
+@pytest.mark.skipif(not os.environ.get("BENCHMARK_STARTUP_TIME"),
+                    reason="define BENCHMARK_STARTUP_TIME=1 para medir el tiempo de arranque")
+def test_startup_budget():
+    benchmark.assert_startup_budget(budgets=_startup_budgets())
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame, Geometry
+
+
+def _snapshot(board):
+    return (board.x, board.o, board.turn, board.filled, list(board.counts), board.winner_symbol)
+
+
+def test_empty_board():
+    board = Bitboard.empty()
+    assert board.player == 'X'
+    assert len(board.moves()) == 9
+    assert board.winner() is None
+    assert not board.is_over()
+
+
+def test_from_rows_detects_winner_and_turn():
+    board = Bitboard.from_rows([list("XXX"), list("OO "), list("   ")])
+    assert board.winner() == 'X'
+    assert board.player == 'O'
+    assert board.is_over()
+
+    tie = Bitboard.from_rows([list("XOX"), list("XOO"), list("OXX")])
+    assert tie.winner() == 'T'
+
+
+def test_play_matches_from_masks():
+    board = Bitboard.empty()
+    for move in [(1, 1), (0, 0), (2, 2), (0, 2), (0, 1), (2, 1)]:
+        board = board.play(move)
+    rebuilt = Bitboard.from_masks(board.x, board.o)
+    assert _snapshot(board) == _snapshot(rebuilt)
+
+
+@pytest.mark.parametrize("rows, cols, k", [(3, 3, 3), (4, 4, 3), (3, 5, 4)])
+def test_apply_undo_restores_state(rows, cols, k):
+    rng = random.Random(rows * 100 + cols * 10 + k)
+    for _ in range(50):
+        board = Bitboard.empty(rows, cols, k)
+        history = []
+        while not board.is_over():
+            move = rng.choice(board.moves())
+            history.append((move, _snapshot(board)))
+            expected = board.play(move)
+            board.apply(move)
+            assert _snapshot(board) == _snapshot(expected)
+        for move, before in reversed(history):
+            board.undo(move)
+            assert _snapshot(board) == before
+
+
+def test_undo_clears_winner():
+    board = Bitboard.from_rows([list("XX "), list("OO "), list("   ")])
+    board.apply((0, 2))
+    assert board.winner() == 'X'
+    board.undo((0, 2))
+    assert board.winner() is None
+    assert board.player == 'X'
+
+
+def test_geometry_lines():
+    assert len(Geometry(3, 3, 3).line_masks) == 8
+    # 4 filas x 2 + 4 columnas x 2 + 2 x 2 diagonales en cada sentido
+    assert len(Geometry(4, 4, 3).line_masks) == 24
+    # Con k = 1 cada casilla es su propia línea
+    assert len(Geometry(2, 3, 1).line_masks) == 6
+
+
+def test_geometry_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        Geometry(0, 3, 3)
+    with pytest.raises(ValueError):
+        Geometry(3, 3, 4)
+
+
+def test_engine_blocks_and_wins():
+    engine = BitboardGame()
+    # O (la IA) gana en (1, 2) en lugar de bloquear a X
+    board = Bitboard.from_rows([list("XX "), list("OO "), list("X  ")])
+    assert engine.get_best_move(board, depth=9, maximizing_player=True) == (1, 2)
+    # Sin victoria propia, O bloquea la fila de X
+    board = Bitboard.from_rows([list("XX "), list(" O "), list("   ")])
+    assert engine.get_best_move(board, depth=9, maximizing_player=True) == (0, 2)
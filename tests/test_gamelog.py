@@ -0,0 +1,92 @@
+import pickle
+
+import pytest
+
+from tic_tac_toe_minimax_game import gamelog
+from tic_tac_toe_minimax_game.bitboard import BitboardGame
+from tic_tac_toe_minimax_game.tres_en_raya import TresEnRaya
+
+
+def _game(rows, cols, k, moves, winner='T', difficulty='Normal', time_budget_ms=None):
+    return {
+        'rows': rows,
+        'cols': cols,
+        'k': k,
+        'difficulty': difficulty,
+        'depth': 4,
+        'time_budget_ms': time_budget_ms,
+        'winner': winner,
+        'seed': 42,
+        'timestamp': 1700000000.0,
+        'moves': moves,
+        'nodes': [10 * (i + 1) for i in range(len(moves))],
+        'times': [0.5] * len(moves)
+    }
+
+
+GAMES = [
+    # Nibbles, con un número impar de jugadas
+    _game(3, 3, 3, [(1, 1), (0, 0), (2, 2)], winner=None),
+    _game(4, 4, 3, [(3, 3), (0, 0)], winner='X', difficulty=None, time_budget_ms=1000),
+    # Un byte por jugada
+    _game(16, 16, 5, [(15, 15), (0, 0), (7, 8)], winner='O'),
+    # Dos bytes por jugada: más de 256 casillas
+    _game(20, 20, 5, [(19, 19), (0, 0), (12, 17)])
+]
+
+
+def _write(path, games):
+    with gamelog.GameLogWriter(path) as writer:
+        for game in games:
+            writer.append(game)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "partidas.log"
+    _write(path, GAMES)
+    assert list(gamelog.read_games(path)) == GAMES
+    assert [game['rows'] for game in gamelog.read_games(path, winner='T')] == [20]
+    assert [game['rows'] for game in gamelog.read_games(path, difficulty='Normal', rows=16)] == [16]
+
+
+@pytest.mark.parametrize("game, flags", [(GAMES[0], gamelog.FLAG_NIBBLES), (GAMES[2], 0),
+                                         (GAMES[3], gamelog.FLAG_WIDE)])
+def test_move_encoding_flags(game, flags):
+    assert gamelog.RECORD.unpack_from(gamelog.encode(game))[7] == flags
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = tmp_path / "partidas.log"
+    _write(path, GAMES)
+    record = gamelog.encode(GAMES[0])
+    with open(path, 'ab') as f:
+        f.write(record[:-3])
+    assert list(gamelog.read_games(path)) == GAMES
+    # Una cabecera de registro a medias también se ignora
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02')
+    assert len(list(gamelog.read_games(path))) == len(GAMES)
+
+
+def test_writer_skips_bad_records(tmp_path, capsys):
+    path = tmp_path / "partidas.log"
+    bad = dict(GAMES[0], difficulty='Experto')
+    _write(path, [GAMES[0], bad, GAMES[1]])
+    assert list(gamelog.read_games(path)) == GAMES[:2]
+    assert "No se pudo registrar la partida" in capsys.readouterr().err
+
+
+def test_replay_uses_recorded_depth_and_budget():
+    game = _game(4, 4, 3, [(1, 1), (0, 0), (2, 2)], difficulty='Imposible', time_budget_ms=1000)
+    engine = BitboardGame(rows=4, cols=4, k=3)
+    results = list(gamelog.replay([game], engines={(4, 4, 3): engine}))
+    assert [result['ply'] for result in results] == [1]
+    # Con presupuesto la búsqueda es iterativa y no pasa de la profundidad guardada
+    assert [it['depth'] for it in engine.get_stats()['iterations']] == [1, 2, 3, 4]
+
+
+def test_game_with_log_can_be_pickled(tmp_path):
+    with gamelog.GameLogWriter(tmp_path / "partidas.log") as writer:
+        game = TresEnRaya(game_log=writer)
+        copy = pickle.loads(pickle.dumps(game))
+    assert copy.game_log is None
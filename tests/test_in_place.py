@@ -0,0 +1,27 @@
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.ordering import MoveOrdering
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+@pytest.mark.parametrize("use_alpha_beta", [True, False])
+def test_in_place_matches_copy(use_alpha_beta):
+    state = Bitboard.from_rows([list("X  "), list(" O "), list("   ")])
+    copy_engine = BitboardGame(use_alpha_beta=use_alpha_beta, use_in_place=False)
+    in_place_engine = BitboardGame(use_alpha_beta=use_alpha_beta)
+    assert in_place_engine.use_in_place
+    before = (state.x, state.o, state.turn, list(state.counts))
+    move = in_place_engine.get_best_move(state, depth=7, maximizing_player=False)
+    assert (state.x, state.o, state.turn, list(state.counts)) == before
+    assert copy_engine.get_best_move(state, depth=7, maximizing_player=False) == move
+    assert copy_engine.nodes_evaluated == in_place_engine.nodes_evaluated
+
+
+def test_in_place_restores_state_after_abort():
+    engine = BitboardGame(rows=5, cols=5, k=4, transposition_table=TranspositionTable(),
+                          move_ordering=MoveOrdering())
+    state = engine.new_board()
+    engine.get_best_move(state, depth=25, time_budget_ms=20)
+    assert state.filled == 0 and state.x == 0 and state.o == 0
+    assert not any(state.counts)
@@ -0,0 +1,42 @@
+import pickle
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+
+
+def test_plain_engine_has_no_instrumentation_stats():
+    engine = BitboardGame()
+    engine.get_best_move(Bitboard.empty(), depth=4)
+    stats = engine.get_stats()
+    assert "nodes_by_ply" not in stats
+    assert stats["nodes_evaluated"] > 0
+    assert stats["depth_reached"] == 4
+
+
+def test_instrumented_counts_match_plain_search():
+    plain = BitboardGame()
+    instrumented = BitboardGame(instrument=True)
+    state = Bitboard.from_rows([list("X  "), list("   "), list("   ")])
+    move = plain.get_best_move(state, depth=8)
+    assert instrumented.get_best_move(state, depth=8) == move
+    stats = instrumented.get_stats()
+    assert stats["nodes_evaluated"] == plain.nodes_evaluated
+    assert sum(stats["nodes_by_ply"].values()) == stats["nodes_evaluated"]
+    assert stats["max_ply_reached"] == 8
+    assert stats["terminal_nodes"] > 0
+
+
+def test_stats_callback_after_each_iteration():
+    reports = []
+    engine = BitboardGame(stats_callback=reports.append)
+    engine.get_best_move(Bitboard.empty(), depth=9, time_budget_ms=5000)
+    depths = [report["depth_reached"] for report in reports]
+    assert depths == sorted(depths)
+    assert depths[-1] == engine.depth_reached
+
+
+def test_instrumented_engine_can_be_pickled():
+    engine = BitboardGame(instrument=True, stats_callback=print)
+    copy = pickle.loads(pickle.dumps(engine))
+    assert copy.stats_callback is None
+    assert not copy.instrument
+    copy.get_best_move(Bitboard.empty(), depth=2)
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.minimax import SearchAborted
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def test_generous_budget_matches_fixed_depth():
+    state = Bitboard.from_rows([list("X  "), list("   "), list("   ")])
+    fixed = BitboardGame(transposition_table=TranspositionTable())
+    iterative = BitboardGame(transposition_table=TranspositionTable())
+    move = fixed.get_best_move(state, depth=8)
+    assert iterative.get_best_move(state, depth=8, time_budget_ms=60000) == move
+    assert iterative.depth_reached == 8
+    assert [it["depth"] for it in iterative.get_stats()["iterations"]] == list(range(1, 9))
+
+
+def test_stops_when_no_leaf_is_cut_by_depth():
+    # Quedan cuatro casillas: ninguna rama llega a la profundidad pedida
+    state = Bitboard.from_rows([list("XOX"), list("XO "), list("O  ")])
+    engine = BitboardGame()
+    engine.get_best_move(state, depth=9, maximizing_player=True, time_budget_ms=60000)
+    assert engine.depth_reached < 9
+    assert engine.get_principal_variation()
+
+
+def test_tiny_budget_still_returns_a_move():
+    engine = BitboardGame(rows=5, cols=5, k=4)
+    state = engine.new_board()
+    move = engine.get_best_move(state, depth=25, time_budget_ms=1)
+    assert move in state.moves()
+    assert engine.depth_reached >= 1
+
+
+def test_cancel_aborts_search():
+    engine = BitboardGame(rows=5, cols=5, k=4)
+    engine.cancel()
+    with pytest.raises(SearchAborted):
+        engine.get_best_move(engine.new_board(), depth=25, time_budget_ms=60000)
+    engine.clear_cancel()
+    # Cancelar desde otro hilo termina una búsqueda sin límite de tiempo
+    timer = threading.Timer(0.05, engine.cancel)
+    timer.start()
+    with pytest.raises(SearchAborted):
+        engine.get_best_move(engine.new_board(), depth=25)
+    timer.join()
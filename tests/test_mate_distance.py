@@ -0,0 +1,36 @@
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def _value(engine, state, depth, maximizing):
+    engine._root_depth = depth
+    return engine.minimax(state, depth, maximizing)[0]
+
+
+def test_prefers_the_fastest_win():
+    engine = BitboardGame()
+    # O puede ganar ya en (1, 2); cualquier otra jugada gana más tarde o no gana
+    state = Bitboard.from_rows([list("X X"), list("OO "), list("X  ")])
+    assert engine.get_best_move(state, depth=9, maximizing_player=True) == (1, 2)
+    assert _value(engine, state, 9, True) == BitboardGame.MATE_SCORE - 1
+
+
+def test_win_scores_depend_on_distance():
+    engine = BitboardGame()
+    now = Bitboard.from_rows([list("OO "), list("XX "), list("X  ")])
+    assert _value(engine, now, 9, True) == BitboardGame.MATE_SCORE - 1
+    # X gana en su siguiente jugada haga lo que haga O: derrota a dos jugadas
+    later = Bitboard.from_rows([list("XOO"), list("   "), list("X X")])
+    assert _value(engine, later, 9, True) == 2 - BitboardGame.MATE_SCORE
+
+
+def test_mate_distance_pruning_keeps_values():
+    # Sin alfa-beta tampoco hay poda por distancia: sirve de referencia
+    reference = BitboardGame(use_alpha_beta=False)
+    pruned = BitboardGame(transposition_table=TranspositionTable())
+    state = Bitboard.from_rows([list("X  "), list("   "), list("   ")])
+    for move in state.moves():
+        child = state.play(move)
+        assert _value(pruned, child, 8, False) == _value(reference, child, 8, False)
+    assert pruned.mate_distance_cutoffs > 0
+    assert reference.mate_distance_cutoffs == 0
@@ -0,0 +1,85 @@
+import csv
+
+import pytest
+
+from tic_tac_toe_minimax_game.metrics import MoveMetrics
+
+
+def _fill(metrics, moves_per_game):
+    move = 0
+    for moves in moves_per_game:
+        metrics.new_game()
+        for _ in range(moves):
+            move += 1
+            metrics.append(move * 10, move % 5, move / 1000, 'Normal' if move % 2 else 'Difícil', 9 - move % 9)
+
+
+def test_rejects_non_positive_capacity():
+    with pytest.raises(ValueError):
+        MoveMetrics(capacity=0)
+
+
+def test_rows_before_wraparound():
+    metrics = MoveMetrics(capacity=10)
+    _fill(metrics, [3, 2])
+    rows = list(metrics.rows())
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+    assert [row[1] for row in rows] == [1, 1, 1, 2, 2]
+    assert rows[0][2:] == (10, 1, 0.001, 'Normal', 8)
+
+
+def test_wraparound_keeps_latest_moves():
+    metrics = MoveMetrics(capacity=4)
+    _fill(metrics, [3, 3, 4])
+    assert metrics.total == 10
+    assert len(metrics) == 4
+    assert metrics.first == 6
+    rows = list(metrics.rows())
+    assert [row[0] for row in rows] == [7, 8, 9, 10]
+    assert [row[2] for row in rows] == [70, 80, 90, 100]
+    # La partida 2 ya no tiene jugadas conservadas
+    assert [row[1] for row in rows] == [3, 3, 3, 3]
+    assert list(metrics.games) == [(3, 6)]
+    assert metrics.last()[0] == 10
+    # Un rango que empieza en jugadas ya sobrescritas devuelve solo las que quedan
+    assert [row[0] for row in metrics.rows(start=2, end=8)] == [7, 8]
+    assert metrics.series(start=8)['moves'] == [9, 10]
+
+
+def test_wraparound_splits_game_across_the_end():
+    metrics = MoveMetrics(capacity=4)
+    _fill(metrics, [3, 3])
+    # Jugadas 3..6: la partida 2 empieza en la posición 3 y continúa al principio del array
+    assert [(row[0], row[1]) for row in metrics.rows()] == [(3, 1), (4, 2), (5, 2), (6, 2)]
+
+
+def test_summary_covers_discarded_moves():
+    metrics = MoveMetrics(capacity=2)
+    _fill(metrics, [6])
+    summary = metrics.summary()
+    assert summary['Normal']['moves'] == 3
+    assert summary['Difícil']['moves'] == 3
+    assert summary['Normal']['mean_nodes'] == (10 + 30 + 50) / 3
+
+
+def test_export_csv_after_wraparound(tmp_path):
+    metrics = MoveMetrics(capacity=3)
+    _fill(metrics, [2, 3])
+    path = tmp_path / "metricas.csv"
+    metrics.export(str(path))
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == 'move'
+    assert [row[0] for row in rows[1:]] == ['3', '4', '5']
+
+
+def test_export_npz_after_wraparound(tmp_path):
+    np = pytest.importorskip("numpy")
+    metrics = MoveMetrics(capacity=3)
+    _fill(metrics, [2, 3])
+    path = tmp_path / "metricas.npz"
+    metrics.export(str(path))
+    data = np.load(path)
+    assert data['move'].tolist() == [3, 4, 5]
+    assert data['nodes_evaluated'].tolist() == [30, 40, 50]
+    assert data['game_numbers'].tolist() == [2]
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.ordering import MoveOrdering
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def _positions(rows, cols, k, count, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        state = Bitboard.empty(rows, cols, k)
+        while not state.is_over() and len(positions) < count:
+            positions.append(state)
+            state = state.play(rng.choice(state.moves()))
+    return positions
+
+
+def _engines(**options):
+    return [BitboardGame(rows=4, cols=4, k=3, variant=variant,
+                         transposition_table=TranspositionTable() if options.get('table') else None,
+                         use_symmetry=options.get('symmetry', False),
+                         move_ordering=MoveOrdering() if options.get('ordering') else None,
+                         use_alpha_beta=options.get('alpha_beta', True))
+            for variant in ('minimax', 'negamax')]
+
+
+@pytest.mark.parametrize("options, depth", [
+    ({}, 5),
+    ({'alpha_beta': False}, 3),
+    ({'table': True}, 5),
+    ({'table': True, 'symmetry': True}, 5),
+])
+def test_same_scores_and_moves(options, depth):
+    # Los motores se reutilizan en todas las posiciones, con su tabla de transposición
+    minimax, negamax = _engines(**options)
+    for state in _positions(4, 4, 3, 30):
+        maximizing = state.player == 'O'
+        for engine in (minimax, negamax):
+            engine._root_depth = depth
+        assert (negamax._search(state, depth, maximizing)[0]
+                == minimax._search(state, depth, maximizing)[0])
+        assert (negamax.get_best_move(state, depth, maximizing)
+                == minimax.get_best_move(state, depth, maximizing))
+
+
+def test_same_moves_with_move_ordering():
+    # La historia acumula cortes distintos en cada variante: se compara desde motores nuevos
+    for state in _positions(4, 4, 3, 30):
+        minimax, negamax = _engines(table=True, symmetry=True, ordering=True)
+        maximizing = state.player == 'O'
+        assert (negamax.get_best_move(state, 5, maximizing)
+                == minimax.get_best_move(state, 5, maximizing))
+
+
+def test_iterative_with_aspiration_windows():
+    minimax, negamax = _engines(table=True)
+    for state in _positions(4, 4, 3, 20, seed=1):
+        maximizing = state.player == 'O'
+        move = minimax.get_best_move(state, 6, maximizing, time_budget_ms=60000)
+        assert negamax.get_best_move(state, 6, maximizing, time_budget_ms=60000) == move
+
+
+def test_pvs_researches_are_counted():
+    negamax = BitboardGame(rows=4, cols=4, k=3, variant='negamax')
+    negamax.get_best_move(Bitboard.empty(4, 4, 3), 5)
+    stats = negamax.get_stats()
+    assert stats["variant"] == 'negamax'
+    assert "pvs_researches" in stats and "aspiration_failures" in stats
+
+
+def test_unknown_variant():
+    with pytest.raises(ValueError):
+        BitboardGame(variant='expectimax')
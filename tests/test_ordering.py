@@ -0,0 +1,37 @@
+from tic_tac_toe_minimax_game.bitboard import BitboardGame
+from tic_tac_toe_minimax_game.ordering import MoveOrdering
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def test_priority_order():
+    ordering = MoveOrdering()
+    ordering.record_cutoff('killer', 2, 1)
+    ordering.history['history'] = 50
+    moves = ['plain', 'static', 'history', 'killer', 'hash']
+    static = {'static': 1}.get
+    ordered = ordering.order(moves, 2, 'hash', lambda move: static(move, 0))
+    assert ordered == ['hash', 'killer', 'history', 'static', 'plain']
+
+
+def test_killers_are_per_ply_and_bounded():
+    ordering = MoveOrdering()
+    for move in ('a', 'b', 'c'):
+        ordering.record_cutoff(move, 1, 3)
+    assert ordering.killers[1] == ['c', 'b']
+    assert ordering.history == {'a': 9, 'b': 9, 'c': 9}
+    ordering.new_search()
+    assert not ordering.killers and ordering.history
+    ordering.reset()
+    assert not ordering.history
+
+
+def test_ordering_keeps_values_and_saves_nodes():
+    plain = BitboardGame(rows=4, cols=4, k=3, transposition_table=TranspositionTable())
+    ordered = BitboardGame(rows=4, cols=4, k=3, transposition_table=TranspositionTable(),
+                           move_ordering=MoveOrdering())
+    state = plain.new_board().play((1, 1))
+    for engine in (plain, ordered):
+        engine._root_depth = 6
+    assert plain.minimax(state, 6, True)[0] == ordered.minimax(state, 6, True)[0]
+    assert ordered.nodes_evaluated < plain.nodes_evaluated
+    assert ordered.first_move_cutoffs > 0
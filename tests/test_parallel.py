@@ -0,0 +1,99 @@
+import random
+import time
+
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.ordering import MoveOrdering
+from tic_tac_toe_minimax_game.shared_transposition import SharedTranspositionTable
+from tic_tac_toe_minimax_game.transposition import EXACT
+
+DEPTH = 4
+
+
+@pytest.fixture
+def tables():
+    created = []
+
+    def make():
+        table = SharedTranspositionTable(1 << 16)
+        created.append(table)
+        return table
+
+    yield make
+    for table in created:
+        table.close()
+        table.unlink()
+
+
+def _engine(table, workers):
+    # La misma configuración que la consola con --procesos
+    return BitboardGame(rows=4, cols=4, k=3, transposition_table=table, use_symmetry=True,
+                        move_ordering=MoveOrdering(), workers=workers)
+
+
+def _positions(count, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        state = Bitboard.empty(4, 4, 3)
+        while not state.is_over() and len(positions) < count:
+            if state.player == 'O':
+                positions.append(state)
+            state = state.play(rng.choice(state.moves()))
+    return positions
+
+
+def test_fresh_engine_matches_serial(tables):
+    for state in _positions(6):
+        serial = _engine(tables(), 1)
+        parallel = _engine(tables(), 2)
+        try:
+            assert parallel.get_best_move(state, DEPTH) == serial.get_best_move(state, DEPTH)
+        finally:
+            parallel.close()
+
+
+def test_reused_engine_matches_serial(tables):
+    serial = _engine(tables(), 1)
+    parallel = _engine(tables(), 2)
+    rng = random.Random(1)
+    try:
+        for _ in range(4):
+            serial.new_game()
+            parallel.new_game()
+            state = serial.new_board()
+            while not state.is_over():
+                if state.player == 'O':
+                    expected = serial.get_best_move(state, DEPTH)
+                    move = parallel.get_best_move(state, DEPTH)
+                    # Entre jugadas que empatan se elige la misma que en secuencial
+                    assert move == expected
+                    # La raíz queda en la tabla como en la búsqueda secuencial
+                    key, transform = parallel._tt_key(state, True)
+                    entry = parallel.transposition_table.lookup(key)
+                    assert entry is not None and entry[1] >= DEPTH
+                    if entry[2] == EXACT:
+                        assert parallel.unmap_move(entry[3], transform) == move
+                    state = state.play(expected)
+                else:
+                    state = state.play(rng.choice(state.moves()))
+            # Los cortes de los workers llegan a la historia del motor principal
+            assert parallel.move_ordering.history
+    finally:
+        parallel.close()
+
+
+def test_time_budget_uses_workers(tables):
+    parallel = BitboardGame(rows=4, cols=4, k=4, transposition_table=tables(), use_symmetry=True,
+                            move_ordering=MoveOrdering(), workers=2)
+    try:
+        state = parallel.new_board().play((1, 1))
+        start = time.perf_counter()
+        move = parallel.get_best_move(state, depth=15, time_budget_ms=300)
+        assert time.perf_counter() - start < 3
+        assert move in state.moves()
+        assert parallel.depth_reached >= 2
+        assert any(pid != 'main' for pid in parallel.worker_nodes)
+    finally:
+        parallel.close()
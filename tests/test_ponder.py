@@ -0,0 +1,53 @@
+import time
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.ponder import Ponderer
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def _wait(ponderer, timeout=10.0):
+    end = time.perf_counter() + timeout
+    while ponderer._thread.is_alive() and time.perf_counter() < end:
+        time.sleep(0.01)
+
+
+def test_take_returns_pondered_reply():
+    engine = BitboardGame(transposition_table=TranspositionTable())
+    ponderer = Ponderer(engine)
+    # Turno de X (el rival); el motor juega con O
+    state = Bitboard.from_rows([list("X  "), list(" O "), list("   ")])
+    ponderer.start(state, 9, True)
+    _wait(ponderer)
+    assert ponderer.searches == len(state.moves())
+    child = state.play((2, 2))
+    result = ponderer.take(child, 9, True)
+    assert result is not None
+    assert result["move"] == BitboardGame().get_best_move(child, depth=9)
+    # Los contadores del motor no cambian mientras se pondera
+    assert engine.nodes_evaluated == 0
+    assert ponderer.get_stats()["ponder_hits"] == 1
+
+
+def test_different_params_are_a_miss():
+    engine = BitboardGame()
+    ponderer = Ponderer(engine)
+    state = Bitboard.from_rows([list("X  "), list(" O "), list("   ")])
+    ponderer.start(state, 9, True)
+    _wait(ponderer)
+    assert ponderer.take(state.play((2, 2)), 5, True) is None
+    stats = ponderer.get_stats()
+    assert stats["ponder_misses"] == 1
+    assert stats["ponder_hit_rate"] == 0.0
+
+
+def test_stop_cancels_long_search():
+    engine = BitboardGame(rows=5, cols=5, k=4)
+    ponderer = Ponderer(engine)
+    ponderer.start(Bitboard.empty(5, 5, 4), 25, True)
+    time.sleep(0.05)
+    start = time.perf_counter()
+    ponderer.stop()
+    assert time.perf_counter() - start < 2.0
+    assert ponderer._thread is None
+    # El motor vuelve a poder buscar
+    assert engine.get_best_move(Bitboard.empty(5, 5, 4).play((2, 2)), depth=1) is not None
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tic_tac_toe_minimax_game import server
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _handle_all(requests):
+    game_server = server.GameServer(executor=ThreadPoolExecutor(max_workers=1))
+    try:
+        owned = set()
+        responses = []
+        for request in requests:
+            try:
+                responses.append(await game_server.handle(request, owned))
+            except (server.ServerError, ValueError) as e:
+                responses.append({"ok": False, "error": str(e)})
+        return responses
+    finally:
+        game_server.close()
+
+
+def test_new_and_move():
+    new, move = _run(_handle_all([
+        {"cmd": "new", "difficulty": "Difícil", "seed": 1},
+        {"cmd": "move", "session": 1, "row": 1, "col": 1}
+    ]))
+    assert new["ok"] and new["board"] == ["   ", "   ", "   "]
+    assert move["ok"] and move["board"][1][1] == 'X'
+    assert len(move["ai_move"]) == 2
+    assert move["turn"] == 'X'
+
+
+@pytest.mark.parametrize("request_", [
+    {"cmd": "new", "rows": None},
+    {"cmd": "new", "rows": "4"},
+    {"cmd": "new", "rows": True},
+    {"cmd": "new", "rows": 2.5},
+    {"cmd": "new", "difficulty": 5},
+    {"cmd": "new", "difficulty": "Experto"},
+    {"cmd": "new", "seed": [1, 2]},
+    {"cmd": "new", "rows": server.MAX_BOARD_SIDE + 1},
+    {"cmd": "new", "rows": 0},
+    {"cmd": "new", "k": 4},
+    {"cmd": "state", "session": [1]},
+    {"cmd": "state", "session": 2},
+    {"cmd": "move", "session": 1, "row": [0], "col": 0},
+    {"cmd": "move", "session": 1, "row": 1e400, "col": 0},
+    {"cmd": "move", "session": 1, "row": 5, "col": 0},
+    {"cmd": "jugar"}
+])
+def test_invalid_requests_are_rejected(request_):
+    _, response, state = _run(_handle_all([{"cmd": "new"}, request_, {"cmd": "state", "session": 1}]))
+    assert response["ok"] is False
+    assert response["error"]
+    # La sesión válida sigue intacta
+    assert state["ok"] and state["board"] == ["   ", "   ", "   "]
+
+
+def test_minimax_search_is_time_limited():
+    start = time.perf_counter()
+    _, move = _run(_handle_all([
+        {"cmd": "new", "difficulty": "Minimax", "rows": 6, "cols": 7, "k": 4},
+        {"cmd": "move", "session": 1, "row": 5, "col": 3}
+    ]))
+    assert move["ok"]
+    assert time.perf_counter() - start < server.MOVE_TIME_BUDGET_MS / 1000 + 5
+
+
+async def _talk(lines):
+    game_server = server.GameServer(executor=ThreadPoolExecutor(max_workers=1))
+    tcp = await game_server.start(port=0)
+    port = tcp.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for line in lines:
+            writer.write(line.encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        return responses
+    finally:
+        game_server.close()
+
+
+def test_connection_survives_bad_requests():
+    responses = _run(_talk([
+        "esto no es JSON",
+        "[1, 2]",
+        '{"cmd": "new", "rows": null}',
+        '{"cmd": "move", "session": [1], "row": 0, "col": 0}',
+        '{"cmd": "new"}',
+        '{"cmd": "move", "session": 1, "row": 0, "col": 0}'
+    ]))
+    assert [response["ok"] for response in responses] == [False, False, False, False, True, True]
+    assert responses[-1]["board"][0][0] == 'X'
+
+
+def test_unexpected_error_keeps_connection(monkeypatch):
+    handle = server.GameServer.handle
+
+    async def failing_handle(self, request, owned=None):
+        if request.get("cmd") == "metrics":
+            raise RuntimeError("fallo")
+        return await handle(self, request, owned)
+
+    monkeypatch.setattr(server.GameServer, "handle", failing_handle)
+    responses = _run(_talk(['{"cmd": "metrics"}', '{"cmd": "new"}']))
+    assert responses[0] == {"ok": False, "error": "Error interno: RuntimeError"}
+    assert responses[1]["ok"]
@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+
+from tic_tac_toe_minimax_game import simulate
+from tic_tac_toe_minimax_game.shared_transposition import HEADER, SharedTranspositionTable
+from tic_tac_toe_minimax_game.transposition import EXACT, LOWER_BOUND, TranspositionTable
+
+
+@pytest.fixture
+def table():
+    with SharedTranspositionTable(1024) as table:
+        yield table
+
+
+def test_same_interface_as_local_table(table):
+    local = TranspositionTable()
+    for tt in (table, local):
+        tt.store((5, True), 1.0, 4, EXACT, (0, 1))
+        tt.store((5, True), 2.0, 2, EXACT, (1, 1))
+        tt.store((7, False), -3.0, 6, LOWER_BOUND, None)
+    for key in ((5, True), (7, False), (5, False)):
+        assert table.lookup(key) == local.lookup(key)
+    assert len(table) == 2
+
+
+def test_attach_and_pickle_share_entries(table):
+    table.store(1 << 200, 0.5, 3, EXACT, (2, 2))
+    other = SharedTranspositionTable.attach(table.name)
+    copy = pickle.loads(pickle.dumps(table))
+    try:
+        assert other.lookup(1 << 200) == (0.5, 3, EXACT, (2, 2))
+        copy.store(9, 1.5, 1, EXACT, None)
+        assert table.lookup(9) == (1.5, 1, EXACT, None)
+    finally:
+        other.close()
+        copy.close()
+
+
+def test_torn_entry_is_a_miss(table):
+    table.store(3, 1.0, 2, EXACT, None)
+    table.clear()
+    assert table.lookup(3) is None
+    table.store(3, 1.0, 2, EXACT, None)
+    # Se corrompe la entrada como lo haría una escritura a medias de otro proceso
+    buf = table._shm.buf
+    for offset in range(HEADER.size, len(buf)):
+        if buf[offset]:
+            buf[offset] ^= 0xFF
+            break
+    assert table.lookup(3) is None
+    assert table.get_stats()["tt_torn_reads"] == 1
+
+
+def test_attach_rejects_other_blocks():
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(create=True, size=HEADER.size)
+    try:
+        with pytest.raises(ValueError):
+            SharedTranspositionTable.attach(block.name)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_simulator_workers_share_the_table(table):
+    # Sin llegar al final de la partida no se usan las jugadas precalculadas y se busca
+    agents = {'X': 'Normal', 'O': 'Difícil'}
+    records = list(simulate.simulate(4, agents, workers=2, shared_table=table.name))
+    assert [record["game"] for record in records] == [0, 1, 2, 3]
+    assert len(table) > 0
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from tic_tac_toe_minimax_game import simulate
+
+
+def test_agent_name_ignores_case_and_accents():
+    assert simulate.agent_name("dificil") == 'Difícil'
+    assert simulate.agent_name("MINIMAX") == simulate.MINIMAX_AGENT
+    with pytest.raises(ValueError):
+        simulate.agent_name("experto")
+
+
+def test_perfect_play_always_draws():
+    agents = {'X': simulate.MINIMAX_AGENT, 'O': simulate.MINIMAX_AGENT}
+    records = list(simulate.simulate(3, agents, workers=1))
+    assert [record["winner"] for record in records] == ['T'] * 3
+    assert [record["game"] for record in records] == [0, 1, 2]
+
+
+def test_minimax_never_loses_against_random():
+    agents = {'X': simulate.RANDOM_AGENT, 'O': simulate.MINIMAX_AGENT}
+    for record in simulate.simulate(20, agents, seed=5, workers=1):
+        assert record["winner"] in ('O', 'T')
+        players = [move["player"] for move in record["moves"]]
+        assert players == ['X', 'O'] * (len(players) // 2) + ['X'] * (len(players) % 2)
+        json.dumps(record)
+
+
+def test_same_seed_same_games():
+    agents = {'X': 'Normal', 'O': 'Fácil'}
+    strip = lambda record: [move["move"] for move in record["moves"]]  # noqa: E731
+    first = [strip(record) for record in simulate.simulate(10, agents, seed=3, workers=1)]
+    second = [strip(record) for record in simulate.simulate(10, agents, seed=3, workers=1)]
+    assert first == second
+    # Cada partida empieza con la tabla vacía: el reparto entre procesos no cambia las jugadas
+    records = list(simulate.simulate(10, agents, seed=3, workers=2))
+    assert [(record["game"], record["seed"]) for record in records] == [(i, 3 + i) for i in range(10)]
+    assert [strip(record) for record in records] == first
+
+
+def test_larger_boards_get_default_time_budget(monkeypatch):
+    budgets = []
+    original = simulate.choose_move
+
+    def spy(engine, state, agent, rng, time_budget_ms=None):
+        budgets.append(time_budget_ms)
+        return original(engine, state, agent, rng, time_budget_ms)
+
+    monkeypatch.setattr(simulate, "choose_move", spy)
+    agents = {'X': simulate.RANDOM_AGENT, 'O': simulate.RANDOM_AGENT}
+    list(simulate.simulate(1, agents, workers=1, rows=4, cols=4, k=3))
+    assert set(budgets) == {simulate.DEFAULT_TIME_BUDGET_MS}
+    budgets.clear()
+    list(simulate.simulate(1, agents, workers=1, time_budget_ms=50))
+    assert set(budgets) == {50}
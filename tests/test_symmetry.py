@@ -0,0 +1,71 @@
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.symmetry import BoardSymmetry
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+
+
+def _mask(cells):
+    mask = 0
+    for cell in cells:
+        mask |= 1 << cell
+    return mask
+
+
+def test_group_size():
+    assert len(BoardSymmetry(3, 3)) == 8
+    assert len(BoardSymmetry(4, 4)) == 8
+    assert len(BoardSymmetry(3, 5)) == 4
+
+
+@pytest.mark.parametrize("rows, cols", [(3, 3), (4, 4), (3, 5), (5, 5)])
+def test_unmap_inverts_map(rows, cols):
+    symmetry = BoardSymmetry(rows, cols)
+    for t in range(len(symmetry)):
+        assert sorted(symmetry.perms[t]) == list(range(rows * cols))
+        for cell in range(rows * cols):
+            assert symmetry.unmap_cell(symmetry.map_cell(cell, t), t) == cell
+
+
+@pytest.mark.parametrize("rows, cols", [(3, 3), (4, 4), (3, 5)])
+def test_transform_matches_perm(rows, cols):
+    symmetry = BoardSymmetry(rows, cols)
+    cells = [0, 2, rows * cols - 1]
+    for t in range(len(symmetry)):
+        expected = _mask(symmetry.map_cell(cell, t) for cell in cells)
+        assert symmetry.transform(_mask(cells), t) == expected
+
+
+def test_canonical_is_shared_by_all_images():
+    symmetry = BoardSymmetry(3, 3)
+    x = _mask([0, 5])
+    o = _mask([4])
+    key, _ = symmetry.canonical(x, o)
+    for t in range(len(symmetry)):
+        image_key, image_t = symmetry.canonical(symmetry.transform(x, t), symmetry.transform(o, t))
+        assert image_key == key
+        # La simetría devuelta lleva la imagen a la clave canónica
+        mapped_x = symmetry.transform(symmetry.transform(x, t), image_t)
+        mapped_o = symmetry.transform(symmetry.transform(o, t), image_t)
+        assert mapped_x | mapped_o << 9 == key
+
+
+def test_unique_cells_on_empty_board():
+    symmetry = BoardSymmetry(3, 3)
+    # Esquina, borde y centro
+    assert symmetry.unique_cells(0, 0, list(range(9))) == [0, 1, 4]
+
+
+def test_symmetry_keeps_move_values():
+    plain = BitboardGame(transposition_table=TranspositionTable())
+    symmetric = BitboardGame(transposition_table=TranspositionTable(), use_symmetry=True)
+    state = Bitboard.from_rows([list("X  "), list("   "), list("   ")])
+    values = {}
+    for move in state.moves():
+        child = state.play(move)
+        plain._root_depth = symmetric._root_depth = 8
+        values[move] = plain.minimax(child, 8, False)[0]
+        assert symmetric.minimax(child, 8, False)[0] == values[move]
+    # La jugada elegida con simetrías tiene el mejor valor, aunque sea otra del mismo valor
+    move = symmetric.get_best_move(state, depth=8)
+    assert values[move] == max(values.values())
@@ -0,0 +1,40 @@
+from tic_tac_toe_minimax_game import tablebase
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+
+
+def test_committed_table_is_up_to_date():
+    with open(tablebase.DEFAULT_PATH, 'rb') as f:
+        assert f.read() == tablebase.generate()
+
+
+def test_lookup():
+    table = tablebase.get_table()
+    # El tablero vacío es tablas y cualquier casilla es una jugada perfecta
+    score, moves = table.lookup(0, 0)
+    assert score == 0
+    assert len(moves) == 9
+    # X gana en una jugada completando la fila superior
+    state = Bitboard.from_rows([list("XX "), list("OO "), list("   ")])
+    score, moves = table.lookup(state.x, state.o)
+    assert score == 9
+    assert moves == [(0, 2)]
+    # Posiciones inalcanzables o fuera del tablero
+    assert table.lookup(0b11, 0b01) is None
+    assert table.lookup(1 << 9, 0) is None
+
+
+def test_perfect_play_matches_search():
+    search = BitboardGame()
+    perfect = BitboardGame(use_perfect_play=True)
+    state = Bitboard.from_rows([list("X  "), list(" O "), list("  X")])
+    move = perfect.get_best_move(state, depth=9, maximizing_player=True)
+    assert perfect.perfect_play_hit
+    assert perfect.nodes_evaluated == 0
+
+    search._root_depth = 9
+    best, _ = search.minimax(state, 9, True)
+    search._root_depth = 8
+    assert search.minimax(state.play(move), 8, False)[0] == best
+    # Sin llegar al final de la partida se busca como siempre
+    perfect.get_best_move(state, depth=2, maximizing_player=True)
+    assert not perfect.perfect_play_hit
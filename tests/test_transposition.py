@@ -0,0 +1,70 @@
+import math
+
+import pytest
+
+from tic_tac_toe_minimax_game.bitboard import Bitboard, BitboardGame
+from tic_tac_toe_minimax_game.transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+
+def test_store_keeps_deeper_entry():
+    table = TranspositionTable()
+    table.store('a', 1.0, 4, EXACT, (0, 0))
+    table.store('a', 2.0, 2, EXACT, (1, 1))
+    assert table.lookup('a') == (1.0, 4, EXACT, (0, 0))
+    table.store('a', 3.0, 4, LOWER_BOUND, (2, 2))
+    assert table.lookup('a') == (3.0, 4, LOWER_BOUND, (2, 2))
+
+
+def test_evicts_oldest_when_full():
+    table = TranspositionTable(max_entries=2)
+    table.store('a', 0.0, 1, EXACT, None)
+    table.store('b', 0.0, 1, EXACT, None)
+    table.store('c', 0.0, 1, EXACT, None)
+    assert table.lookup('a') is None
+    assert table.lookup('c') is not None
+    stats = table.get_stats()
+    assert stats["tt_entries"] == 2
+    assert stats["tt_evictions"] == 1
+    assert stats["tt_hits"] == 1 and stats["tt_misses"] == 1
+
+
+def test_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        TranspositionTable(max_entries=0)
+
+
+def _search_with_window(state, depth, alpha, beta):
+    table = TranspositionTable()
+    engine = BitboardGame(transposition_table=table)
+    engine._root_depth = depth
+    score, _ = engine.minimax(state, depth, True, alpha, beta)
+    key, _ = engine._tt_key(state, True)
+    return score, table.lookup(key)
+
+
+def test_bound_flags():
+    # Posición de tablas con O (maximizador) en turno: vale 0
+    state = Bitboard.from_rows([list("X  "), list(" O "), list("  X")])
+    score, entry = _search_with_window(state, 9, -math.inf, math.inf)
+    assert score == 0
+    assert entry[2] == EXACT
+    # Falla alta: el valor real supera beta y solo se sabe que es una cota inferior
+    score, entry = _search_with_window(state, 9, -math.inf, -0.5)
+    assert score >= -0.5
+    assert entry[2] == LOWER_BOUND
+    # Falla baja: el valor real queda por debajo de alpha y es una cota superior
+    score, entry = _search_with_window(state, 9, 0.5, math.inf)
+    assert score <= 0.5
+    assert entry[2] == UPPER_BOUND
+
+
+def test_table_does_not_change_moves():
+    plain = BitboardGame()
+    cached = BitboardGame(transposition_table=TranspositionTable())
+    state = Bitboard.empty()
+    while not state.is_over():
+        maximizing = state.player == 'O'
+        move = plain.get_best_move(state, depth=9, maximizing_player=maximizing)
+        assert cached.get_best_move(state, depth=9, maximizing_player=maximizing) == move
+        state = state.play(move)
+    assert cached.transposition_table.hits > 0
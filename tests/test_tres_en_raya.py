@@ -0,0 +1,39 @@
+import pickle
+import time
+
+from tic_tac_toe_minimax_game.bitboard import DEFAULT_TIME_BUDGET_MS
+from tic_tac_toe_minimax_game.ordering import MoveOrdering
+from tic_tac_toe_minimax_game.transposition import TranspositionTable
+from tic_tac_toe_minimax_game.tres_en_raya import TresEnRaya
+
+
+def test_classic_board_searches_to_the_end():
+    game = TresEnRaya()
+    assert game.time_budget_ms is None
+    assert game.ai_search_params() == (9, None)
+    assert TresEnRaya(time_budget_ms=200).ai_search_params() == (9, 200)
+
+
+def test_large_board_uses_default_time_budget():
+    game = TresEnRaya(rows=6, cols=7, k=4, transposition_table=TranspositionTable(),
+                      use_symmetry=True, move_ordering=MoveOrdering())
+    assert game.time_budget_ms == DEFAULT_TIME_BUDGET_MS
+    game.make_move_on_board(5, 3, 'X')
+    start = time.perf_counter()
+    row, col = game.get_ai_move()
+    # El presupuesto se comprueba cada TIME_CHECK_INTERVAL nodos: se deja margen
+    assert time.perf_counter() - start < DEFAULT_TIME_BUDGET_MS / 1000 * 3
+    assert game.is_valid_move(row, col)
+    assert game.ai_stats['depth_reached'] >= 1
+
+
+def test_pondering_game_can_be_pickled():
+    game = TresEnRaya(ponder=True)
+    game.make_move_on_board(1, 1, 'X')
+    game.ponderer.start(game.board, 9, True, None)
+    try:
+        copy = pickle.loads(pickle.dumps(game))
+    finally:
+        game.ponderer.stop()
+    assert copy.ponderer is None
+    assert copy.board.cell(1, 1) == 'X'
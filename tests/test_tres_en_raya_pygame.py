@@ -0,0 +1,117 @@
+import os
+import pickle
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pytest.importorskip("pygame")
+
+from tic_tac_toe_minimax_game.tres_en_raya_pygame import TresEnRayaPygame  # noqa: E402
+
+
+def _ai_turn(game):
+    game.showing_difficulty_menu = False
+    game.reiniciar_juego()
+    game.RETARDO_IA = 0
+    game.realizar_movimiento(1, 1, game.human_player)
+    game.current_player = game.ai_player
+    game.ai_thinking = True
+    game.avanzar_turno_ia()
+    game._hilo_ia.join()
+    game.avanzar_turno_ia()
+
+
+def test_ai_move_is_applied():
+    game = TresEnRayaPygame()
+    _ai_turn(game)
+    assert not game.ai_thinking
+    assert game.current_player == game.human_player
+    assert game.board.filled == 2
+
+
+def test_search_error_ends_the_game(capsys):
+    game = TresEnRayaPygame()
+
+    def failing_search(tablero):
+        raise RuntimeError("fallo de prueba")
+
+    game.buscar_movimiento_ia = failing_search
+    _ai_turn(game)
+    assert game.game_over
+    assert game.winner is None
+    assert not game.ai_thinking
+    assert game.error_ia == "fallo de prueba"
+    assert game.board.filled == 1
+    assert "fallo de prueba" in capsys.readouterr().err
+
+    # Reiniciar deja la partida en un estado normal
+    del game.buscar_movimiento_ia
+    _ai_turn(game)
+    assert game.error_ia is None and not game.game_over
+
+
+def test_search_thread_leaves_ui_state_to_main_loop():
+    game = TresEnRayaPygame()
+    game.showing_difficulty_menu = False
+    game.reiniciar_juego()
+    game.RETARDO_IA = 60
+    game.realizar_movimiento(1, 1, game.human_player)
+    game.current_player = game.ai_player
+    game.ai_thinking = True
+    game.avanzar_turno_ia()
+    game._hilo_ia.join()
+    # El hilo terminó pero el resultado espera en la cola hasta que el bucle lo aplique
+    assert game.analysis_data.total == 0
+    game.avanzar_turno_ia()
+    assert game.analysis_data.total == 0 and game.board.filled == 1
+    game.RETARDO_IA = 0
+    game.avanzar_turno_ia()
+    assert game.analysis_data.total == 1 and game.board.filled == 2
+    assert game.nodes_evaluated == game.analysis_data.last()[2]
+
+
+def test_redraws_only_changed_areas():
+    game = TresEnRayaPygame()
+    game.iniciar_pantalla()
+    # Menú: se dibuja una vez y no vuelve a dibujarse mientras no cambie la dificultad
+    assert len(game.dibujar()) == 1
+    assert game.dibujar() == []
+    game.current_difficulty = 'Difícil'
+    assert len(game.dibujar()) == 1
+
+    game.showing_difficulty_menu = False
+    game.reiniciar_juego()
+    assert len(game.dibujar()) == 2
+    assert game.dibujar() == []
+    # Una jugada cambia el tablero y la información del turno
+    game.realizar_movimiento(0, 0, game.human_player)
+    game.current_player = game.ai_player
+    assert len(game.dibujar()) == 2
+    # Una exposición de la ventana obliga a redibujar todo
+    game.invalidar_pantalla()
+    assert len(game.dibujar()) == 2
+    assert game.dibujar() == []
+
+
+def test_pondering_game_can_be_pickled():
+    game = TresEnRayaPygame(ponder=True)
+    game.iniciar_precarga()
+    try:
+        copy = pickle.loads(pickle.dumps(game))
+    finally:
+        game.esperar_precarga()
+    # Los hilos y el ponderador no pasan a la copia
+    assert copy.ponderador is None and copy._hilo_precarga is None
+    assert copy.board == game.board
+
+
+def test_text_cache_keeps_recently_used_texts():
+    game = TresEnRayaPygame()
+    game.iniciar_pantalla()
+    game.MAX_TEXTOS_CACHE = 3
+    fija = game.renderizar_texto(game.fuente, "Tu turno", True, (0, 0, 0))
+    for nodos in range(5):
+        game.renderizar_texto(game.fuente, f"Nodos: {nodos}", True, (0, 0, 0))
+        # El texto que se dibuja en cada fotograma no sale de la caché
+        assert game.renderizar_texto(game.fuente, "Tu turno", True, (0, 0, 0)) is fija
+    assert len(game._cache_textos) == 3